@@ -0,0 +1,91 @@
+"""
+Auswirkungsanalyse über einem vorberechneten Lineage-Snapshot (siehe
+precompute_lineage.py): Welche Endpunkte (Reports o.Ä.) sind betroffen, wenn
+sich die angegebenen Objekte ändern?
+
+Aufruf:
+    python analyze_impact.py PROD_DATABASE STAGING.RAW_POS_DATA STAGING.*
+    python analyze_impact.py --snapshot /pfad/zum/snapshot --sources-file tabellen.txt
+
+Ausgabe: eine Zeile je Paar "Quelle<TAB>Endpunkt<TAB>Hops".
+"""
+import argparse
+import fnmatch
+import sys
+import time
+
+import numpy as np
+
+from app.services.data_lineage import LineageSnapshot, default_snapshot_path
+from app.services.impact_analysis import multi_source_impact
+from app.services.sparse_adjacency import adjacency_from_csr
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-Auswirkungsanalyse über einem Lineage-Snapshot")
+    parser.add_argument("data_source", nargs="?", help="Datenquelle, deren Standard-Snapshot genutzt wird")
+    parser.add_argument("sources", nargs="*", help="Geänderte Objekte (SCHEMA.NAME, Platzhalter * erlaubt)")
+    parser.add_argument("--snapshot", help="Pfad zu einem Snapshot statt der Datenquelle")
+    parser.add_argument("--sources-file", help="Datei mit einem Objekt pro Zeile")
+    return parser.parse_args(argv)
+
+
+def resolve_sources(snapshot: LineageSnapshot, patterns: list) -> list:
+    """Übersetzt Namen und Platzhalter in Knotenindizes des Snapshots."""
+    graph = snapshot.graph
+    names = None
+    indices = []
+    for pattern in patterns:
+        pattern = pattern.strip().upper()
+        if not pattern:
+            continue
+        if any(ch in pattern for ch in "*?["):
+            if names is None:
+                names = [graph.string(graph.node_names[i]).upper() for i in range(graph.node_count)]
+            indices.extend(i for i, name in enumerate(names) if fnmatch.fnmatchcase(name, pattern))
+        else:
+            index = graph.index_of(pattern)
+            if index is None:
+                print(f"WARNUNG: {pattern} ist nicht im Snapshot enthalten.", file=sys.stderr)
+            else:
+                indices.append(index)
+    return list(dict.fromkeys(indices))
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if args.snapshot:
+        path = args.snapshot
+        # Ohne Datenquelle ist das erste Positionsargument bereits ein Objekt
+        patterns = ([args.data_source] if args.data_source else []) + args.sources
+    elif args.data_source:
+        path = default_snapshot_path(args.data_source)
+        patterns = list(args.sources)
+    else:
+        print("Datenquelle oder --snapshot angeben.", file=sys.stderr)
+        return 2
+    if args.sources_file:
+        with open(args.sources_file, encoding="utf-8") as fh:
+            patterns.extend(fh.read().splitlines())
+
+    snapshot = LineageSnapshot.load(path)
+    graph = snapshot.graph
+    sources = resolve_sources(snapshot, patterns)
+
+    start = time.perf_counter()
+    adjacency = adjacency_from_csr(graph.succ_indptr, graph.succ_indices)
+    endpoints = np.diff(np.asarray(graph.succ_indptr)) == 0
+    impacts = multi_source_impact(adjacency, np.array(sources, dtype=np.int64), endpoints)
+    elapsed = time.perf_counter() - start
+
+    for source, impact in zip(sources, impacts):
+        source_name = graph.string(graph.node_names[source])
+        for target, hops in sorted(impact.items(), key=lambda item: item[1]):
+            print(f"{source_name}\t{graph.string(graph.node_names[target])}\t{hops}")
+    affected = len(set().union(*impacts)) if impacts else 0
+    print(f"{len(sources)} Quellen, {affected} betroffene Endpunkte in {elapsed * 1e3:.0f} ms.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,6 +9,7 @@ from app.models.graph_model import GraphModel
 from app.services.data_service import DataService
 from app.services.graph_analysis_service import GraphAnalysisService
 from app.services.data_lineage import DataLineageService, DataLineageConfig
+from app.services.cte_contraction import cte_view
 
 
 class DataLineageWorker(QThread):
@@ -53,6 +54,7 @@ class GraphController(QObject):
     Leitet Anfragen zur Graphenerzeugung und für Metadaten weiter
     und managt die asynchrone Ausführung.
     """
+    loading_started = pyqtSignal()  # Ein neuer Graph wird geladen; laufende Layouts sind überholt
 
     def __init__(self, model: GraphModel, canvas):
         super().__init__()
@@ -60,6 +62,8 @@ class GraphController(QObject):
         self.model = model
         self.canvas = canvas
         self.worker = None
+        self.selections = None  # Auswahl des zuletzt geladenen Graphen
+        self._pending_selections = None
 
         # Lädt DB-Verbindungen aus .env-Datei oder Umgebungsvariablen
         self.db_connections = load_database_connections()
@@ -85,6 +89,14 @@ class GraphController(QObject):
             self.model.clear()
             return
 
+        if self._only_cte_option_changed(selections):
+            # Gleiches Artefakt: nur zwischen Roh- und CTE-freier Sicht umschalten, kein neuer Crawl
+            self.selections = selections
+            self.model.load_graph(cte_view(self.model.graph, bool(selections.get("include_ctes"))))
+            return
+        self._pending_selections = selections
+        self.loading_started.emit()
+
         selected_source = selections.get("data_source")
 
         # Entscheidung: Mock- vs. Real-Modus
@@ -120,38 +132,51 @@ class GraphController(QObject):
             self.worker.error_signal.connect(self.on_loading_error)
             self.worker.start()
 
+    def _only_cte_option_changed(self, selections: dict) -> bool:
+        if self.selections is None or self.worker is not None or not self.model.graph.nodes:
+            return False
+        if bool(selections.get("include_ctes")) == bool(self.selections.get("include_ctes")):
+            return False  # Gleiche Auswahl erneut: bewusst neu laden
+        ignored = ("include_ctes", "new_tab")
+        return ({k: v for k, v in selections.items() if k not in ignored}
+                == {k: v for k, v in self.selections.items() if k not in ignored})
+
     def on_loading_finished(self, graph_obj):
         """Wird aufgerufen, wenn der Worker die Graphenerstellung beendet hat."""
         self.model.load_graph(graph_obj)
+        self.selections = self._pending_selections
         self.worker = None
 
     def on_loading_error(self, error_message):
         """Wird aufgerufen, wenn im Worker ein Fehler auftritt."""
         self.model.error_occurred.emit(error_message)
+        self.selections = None
         self.worker = None
         QMessageBox.critical(self.canvas, "Analysefehler", error_message)
 
-    def search_and_highlight_node(self, search_term: str):
-        """Sucht den ersten passenden Knoten und hebt ihn hervor."""
-        if not search_term:
+    def search_and_highlight_node(self, search_term: str, zoom: bool = True):
+        """
+        Hebt alle passenden Knoten hervor (Suchindex des Graphen, nach Relevanz)
+        und zoomt auf den besten Treffer. Ohne Zoom für die Suche während der Eingabe.
+        """
+        if not search_term or not self.model.graph:
             self.canvas.clear_highlighting()
             return
-        found_node_id = next(
-            (node_id for node_id, attrs in self.model.graph.nodes(data=True)
-             if (obj := attrs.get('data')) and search_term.lower() in obj.name.lower()),
-            None
-        )
-        if found_node_id:
-            self.canvas.highlight_node(found_node_id)
-            self.canvas.zoom_to_node(found_node_id)
+        # Der Suchindex entsteht im LayoutWorker; bis dahin linearer Durchlauf
+        matches = GraphAnalysisService(self.model.graph, build_indexes=False).search_nodes(search_term)
+        if matches:
+            self.canvas.highlight_nodes(matches)
+            if zoom:
+                self.canvas.zoom_to_node(matches[0])
         else:
             self.canvas.clear_highlighting()
 
-    def highlight_predecessors(self, node_id: str):
+    def highlight_predecessors(self, node_id):
         """Hebt den Knoten und alle seine Vorgänger hervor."""
-        if not self.model.graph or not node_id:
+        if not self.model.graph or node_id is None:
             return
-        analysis_service = GraphAnalysisService(self.model.graph)
+        # Der Reichbarkeitsindex entsteht im LayoutWorker; bis dahin direkte Traversierung
+        analysis_service = GraphAnalysisService(self.model.graph, build_indexes=False)
         self.canvas.highlight_nodes(list(analysis_service.get_all_predecessors(node_id)))
 
     def clear_node_highlighting(self):
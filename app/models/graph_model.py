@@ -13,7 +13,8 @@ class GraphModel(QObject):
 
     def clear(self):
         """Setzt das Modell zurück."""
-        self.graph.clear()
+        # Nicht clear(): der Graph kann eine geteilte, schreibgeschützte Sicht sein
+        self.graph = nx.DiGraph()
         self.model_updated.emit()
 
     def load_graph(self, graph: nx.DiGraph):
@@ -1,21 +1,75 @@
-from dataclasses import dataclass, field
-from typing import List, Optional
+import sys
+from typing import Iterable, Optional
+
+DEFAULT_CONTEXT = "Nicht spezifiziert"
+DEFAULT_DESCRIPTION = "Keine Beschreibung verfügbar."
+DEFAULT_OWNER = "Unbekannt"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
 
 
-@dataclass
 class Node:
     """
     Ein strukturiertes Datenobjekt, das einen Knoten im Graphen repräsentiert.
+
+    Speichersparend über __slots__ und internierte Strings. Vorgänger und
+    Nachfolger werden nicht kopiert, sondern als Sicht auf die Adjazenz des
+    Graphen geliefert, an den der Knoten per bind() gebunden ist.
     """
-    id: str  # Eindeutiger Bezeichner des Knotens
-    name: str  # Anzeigename, z.B. der Artefakt- oder Tabellenname
-    node_type: str  # z.B. 'ELT', 'TABLE', 'VIEW', 'SCRIPT', 'CTE'
-
-    # Optionale, detaillierte Informationen
-    context: Optional[str] = "Nicht spezifiziert"
-    description: Optional[str] = "Keine Beschreibung verfügbar."
-    owner: Optional[str] = "Unbekannt"
-
-    # Vorgänger und Nachfolger werden bei der Graph-Erstellung dynamisch gefüllt
-    predecessors: List[str] = field(default_factory=list)
-    successors: List[str] = field(default_factory=list)
\ No newline at end of file
+    __slots__ = ("id", "name", "node_type", "context", "description", "owner", "_graph", "_neighbors")
+
+    def __init__(
+        self,
+        id: str,  # Eindeutiger Bezeichner des Knotens
+        name: str,  # Anzeigename, z.B. der Artefakt- oder Tabellenname
+        node_type: str,  # z.B. 'ELT', 'TABLE', 'VIEW', 'SCRIPT', 'CTE'
+        context: Optional[str] = DEFAULT_CONTEXT,
+        description: Optional[str] = DEFAULT_DESCRIPTION,
+        owner: Optional[str] = DEFAULT_OWNER,
+        predecessors: Optional[Iterable[str]] = None,
+        successors: Optional[Iterable[str]] = None,
+    ):
+        self.id = _intern(id)
+        self.name = _intern(name)
+        self.node_type = _intern(node_type)
+        self.context = _intern(context)
+        self.description = description
+        self.owner = _intern(owner)
+        self._graph = None
+        # Nur für ungebundene Knoten: explizit übergebene Nachbarn
+        self._neighbors = (tuple(predecessors or ()), tuple(successors or ())) if predecessors or successors else None
+
+    def bind(self, graph) -> "Node":
+        """Verknüpft den Knoten mit seinem Graphen; Nachbarn kommen danach aus dessen Adjazenz."""
+        self._graph = graph
+        self._neighbors = None
+        return self
+
+    @property
+    def predecessors(self):
+        return self._adjacent(0)
+
+    @property
+    def successors(self):
+        return self._adjacent(1)
+
+    def _adjacent(self, direction: int):
+        if self._graph is None:
+            return self._neighbors[direction] if self._neighbors else ()
+        adjacency = self._graph.pred if direction == 0 else self._graph.succ
+        try:
+            return adjacency[self.id].keys()
+        except KeyError:
+            return ()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__[:6])
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Node(id={self.id!r}, name={self.name!r}, node_type={self.node_type!r}, context={self.context!r})"
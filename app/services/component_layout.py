@@ -0,0 +1,66 @@
+from typing import Dict, Hashable, List, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+from app.services.layered_layout import CHAR_WIDTH, NODE_PADDING, NODE_SEPARATION
+from app.services.sparse_adjacency import sparse_adjacency
+
+# Komponente = (Knotenschlüssel, Kanten als Schlüsselpaare)
+Component = Tuple[List[str], List[Tuple[str, str]]]
+
+
+def weak_component_labels(graph: nx.DiGraph) -> np.ndarray:
+    """Nummer der schwach zusammenhängenden Komponente je Knoten (Reihenfolge wie graph.nodes)."""
+    _, labels = connected_components(sparse_adjacency(graph).matrix, directed=True, connection="weak")
+    return labels
+
+
+def split_components(graph: nx.DiGraph, keys: Dict[Hashable, str], labels: np.ndarray) -> List[Component]:
+    """
+    Komponenten des Graphen (siehe weak_component_labels) in stabilen Knoten-
+    schlüsseln (siehe layout_cache.node_keys), die größte zuerst; bei
+    gleicher Größe entscheidet der kleinste Schlüssel.
+    """
+    adjacency = sparse_adjacency(graph)
+    count = int(labels.max()) + 1
+    key_list = [keys[node_id] for node_id in adjacency.nodes]
+    members = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[members], np.arange(count + 1))
+    components = [([key_list[i] for i in members[bounds[c]:bounds[c + 1]].tolist()], []) for c in range(count)]
+    coo = adjacency.matrix.tocoo()
+    for source, target, label in zip(coo.row.tolist(), coo.col.tolist(), labels[coo.row].tolist()):
+        components[label][1].append((key_list[source], key_list[target]))
+    components.sort(key=lambda component: (-len(component[0]), min(component[0])))
+    return components
+
+
+def pack_components(layouts: List[Dict[str, Tuple[float, float]]]) -> Dict[str, Tuple[float, float]]:
+    """
+    Legt die einzeln berechneten Layouts der Komponenten zeilenweise in einen
+    gemeinsamen Koordinatenraum (Regal-Packen in der übergebenen Reihenfolge).
+    Die Zeilenbreite richtet sich nach der Gesamtfläche, mindestens aber nach
+    der breitesten Komponente. Positionen mit y nach oben, erste Zeile oben.
+    """
+    label_width = max(len(key) for layout in layouts for key in layout) * CHAR_WIDTH + NODE_PADDING
+    gap = np.array([label_width + NODE_SEPARATION, NODE_SEPARATION])
+
+    boxes = []
+    for layout in layouts:
+        xy = np.array(list(layout.values()), dtype=float).reshape(-1, 2)
+        xy -= xy.min(axis=0)
+        boxes.append((list(layout), xy, xy.max(axis=0)))
+    row_width = max(max(extent[0] for _, _, extent in boxes),
+                    float(np.sqrt(sum(np.prod(extent + gap) for _, _, extent in boxes))))
+
+    packed = {}
+    x = y = row_height = 0.0
+    for keys, xy, (width, height) in boxes:
+        if x > 0 and x + width > row_width:
+            x, y, row_height = 0.0, y + row_height, 0.0
+        shifted = xy + (x, -y - height)
+        packed.update(zip(keys, map(tuple, shifted.tolist())))
+        x += width + gap[0]
+        row_height = max(row_height, height + gap[1])
+    return packed
@@ -0,0 +1,90 @@
+import networkx as nx
+import numpy as np
+
+from app.models.node import Node
+from app.services.graph_version import graph_signature
+from app.services.search_index import SQL_TEXTS_ATTR
+from app.services.sparse_adjacency import sparse_adjacency
+
+# Am Rohgraphen: zwischengespeicherte CTE-freie Sicht; an der Sicht: Verweis auf den Rohgraphen
+_GRAPH_ATTR = "cte_contracted"
+RAW_GRAPH_ATTR = "raw_graph"
+
+
+def cte_view(graph: nx.DiGraph, include_ctes: bool) -> nx.DiGraph:
+    """
+    Liefert zu einem Lineage-Graphen (roh oder bereits CTE-frei) die gewünschte
+    Sicht: den Rohgraphen mit CTE-Knoten oder dessen zwischengespeicherte
+    CTE-freie Variante. Umschalten kostet so keinen erneuten Crawl.
+    """
+    raw = graph.graph.get(RAW_GRAPH_ATTR, graph)
+    if include_ctes:
+        return raw
+
+    signature = graph_signature(raw)
+    cached = raw.graph.get(_GRAPH_ATTR)
+    if cached is None or cached[0] != signature:
+        cached = (signature, contract_ctes(raw))
+        raw.graph[_GRAPH_ATTR] = cached
+    return cached[1]
+
+
+def contract_ctes(graph: nx.DiGraph) -> nx.DiGraph:
+    """
+    Entfernt alle CTE-Knoten und verbindet ihre Vorgänger direkt mit ihren
+    Nachfolgern, auch über Ketten von CTEs hinweg (p -> CTE -> ... -> CTE -> s
+    wird zu p -> s; dabei entstehende Selbstkanten entfallen). Der Rohgraph
+    bleibt unverändert; alle Brückenkanten entstehen in einem Durchlauf über
+    die dünn besetzte Adjazenz.
+    Ohne CTE-Knoten wird der Graph selbst zurückgegeben.
+    """
+    nodes, _, adjacency, _ = sparse_adjacency(graph)
+    is_cte = np.fromiter(
+        (getattr(attrs.get("data"), "node_type", "") == "CTE" for attrs in graph.nodes.values()),
+        dtype=bool, count=len(nodes),
+    )
+    if not is_cte.any():
+        return graph
+    kept, ctes = np.flatnonzero(~is_cte), np.flatnonzero(is_cte)
+
+    rows_kept, rows_cte = adjacency[kept], adjacency[ctes]
+    into_cte = rows_kept[:, ctes].astype(bool)
+    within_ctes = rows_cte[:, ctes].astype(bool)
+    # reach[c, k]: k ist von CTE c aus über eine (evtl. leere) CTE-Kette erreichbar
+    reach = rows_cte[:, kept].astype(bool)
+    while True:
+        extended = reach + within_ctes @ reach
+        if extended.nnz == reach.nnz:
+            break
+        reach = extended
+    bridged = (into_cte @ reach).tocoo()
+    no_loop = bridged.row != bridged.col
+    bridged_rows, bridged_cols = bridged.row[no_loop], bridged.col[no_loop]
+    direct = rows_kept[:, kept].tocoo()
+    sources = np.concatenate((direct.row, bridged_rows))
+    targets = np.concatenate((direct.col, bridged_cols))
+
+    contracted = nx.DiGraph()
+    contracted.add_nodes_from((nodes[i], graph.nodes[nodes[i]]) for i in kept.tolist())
+    contracted.add_edges_from(zip(
+        (nodes[i] for i in kept[sources].tolist()),
+        (nodes[i] for i in kept[targets].tolist()),
+    ))
+
+    # Nur Nachbarn von CTEs ändern ihre Adjazenz; sie erhalten eigene, an die Sicht gebundene Nodes
+    touched = np.zeros(len(nodes), dtype=bool)
+    touched[adjacency[:, ctes].tocoo().row] = True
+    touched[rows_cte.tocoo().col] = True
+    for i in np.flatnonzero(touched & ~is_cte).tolist():
+        attrs = contracted.nodes[nodes[i]]
+        node_obj = attrs.get("data")
+        if node_obj is not None:
+            attrs["data"] = Node(
+                id=node_obj.id, name=node_obj.name, node_type=node_obj.node_type, context=node_obj.context,
+                description=node_obj.description, owner=node_obj.owner,
+            ).bind(contracted)
+
+    contracted.graph[RAW_GRAPH_ATTR] = graph
+    if SQL_TEXTS_ATTR in graph.graph:
+        contracted.graph[SQL_TEXTS_ATTR] = graph.graph[SQL_TEXTS_ATTR]
+    return contracted
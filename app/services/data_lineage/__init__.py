@@ -7,5 +7,6 @@ Views, ELTs und CTEs in einer Exasol-Datenbank visualisiert.
 """
 
 from .data_lineage_service import DataLineageService, DataLineageConfig
+from .lineage_snapshot import LineageSnapshot, default_snapshot_path
 
-__all__ = ["DataLineageService", "DataLineageConfig"]
+__all__ = ["DataLineageService", "DataLineageConfig", "LineageSnapshot", "default_snapshot_path"]
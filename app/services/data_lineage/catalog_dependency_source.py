@@ -0,0 +1,74 @@
+import logging
+from collections import defaultdict
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogDependencySource:
+    """
+    Lädt die von Exasol gepflegten Objekt-Abhängigkeiten (EXA_ALL_DEPENDENCIES
+    bzw. EXA_DBA_DEPENDENCIES) in einem Bulk-Query. Für Objekte, die der Katalog
+    abdeckt (v.a. Views), entfällt das SQL-Parsing vollständig.
+    """
+    QUERY = (
+        "SELECT OBJECT_SCHEMA, OBJECT_NAME, OBJECT_TYPE, "
+        "REFERENCED_OBJECT_SCHEMA, REFERENCED_OBJECT_NAME "
+        "FROM {table}{schema_filter}"
+    )
+
+    def __init__(self, connection=None, table: str = "EXA_ALL_DEPENDENCIES", fetch_batch_size: int = 1000):
+        self.connection = connection
+        self.table = table
+        self.fetch_batch_size = fetch_batch_size
+
+        self._dependencies = defaultdict(list)  # Objekt -> referenzierte Objekte
+        self._object_types = {}
+        self.hits = 0
+
+    def load(self, schemas: Optional[Iterable[str]] = None) -> int:
+        """
+        Lädt alle Katalog-Kanten der angegebenen Schemas (None = alle).
+        Gibt die Anzahl geladener Kanten zurück.
+        """
+        if not self.connection:
+            return 0
+
+        schema_list = sorted({s.strip().upper() for s in schemas}) if schemas else None
+        schema_filter = ""
+        if schema_list:
+            in_list = ", ".join("'" + s.replace("'", "''") + "'" for s in schema_list)
+            schema_filter = f" WHERE OBJECT_SCHEMA IN ({in_list})"
+
+        cur = self.connection.cursor()
+        cur.execute(self.QUERY.format(table=self.table, schema_filter=schema_filter))
+        self._dependencies.clear()
+        self._object_types.clear()
+
+        edge_count = 0
+        while True:
+            rows = cur.fetchmany(self.fetch_batch_size)
+            if not rows:
+                break
+            for obj_schema, obj_name, obj_type, ref_schema, ref_name in rows:
+                key = f"{obj_schema}.{obj_name}".upper()
+                self._dependencies[key].append(f"{ref_schema}.{ref_name}".upper())
+                self._object_types[key] = obj_type
+                edge_count += 1
+
+        logger.info(f"Katalog: {edge_count} Abhängigkeiten für {len(self._dependencies)} Objekte geladen.")
+        return edge_count
+
+    def covers(self, artifact_name: str) -> bool:
+        """True, wenn der Katalog die Abhängigkeiten dieses Objekts kennt."""
+        return artifact_name.upper() in self._dependencies
+
+    def get_dependencies(self, artifact_name: str) -> list:
+        key = artifact_name.upper()
+        if key not in self._dependencies:
+            return []
+        self.hits += 1
+        return list(self._dependencies[key])
+
+    def get_object_type(self, artifact_name: str, default: Optional[str] = None) -> Optional[str]:
+        return self._object_types.get(artifact_name.upper(), default)
@@ -0,0 +1,220 @@
+import bisect
+import json
+import logging
+import os
+import shutil
+from typing import Iterable, Optional
+
+import networkx as nx
+import numpy as np
+
+from app.models.node import Node
+
+logger = logging.getLogger(__name__)
+
+# Bei inkompatibler Änderung des Dateiformats erhöhen
+COMPACT_FORMAT_VERSION = 1
+
+_ARRAYS = (
+    "strings", "string_offsets", "node_ids", "node_names", "node_types", "id_order",
+    "succ_indptr", "succ_indices", "pred_indptr", "pred_indices",
+)
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, node_count: int):
+    """CSR-Arrays (indptr, indices) für die Kanten sources -> targets."""
+    order = np.lexsort((targets, sources))
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32)
+
+
+def gather_neighbors(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """Alle Nachbarn einer Knotenmenge in einem vektorisierten Schritt."""
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=indices.dtype)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+    return indices[offsets]
+
+
+class CompactGraph:
+    """
+    Kompakte, unveränderliche Graph-Darstellung: internierte String-Tabelle,
+    ganzzahlige Knoten-IDs und CSR-Arrays für Vorgänger und Nachfolger.
+    Auf der Platte liegt jedes Array als eigene .npy-Datei und wird beim Laden
+    per Memory-Mapping eingeblendet; mehrere Prozesse teilen sich so die Seiten.
+    """
+
+    def __init__(self, arrays: dict, meta: Optional[dict] = None):
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta or {}
+
+    # --- Aufbau und Konvertierung --------------------------------------------
+
+    @classmethod
+    def from_networkx(cls, graph: nx.DiGraph, meta: Optional[dict] = None) -> "CompactGraph":
+        """
+        Übernimmt einen Lineage-Graphen. Name und Typ stammen aus dem Node-Objekt
+        unter 'data' oder aus den Knotenattributen 'name'/'node_type'. Knoten mit
+        ganzzahliger ID (Symboltabelle des GraphBuilders) werden unter ihrem
+        Namen abgelegt, da die IDs nur innerhalb eines Crawls gelten.
+        """
+        strings, interned = [], {}
+
+        def intern(value: str) -> int:
+            index = interned.get(value)
+            if index is None:
+                index = interned[value] = len(strings)
+                strings.append(value)
+            return index
+
+        node_list = list(graph.nodes())
+        position = {node_id: i for i, node_id in enumerate(node_list)}
+        node_ids = np.empty(len(node_list), dtype=np.int32)
+        node_names = np.empty(len(node_list), dtype=np.int32)
+        node_types = np.empty(len(node_list), dtype=np.int32)
+        for i, node_id in enumerate(node_list):
+            attrs = graph.nodes[node_id]
+            node_obj = attrs.get('data')
+            name = node_obj.name if node_obj else attrs.get('name', node_id)
+            node_type = node_obj.node_type if node_obj else attrs.get('node_type', "Undefined")
+            node_ids[i] = intern(node_id if isinstance(node_id, str) else name)
+            node_names[i] = intern(name)
+            node_types[i] = intern(node_type)
+
+        encoded = [s.encode("utf-8") for s in strings]
+        string_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=string_offsets[1:])
+        string_bytes = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+        # UTF-8-Bytefolge entspricht der Codepoint-Reihenfolge -> binäre Suche über IDs
+        id_order = np.array(sorted(range(len(node_list)), key=lambda i: strings[node_ids[i]]), dtype=np.int32)
+
+        edges = np.array([(position[u], position[v]) for u, v in graph.edges()], dtype=np.int32).reshape(-1, 2)
+        succ_indptr, succ_indices = _csr(edges[:, 0], edges[:, 1], len(node_list))
+        pred_indptr, pred_indices = _csr(edges[:, 1], edges[:, 0], len(node_list))
+
+        return cls({
+            "strings": string_bytes, "string_offsets": string_offsets,
+            "node_ids": node_ids, "node_names": node_names, "node_types": node_types,
+            "id_order": id_order,
+            "succ_indptr": succ_indptr, "succ_indices": succ_indices,
+            "pred_indptr": pred_indptr, "pred_indices": pred_indices,
+        }, meta)
+
+    def to_networkx(self, nodes: Optional[Iterable[int]] = None) -> nx.DiGraph:
+        """
+        Baut einen nx.DiGraph mit Node-Objekten für die UI – für alle Knoten
+        oder nur den von `nodes` induzierten Teilgraphen.
+        """
+        if nodes is None:
+            selected = np.arange(self.node_count, dtype=np.int32)
+        else:
+            selected = np.fromiter(nodes, dtype=np.int32)
+        mask = np.zeros(self.node_count, dtype=bool)
+        mask[selected] = True
+
+        starts = self.succ_indptr[selected]
+        lengths = self.succ_indptr[selected + 1] - starts
+        sources = np.repeat(selected, lengths)
+        targets = gather_neighbors(self.succ_indptr, self.succ_indices, selected)
+        keep = mask[targets]
+
+        graph = nx.DiGraph()
+        ids = {int(i): self.node_id(i) for i in selected}
+        graph.add_nodes_from(ids.values())
+        graph.add_edges_from(zip(map(ids.__getitem__, sources[keep].tolist()),
+                                 map(ids.__getitem__, targets[keep].tolist())))
+        for index, node_id in ids.items():
+            graph.nodes[node_id]['data'] = Node(
+                id=node_id,
+                name=self.string(self.node_names[index]),
+                node_type=self.string(self.node_types[index]),
+            ).bind(graph)
+        return graph
+
+    # --- Zugriff ------------------------------------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.succ_indices)
+
+    def string(self, index) -> str:
+        start, end = self.string_offsets[index], self.string_offsets[index + 1]
+        return bytes(self.strings[start:end]).decode("utf-8")
+
+    def node_id(self, index) -> str:
+        return self.string(self.node_ids[index])
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        """Ganzzahliger Index eines Knotens per binärer Suche (ohne Gesamtindex)."""
+        keys = _SortedIds(self)
+        pos = bisect.bisect_left(keys, node_id)
+        if pos < len(keys) and keys[pos] == node_id:
+            return int(self.id_order[pos])
+        return None
+
+    def successors(self, index: int) -> np.ndarray:
+        return self.succ_indices[self.succ_indptr[index]:self.succ_indptr[index + 1]]
+
+    def predecessors(self, index: int) -> np.ndarray:
+        return self.pred_indices[self.pred_indptr[index]:self.pred_indptr[index + 1]]
+
+    # --- Persistenz ---------------------------------------------------------
+
+    def save(self, path: str):
+        """Schreibt alle Arrays in ein Verzeichnis und tauscht es atomar aus."""
+        tmp_path = f"{path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        for name in _ARRAYS:
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.asarray(getattr(self, name)))
+        meta = dict(self.meta, format_version=COMPACT_FORMAT_VERSION,
+                    node_count=self.node_count, edge_count=self.edge_count)
+        with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+
+        old_path = f"{path}.old"
+        shutil.rmtree(old_path, ignore_errors=True)  # Rest eines abgebrochenen Laufs
+        if os.path.exists(path):
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompactGraph":
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.isfile(meta_path):
+            raise ValueError(f"{path} ist kein Graph-Snapshot.")
+        with open(meta_path, encoding="utf-8") as fh:
+            meta = json.load(fh)
+        version = meta.get("format_version")
+        if version != COMPACT_FORMAT_VERSION:
+            raise ValueError(
+                f"Snapshot-Format {version} wird nicht unterstützt (erwartet: {COMPACT_FORMAT_VERSION})."
+            )
+
+        mmap_mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in _ARRAYS}
+        return cls(arrays, meta)
+
+
+class _SortedIds:
+    """Sequenz-Sicht auf die sortierten Knoten-IDs; dekodiert nur die gesuchten Einträge."""
+
+    def __init__(self, graph: CompactGraph):
+        self._graph = graph
+
+    def __len__(self) -> int:
+        return len(self._graph.id_order)
+
+    def __getitem__(self, pos: int) -> str:
+        return self._graph.node_id(self._graph.id_order[pos])
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 @dataclass
 class DataLineageConfig:
@@ -6,5 +7,36 @@ class DataLineageConfig:
     Konfiguration für den DataLineageService.
     """
     mock_mode: bool = True          # True = nutzt app.data.test_data statt DB
-    max_depth: int = 5              # Maximale Rekursionstiefe
+    max_depth: int = 5              # Maximale Rekursionstiefe (nur im "level"-Modus geprüft)
+    crawl_mode: str = "stack"       # "stack" = Tiefensuche, "level" = Ebenen-Batches
+    frontier_chunk_size: int = 500  # Max. Namen pro IN-Liste im "level"-Modus
     include_ctes: bool = False      # CTEs (WITH-Klauseln) berücksichtigen
+    extractor: str = "fast"         # "fast" = Token-Scanner mit Fallback, "sqlglot", "sqlparse"
+
+    # Prefetch: alle View-/Skripttexte vorab in einem Bulk-Query laden
+    prefetch_catalog: bool = False
+    prefetch_schemas: Optional[List[str]] = None   # Schemas für Bulk-Loads, None = alle
+    fetch_batch_size: int = 1000                   # Zeilen pro fetchmany()
+
+    # Abhängigkeiten aus dem Exasol-Katalog statt per SQL-Parsing
+    use_catalog_dependencies: bool = False
+    catalog_dependency_table: str = "EXA_ALL_DEPENDENCIES"  # oder EXA_DBA_DEPENDENCIES
+
+    # Persistenter Cache extrahierter Abhängigkeiten (SQLite im Benutzer-Cache)
+    dependency_cache_enabled: bool = False
+    dependency_cache_path: Optional[str] = None     # None = Standard-Cache-Ordner
+    dependency_cache_max_entries: int = 100_000
+
+    # Parallele SQL-Analyse im "level"-Modus (0 = seriell im aufrufenden Thread)
+    parse_workers: int = 0
+    parse_chunksize: int = 8                        # SQL-Texte pro Worker-Aufgabe
+
+    # Objekt-Snapshot (EXA_ALL_OBJECTS) für Namensauflösung und Objekttypen
+    resolve_objects: bool = False
+    schema_search_path: List[str] = field(default_factory=list)
+
+    # Inkrementelle Aktualisierung anhand von LAST_COMMIT (EXA_ALL_OBJECTS)
+    incremental: bool = False
+
+    # SQL-Texte am Graphen ablegen (graph.graph["sql_texts"]) für die Suche nach Spaltenverwendungen
+    index_sql_texts: bool = False
@@ -1,3 +1,4 @@
+import logging
 import networkx as nx
 import sqlglot
 import re
@@ -7,11 +8,18 @@ from sqlglot.errors import ParseError
 from .sql_cleaner import SQLCleaner
 from .sql_executor import SQLExecutor
 from .sql_parser import SQLParser
-from .dependency_extractor import DependencyExtractor
+from .dependency_extractor import DependencyExtractor, EXTRACTOR_VERSION
+from .dependency_cache import DependencyCache
+from .parse_pool import ParsePool, create_text_extractor
 from .object_resolver import ObjectResolver
 from .graph_builder import GraphBuilder
+from .catalog_dependency_source import CatalogDependencySource
 from .data_lineage_config import DataLineageConfig
+from app.services.cte_contraction import cte_view
+from app.services.graph_version import mark_changed
+from app.services.search_index import SQL_TEXTS_ATTR
 
+logger = logging.getLogger(__name__)
 
 class DataLineageService:
     """
@@ -24,13 +32,43 @@ class DataLineageService:
         self.sql_executor = SQLExecutor(config, connection)
         self.sql_cleaner = SQLCleaner()
         self.sql_parser = SQLParser()
-        self.dependency_extractor = DependencyExtractor(include_ctes=config.include_ctes)
-        self.object_resolver = ObjectResolver(connection)
+        self.dependency_extractor = DependencyExtractor()
+        # Scanner bzw. sqlglot arbeiten direkt auf dem Rohtext; None = sqlparse-Pipeline
+        self.text_extractor = create_text_extractor(config.extractor)
+        self.object_resolver = ObjectResolver(connection, config.schema_search_path, config.fetch_batch_size)
         self.graph_builder = GraphBuilder()
+        self.catalog_dependencies = CatalogDependencySource(
+            connection, config.catalog_dependency_table, config.fetch_batch_size
+        )
+        self.dependency_cache = None
+        if config.dependency_cache_enabled:
+            self.dependency_cache = DependencyCache(
+                config.dependency_cache_path,
+                max_entries=config.dependency_cache_max_entries,
+                extractor_version=f"{EXTRACTOR_VERSION}:{config.extractor}",
+            )
+        self.parse_pool = None
+        if config.parse_workers > 0:
+            self.parse_pool = ParsePool(
+                config.parse_workers, config.parse_chunksize, config.extractor, shared=True
+            )
 
         self.visited_nodes = set()
         self.processing_stack = []
 
+        # Für inkrementelle Aktualisierung: letzte Abhängigkeiten und Commit-Zeitstempel
+        self.dependency_map = {}
+        self.commit_times = {}
+
+        # SQL-Texte der analysierten Objekte, nur mit config.index_sql_texts
+        self.sql_texts = {}
+
+    def set_connection(self, connection):
+        """Setzt eine neue DB-Verbindung, z.B. für eine spätere Aktualisierung."""
+        self.connection = connection
+        self.sql_executor.connection = connection
+        self.object_resolver.connection = connection
+        self.catalog_dependencies.connection = connection
 
     def build_graph(self, root_artifact: str) -> nx.DiGraph:
         """
@@ -39,16 +77,167 @@ class DataLineageService:
         if not root_artifact:
             return self.graph_builder.get_graph()
 
-        self.processing_stack.append(root_artifact)
-        self.process_nodes_iteratively()
+        if self.config.incremental and not self.config.mock_mode:
+            self.commit_times = self.object_resolver.load_commit_times()
+        if self.config.prefetch_catalog:
+            self.sql_executor.prefetch(self.config.prefetch_schemas)
+        if self.config.resolve_objects and not self.config.mock_mode:
+            self.object_resolver.load_snapshot()
+        if self.config.use_catalog_dependencies and not self.config.mock_mode:
+            self.catalog_dependencies.load(self.config.prefetch_schemas)
 
-        final_graph = self.graph_builder.get_graph()
+        try:
+            if self.config.crawl_mode == "level":
+                self.process_levels(root_artifact)
+            else:
+                self.processing_stack.append(root_artifact)
+                self.process_nodes_iteratively()
+        finally:
+            self._release_resources()
+
+        self._log_statistics()
+        return self._finalize_graph()
+
+    def build_warehouse_graph(self, schemas=None) -> nx.DiGraph:
+        """
+        Baut den Lineage-Graphen aller Views, Tabellen und Skripte der
+        angegebenen Schemas (None = alle) in einem Durchlauf: ein Objekt-Snapshot,
+        ein Bulk-Prefetch der SQL-Texte, paralleles Parsen, dann Verlinkung.
+        """
+        self.object_resolver.load_snapshot()
+        self.sql_executor.prefetch(schemas)
+        if self.config.use_catalog_dependencies:
+            self.catalog_dependencies.load(schemas)
+
+        artifacts = [a for a in self.object_resolver.object_names(schemas) if a not in self.visited_nodes]
+        self.visited_nodes.update(artifacts)
+        to_fetch = [a for a in artifacts if not self.catalog_dependencies.covers(a)]
+        sql_texts = self.sql_executor.get_sql_for_artifacts(to_fetch, self.config.frontier_chunk_size)
+
+        try:
+            extracted = self._extract_batch(sql_texts)
+            for artifact_name in artifacts:
+                if self.catalog_dependencies.covers(artifact_name):
+                    self._link_catalog_dependencies(artifact_name)
+                else:
+                    self._process_artifact(artifact_name, sql_texts.get(artifact_name, ""), extracted.get(artifact_name))
+        finally:
+            self._release_resources()
+
+        logger.info(f"Gesamt-Lineage: {len(artifacts)} Objekte analysiert.")
+        self._log_statistics()
+        return self._finalize_graph()
+
+    def refresh(self, root_artifact: str) -> nx.DiGraph:
+        """
+        Inkrementelle Aktualisierung: Nur Objekte, deren LAST_COMMIT sich seit
+        dem letzten Crawl geändert hat, werden neu geholt und analysiert; der
+        bestehende Graph wird an Ort und Stelle angepasst.
+        """
+        if not self.dependency_map or self.config.mock_mode:
+            return self.build_graph(root_artifact)
 
-        # Optionales Entfernen von CTE-Knoten für eine sauberere Ansicht
-        if not self.config.include_ctes:
-            self._prune_cte_nodes(final_graph)
+        current_times = self.object_resolver.load_commit_times()
+        changed = [
+            name for name in self.dependency_map
+            if current_times.get(name.upper()) != self.commit_times.get(name.upper())
+        ]
+        self.commit_times = current_times
+        logger.info(f"Inkrementelle Aktualisierung: {len(changed)} von {len(self.dependency_map)} Objekten geändert.")
+        if not changed:
+            return self._finalize_graph()
+
+        self.sql_executor.invalidate(changed)
+        if self.config.resolve_objects:
+            # Neue oder umbenannte Objekte sollen wie beim Aufbau aufgelöst werden
+            self.object_resolver.load_snapshot()
+        if self.config.use_catalog_dependencies:
+            self.catalog_dependencies.load(self.config.prefetch_schemas)
+        # Ebenen vor dem Entfernen der Kanten bestimmen, sonst fehlen Wege über geänderte Objekte
+        depths = self._depths_from_root(root_artifact) if self.config.crawl_mode == "level" else {}
+
+        for name in changed:
+            for dep in self.dependency_map.pop(name, []):
+                self.graph_builder.remove_edge(dep, name)
+            self.visited_nodes.discard(name)
+
+        # Geänderte Objekte neu analysieren; neue Abhängigkeiten werden wie beim Aufbau mitgecrawlt
+        try:
+            if self.config.crawl_mode == "level":
+                self.process_levels(root_artifact, {name: depths[name] for name in changed if name in depths})
+            else:
+                self.processing_stack.extend(changed)
+                self.process_nodes_iteratively()
+        finally:
+            self._release_resources()
+        self._remove_unreachable(root_artifact)
+        # Knoten- und Kantenzahl können gleich geblieben sein
+        mark_changed(self.graph_builder.get_graph())
+
+        self._log_statistics()
+        return self._finalize_graph()
+
+    def _depths_from_root(self, root_artifact: str) -> dict:
+        """Ebene jedes analysierten Objekts im Ebenen-Crawl (kürzester Weg zum Start-Artefakt)."""
+        graph = self.graph_builder.get_graph()
+        root_id = self.graph_builder.lookup(root_artifact)
+        if root_id is None or root_id not in graph:
+            return {}
+        hops = nx.single_source_shortest_path_length(graph.reverse(copy=False), root_id)
+        return {
+            name: hops[symbol] for name in self.dependency_map
+            if (symbol := self.graph_builder.lookup(name)) in hops
+        }
+
+    def _remove_unreachable(self, root_artifact: str):
+        """Entfernt Objekte, die nach einer Änderung nicht mehr in die Lineage einfließen."""
+        graph = self.graph_builder.get_graph()
+        root_id = self.graph_builder.lookup(root_artifact)
+        if root_id is None or root_id not in graph:
+            return
+        reachable = nx.ancestors(graph, root_id) | {root_id}
+        for name in list(self.visited_nodes | set(self.dependency_map)):
+            if self.graph_builder.lookup(name) not in reachable:
+                self.visited_nodes.discard(name)
+                self.dependency_map.pop(name, None)
+        graph.remove_nodes_from([n for n in list(graph.nodes) if n not in reachable])
 
-        return final_graph
+    def _release_resources(self):
+        """
+        Schließt den Abhängigkeits-Cache am Ende eines Aufbaus; er wird bei einer
+        späteren Aktualisierung neu geöffnet. Der geteilte Parser-Pool bleibt
+        für weitere Builds bestehen und wird erst beim Programmende beendet.
+        """
+        if self.dependency_cache is not None:
+            self.dependency_cache.close()
+
+    def _log_statistics(self):
+        if self.config.prefetch_catalog:
+            logger.info(f"Prefetch: {self.sql_executor.round_trips_saved} Round-Trips eingespart.")
+        if self.config.use_catalog_dependencies:
+            logger.info(f"Katalog: {self.catalog_dependencies.hits} Objekte ohne SQL-Parsing aufgelöst.")
+        if getattr(self.text_extractor, "fallbacks", 0):
+            logger.info(f"Scanner: {self.text_extractor.fallbacks} SQL-Texte über den vollen Parser analysiert.")
+        if getattr(self.text_extractor, "errors", 0):
+            logger.warning(f"sqlglot: {self.text_extractor.errors} SQL-Texte nicht parsebar.")
+        if self.dependency_cache is not None:
+            logger.info(f"Abhängigkeits-Cache: {self.dependency_cache.hits} Treffer, "
+                        f"{self.dependency_cache.misses} Fehlschläge.")
+
+    def _finalize_graph(self) -> nx.DiGraph:
+        """
+        Der Rohgraph des GraphBuilders bleibt mit allen CTE-Knoten erhalten;
+        ohne include_ctes wird die daraus abgeleitete CTE-freie Sicht geliefert.
+        """
+        final_graph = self.graph_builder.get_graph()
+
+        if self.config.index_sql_texts:
+            # Neues Dict je Aufbau, damit der Suchindex des Graphen neu erstellt wird
+            final_graph.graph[SQL_TEXTS_ATTR] = {
+                symbol: sql_text for name, sql_text in self.sql_texts.items()
+                if (symbol := self.graph_builder.lookup(name)) in final_graph
+            }
+        return cte_view(final_graph, self.config.include_ctes)
 
     def process_nodes_iteratively(self):
         """
@@ -60,51 +249,158 @@ class DataLineageService:
                 continue
             self.visited_nodes.add(artifact_name)
 
-            # 1. SQL für das Artefakt holen
-            sql_text = self.sql_executor.get_sql_for_artifact(artifact_name)
-            if not sql_text:
-                # Füge den Knoten trotzdem hinzu, um Sackgassen darzustellen
-                self.graph_builder.add_node(artifact_name, node_type="Undefined")
-                continue
+            if self.catalog_dependencies.covers(artifact_name):
+                dependencies = self._link_catalog_dependencies(artifact_name)
+            else:
+                # 1. SQL für das Artefakt holen
+                sql_text = self.sql_executor.get_sql_for_artifact(artifact_name)
+                dependencies = self._process_artifact(artifact_name, sql_text)
 
-            # 2. SQL-Text bereinigen
-            cleaned_sql = self.sql_cleaner.clean(sql_text)
+            for resolved_dep in dependencies:
+                if resolved_dep not in self.visited_nodes:
+                    self.processing_stack.append(resolved_dep)
 
-            # 3. SQL parsen (mit sqlglot)
-            parsed_statements = self.sql_parser.parse(cleaned_sql)
-            if not parsed_statements:
+    def process_levels(self, root_artifact: str, start: dict = None):
+        """
+        Breitensuche: Die unbesuchte Front jeder Ebene wird gesammelt und mit
+        einem (gestückelten) IN-Query geholt. Beachtet config.max_depth.
+        Mit `start` (Objekt -> Ebene) beginnt die Suche bei diesen Objekten
+        statt beim Start-Artefakt, z.B. bei einer inkrementellen Aktualisierung.
+        """
+        pending = {}
+        for name, level in (start.items() if start is not None else [(root_artifact, 0)]):
+            pending.setdefault(level, []).append(name)
+        frontier = []
+        depth = min(pending, default=0)
+        while frontier or pending:
+            frontier = [a for a in dict.fromkeys(frontier + pending.pop(depth, [])) if a not in self.visited_nodes]
+            if not frontier:
+                depth += 1
                 continue
+            self.visited_nodes.update(frontier)
+
+            # Vom Katalog abgedeckte Objekte brauchen keinen SQL-Text
+            to_fetch = [a for a in frontier if not self.catalog_dependencies.covers(a)]
+            sql_texts = self.sql_executor.get_sql_for_artifacts(to_fetch, self.config.frontier_chunk_size) if to_fetch else {}
 
-            # 4. Abhängigkeiten extrahieren
-            # Annahme: Der DependencyExtractor wurde für sqlglot angepasst
-            dependencies = self.dependency_extractor.extract(parsed_statements[0])
+            extracted = self._extract_batch(sql_texts)
 
-            # 5. Abhängigkeiten auflösen und zum Graphen hinzufügen
-            self.graph_builder.add_node(artifact_name) # Sicherstellen, dass der Knoten existiert
-            for dep_name in dependencies:
-                # Hier könnte eine komplexere Auflösung stattfinden (z.B. Schema bestimmen)
-                resolved_dep = self.object_resolver.resolve(dep_name)
-                if resolved_dep:
-                    self.graph_builder.add_edge(resolved_dep, artifact_name)
-                    if resolved_dep not in self.visited_nodes:
-                        self.processing_stack.append(resolved_dep)
+            next_frontier = []
+            for artifact_name in frontier:
+                if self.catalog_dependencies.covers(artifact_name):
+                    dependencies = self._link_catalog_dependencies(artifact_name)
+                else:
+                    dependencies = self._process_artifact(
+                        artifact_name, sql_texts.get(artifact_name, ""), extracted.get(artifact_name)
+                    )
+                if depth < self.config.max_depth:
+                    next_frontier.extend(dependencies)
 
+            frontier = next_frontier
+            depth += 1
 
-    def _prune_cte_nodes(self, graph: nx.DiGraph):
+    def _process_artifact(self, artifact_name: str, sql_text: str, dependencies: list = None) -> list:
         """
-        Entfernt alle CTE-Knoten aus dem Graph und verbindet ihre
-        Vorgänger direkt mit ihren Nachfolgern.
+        Analysiert den SQL-Text eines Artefakts, fügt Knoten und Kanten hinzu
+        und gibt die aufgelösten Abhängigkeiten zurück. Bereits (parallel)
+        extrahierte Abhängigkeiten können direkt übergeben werden.
         """
-        cte_nodes = [
-            n for n, data in graph.nodes(data=True)
-            if data.get('data') and getattr(data['data'], 'node_type', '') == 'CTE'
-        ]
+        if not sql_text:
+            # Füge den Knoten trotzdem hinzu, um Sackgassen darzustellen
+            node_type = self.object_resolver.get_object_type(artifact_name) or "Undefined"
+            self.graph_builder.add_node(artifact_name, node_type=node_type)
+            self.dependency_map[artifact_name] = []
+            self.sql_texts.pop(artifact_name, None)
+            return []
+
+        if self.config.index_sql_texts:
+            self.sql_texts[artifact_name] = sql_text
+        if dependencies is None:
+            dependencies = self._extract_dependencies(sql_text)
+        if dependencies is None:
+            return []
+
+        # 5. Abhängigkeiten auflösen und zum Graphen hinzufügen
+        return self._link_dependencies(artifact_name, dependencies)
+
+    def _extract_batch(self, sql_texts: dict) -> dict:
+        """
+        Extrahiert die Abhängigkeiten einer ganzen Ebene im Prozess-Pool.
+        Cache-Treffer werden nicht an den Pool geschickt. Ohne Pool leer.
+        """
+        if self.parse_pool is None or len(sql_texts) < 2:
+            return {}
+
+        results = {}
+        pending = {}
+        for name, sql_text in sql_texts.items():
+            if not sql_text:
+                continue
+            cached = self.dependency_cache.get(sql_text) if self.dependency_cache is not None else None
+            if cached is not None:
+                results[name] = cached
+            else:
+                pending[name] = sql_text
+
+        for name, dependencies in self.parse_pool.extract_many(pending).items():
+            results[name] = dependencies
+            if dependencies is not None and self.dependency_cache is not None:
+                self.dependency_cache.put(pending[name], dependencies)
+        return results
+
+    def _extract_dependencies(self, sql_text: str):
+        """
+        Liefert die unaufgelösten Abhängigkeiten eines SQL-Textes, bevorzugt
+        aus dem persistenten Cache. None, wenn der Text nicht parsebar ist.
+        """
+        if self.dependency_cache is not None:
+            cached = self.dependency_cache.get(sql_text)
+            if cached is not None:
+                return cached
+
+        dependencies = self._parse_dependencies(sql_text)
+
+        if dependencies is not None and self.dependency_cache is not None:
+            self.dependency_cache.put(sql_text, dependencies)
+        return dependencies
+
+    def _parse_dependencies(self, sql_text: str):
+        """Analysiert einen SQL-Text ohne Cache; None, wenn er nicht parsebar ist."""
+        if self.text_extractor is not None:
+            # Token-Scanner (mit eigenem Fallback) oder sqlglot-AST
+            return self.text_extractor.extract(sql_text)
+
+        # 2. SQL-Text bereinigen
+        cleaned_sql = self.sql_cleaner.clean(sql_text)
+
+        # 3. SQL parsen
+        parsed_statements = self.sql_parser.parse(cleaned_sql)
+        if not parsed_statements:
+            return None
+
+        # 4. Abhängigkeiten aus allen Statements extrahieren
+        return self.dependency_extractor.extract(parsed_statements)
+
+    def _link_catalog_dependencies(self, artifact_name: str) -> list:
+        """Übernimmt die Katalog-Kanten eines Objekts ohne SQL-Parsing."""
+        return self._link_dependencies(
+            artifact_name,
+            self.catalog_dependencies.get_dependencies(artifact_name),
+            node_type=self.catalog_dependencies.get_object_type(artifact_name),
+        )
+
+    def _link_dependencies(self, artifact_name: str, dependencies: list, node_type: str = None) -> list:
+        """Löst Abhängigkeiten auf, fügt die Kanten hinzu und gibt die aufgelösten Namen zurück."""
+        node_type = node_type or self.object_resolver.get_object_type(artifact_name)
+        self.graph_builder.add_node(artifact_name, node_type=node_type) # Sicherstellen, dass der Knoten existiert
 
-        for cte in cte_nodes:
-            preds = list(graph.predecessors(cte))
-            succs = list(graph.successors(cte))
-            for p in preds:
-                for s in succs:
-                    if p != s and not graph.has_edge(p, s):
-                        graph.add_edge(p, s)
-            graph.remove_node(cte)
\ No newline at end of file
+        # Unqualifizierte Namen zuerst im Schema des referenzierenden Objekts suchen
+        current_schema = artifact_name.split(".", 1)[0] if "." in artifact_name else None
+        resolved_deps = []
+        for dep_name in dependencies:
+            resolved_dep, dep_type = self.object_resolver.resolve_object(dep_name, current_schema)
+            if resolved_dep:
+                self.graph_builder.add_edge(resolved_dep, artifact_name, src_type=dep_type)
+                resolved_deps.append(resolved_dep)
+        self.dependency_map[artifact_name] = resolved_deps
+        return resolved_deps
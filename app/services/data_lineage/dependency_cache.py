@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Callable, List, Optional
+
+from app.utils.cache_dir import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyCache:
+    """
+    Persistenter, inhaltsadressierter Cache für extrahierte Abhängigkeiten.
+    Schlüssel ist ein Hash aus Extraktor-Version und rohem SQL-Text; ein
+    unverändertes Objekt kostet so nur einen Hash und einen Lookup.
+
+    Mehrere Prozesse (z.B. zwei Tabs oder precompute_lineage.py) können
+    dieselbe Datei nutzen: Die Datenbank läuft im WAL-Modus, Schreibzugriffe
+    werden gesammelt und je Stapel in einer kurzen Transaktion geschrieben.
+    Ist die Datei dennoch gesperrt, zählt ein Lesen als Fehlschlag und ein
+    Schreiben entfällt; der Crawl läuft ohne Cache weiter.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100_000, extractor_version: str = "1",
+                 clock: Callable[[], float] = time.time, batch_size: int = 500, busy_timeout: float = 2.0):
+        if path is None:
+            path = os.path.join(default_cache_dir(), "dependency_cache.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.extractor_version = extractor_version
+        self.batch_size = batch_size
+        self.busy_timeout = busy_timeout  # Sekunden Warten auf eine fremde Sperre
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock  # Zeitstempel für die LRU-Verdrängung
+
+        # Noch nicht geschriebene Einträge bzw. Zugriffszeiten je Schlüssel
+        self._pending = {}
+        self._touched = {}
+
+        self._conn = None
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Offene Verbindung; nach close() wird die Datenbank bei Bedarf neu geöffnet."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dependencies ("
+                "key TEXT PRIMARY KEY, deps TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON dependencies(last_used)")
+            self._conn.commit()
+        return self._conn
+
+    def key(self, sql_text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.extractor_version.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(sql_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, sql_text: str) -> Optional[List[str]]:
+        key = self.key(sql_text)
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+            self._pending[key] = (pending[0], self._clock())
+            return json.loads(pending[0])
+        try:
+            row = self._connection().execute("SELECT deps FROM dependencies WHERE key = ?", (key,)).fetchone()
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Abhängigkeits-Cache nicht lesbar: {e}")
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = self._clock()
+        return json.loads(row[0])
+
+    def put(self, sql_text: str, dependencies: List[str]):
+        self._pending[self.key(sql_text)] = (json.dumps(list(dependencies)), self._clock())
+        if len(self._pending) + len(self._touched) >= self.batch_size:
+            self._write_pending()
+
+    def _write_pending(self):
+        """Schreibt gesammelte Einträge und Zugriffszeiten in einer Transaktion."""
+        if not self._pending and not self._touched:
+            return
+        conn = self._connection()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO dependencies (key, deps, last_used) VALUES (?, ?, ?)",
+                [(key, deps, used) for key, (deps, used) in self._pending.items()],
+            )
+            conn.executemany(
+                "UPDATE dependencies SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()],
+            )
+            conn.commit()
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            logger.warning(f"Abhängigkeits-Cache gesperrt, {len(self._pending)} Einträge nicht gespeichert: {e}")
+        self._pending.clear()
+        self._touched.clear()
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM dependencies").fetchone()[0] + len(self._pending)
+
+    def flush(self):
+        """Schreibt ausstehende Änderungen und verdrängt die am längsten ungenutzten Einträge."""
+        self._write_pending()
+        conn = self._connection()
+        try:
+            overflow = len(self) - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM dependencies WHERE key IN "
+                    "(SELECT key FROM dependencies ORDER BY last_used ASC LIMIT ?)",
+                    (overflow,),
+                )
+                conn.commit()
+                logger.info(f"Abhängigkeits-Cache: {overflow} Einträge verdrängt.")
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            logger.warning(f"Abhängigkeits-Cache: Verdrängung übersprungen: {e}")
+
+    def close(self):
+        """Schreibt ausstehende Änderungen und schließt die Datenbank."""
+        if self._conn is None and not self._pending and not self._touched:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    @property
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,13 +1,100 @@
+from typing import List, NamedTuple
+
+from sqlparse import tokens as T
+from sqlparse.sql import Function, Identifier, IdentifierList, Parenthesis
+
+# Bei jeder Änderung der Bereinigungs- oder Extraktionslogik erhöhen, damit persistierte
+# Ergebnisse im DependencyCache ungültig werden.
+EXTRACTOR_VERSION = 3
+
+
+class References(NamedTuple):
+    """Gelesene (sources) und geschriebene (targets) Objekte eines SQL-Textes."""
+    sources: List[str]
+    targets: List[str]
+
+
 class DependencyExtractor:
     """
-    Extrahiert Tabellen-/View-Abhängigkeiten aus einem geparsten SQL-Statement.
+    Extrahiert Tabellen-/View-Abhängigkeiten aus geparsten SQL-Statements.
+    Durchläuft den sqlparse-Baum rekursiv, damit auch Subqueries und
+    CTE-Körper erfasst werden. CTE-Namen selbst sind keine Abhängigkeiten;
+    CTE-Knoten im Graphen und deren Ausblendung regelt cte_view().
     """
     def extract(self, parsed_statements) -> list:
-        deps = []
+        return self.extract_references(parsed_statements).sources
+
+    def extract_references(self, parsed_statements) -> References:
+        sources, targets = {}, {}
         for stmt in parsed_statements:
-            tokens = [t for t in stmt.tokens if not t.is_whitespace]
-            for idx, token in enumerate(tokens):
-                if token.ttype is None and token.value.upper() in ("FROM", "JOIN"):
-                    if idx + 1 < len(tokens):
-                        deps.append(tokens[idx + 1].value)
-        return deps
+            self._walk(stmt, set(), sources, targets)
+        return References(list(sources), list(targets))
+
+    def _walk(self, token_list, ctes: set, sources: dict, targets: dict):
+        dml = None
+        expect = None
+        for token in token_list.tokens:
+            if token.is_whitespace or token.ttype in T.Comment:
+                continue
+            if token.ttype in T.Keyword.DML:
+                dml = token.normalized
+                expect = "target" if dml == "UPDATE" else None
+                continue
+            if token.ttype in T.Keyword.CTE:
+                expect = "cte"
+                continue
+            if token.is_keyword:
+                keyword = token.normalized
+                if keyword == "FROM":
+                    # FROM ohne SELECT/DELETE, z.B. EXTRACT(YEAR FROM d), ist keine Tabellenreferenz
+                    expect = "target" if dml == "DELETE" else "source" if dml else None
+                elif keyword.endswith("JOIN") or keyword == "USING":
+                    expect = "source"
+                elif keyword == "INTO":
+                    expect = "target"
+                else:
+                    expect = None
+                continue
+
+            if expect:
+                self._collect(token, expect, ctes, sources, targets)
+                expect = None
+            elif token.is_group:
+                self._walk(token, ctes, sources, targets)
+
+    def _collect(self, token, kind: str, ctes: set, sources: dict, targets: dict):
+        if isinstance(token, IdentifierList):
+            for item in token.get_identifiers():
+                self._collect(item, kind, ctes, sources, targets)
+            return
+
+        if kind == "cte":
+            # "name [(spalten)] AS (körper)"
+            first = token.token_first(skip_cm=True) if token.is_group else token
+            name = first.get_name() if isinstance(first, (Function, Identifier)) else first.value
+            ctes.add(name.upper())
+            if token.is_group:
+                self._walk(token, ctes, sources, targets)
+            return
+
+        if isinstance(token, Parenthesis) or (token.is_group and isinstance(token.token_first(), Parenthesis)):
+            # Abgeleitete Tabelle oder USING-Spaltenliste
+            self._walk(token, ctes, sources, targets)
+            return
+        if isinstance(token, Function):
+            # Tabellenfunktion: nur Argumente durchsuchen
+            self._walk(token, ctes, sources, targets)
+            return
+
+        name = self._object_name(token)
+        if "." not in name and name.upper() in ctes:
+            return
+        (targets if kind == "target" else sources)[name] = None
+
+    @staticmethod
+    def _object_name(token) -> str:
+        # Alias abschneiden: "s.t1 a" -> "s.t1"
+        if isinstance(token, Identifier) and token.get_real_name():
+            parent = token.get_parent_name()
+            return f"{parent}.{token.get_real_name()}" if parent else token.get_real_name()
+        return token.value
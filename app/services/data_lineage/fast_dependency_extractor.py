@@ -0,0 +1,192 @@
+import re
+from typing import Optional
+
+from .sql_cleaner import SQLCleaner
+from .sql_parser import SQLParser
+from .dependency_extractor import DependencyExtractor, References
+
+_IDENT = r'(?:"[^"]*(?:""[^"]*)*"|[^\W\d]\w*)'
+
+# Kompilierter Scanner: erkennt Kommentare, Literale, (qualifizierte) Namen
+# und Klammern, ohne einen Parse-Baum aufzubauen.
+_TOKEN_PATTERN = re.compile(
+    rf"""
+      (?P<skip>\s+|--[^\n]*|/\*.*?\*/)
+    | (?P<literal>'[^']*(?:''[^']*)*')
+    | (?P<name>{_IDENT}(?:\.{_IDENT})*(?:\.\*)?)
+    | (?P<open>\()
+    | (?P<close>\))
+    | (?P<comma>,)
+    | (?P<semicolon>;)
+    | (?P<other>[^\s'"(),;\w]+|\S)
+    """,
+    re.S | re.X,
+)
+
+# Schlüsselwörter, nach denen keine Tabellenliste mehr folgt
+_CLAUSE_END = {
+    "WHERE", "GROUP", "HAVING", "ORDER", "QUALIFY", "CONNECT", "START", "PREFERRING",
+    "LIMIT", "UNION", "INTERSECT", "EXCEPT", "MINUS", "SET", "VALUES", "WHEN",
+}
+# Wörter, die an einer Tabellenposition auf nicht unterstützte Konstrukte hindeuten
+_UNCLASSIFIABLE = {"TABLE", "LATERAL", "VALUES", "SELECT", "WITH", "UNNEST"}
+
+
+class _Scope:
+    """Zustand einer Klammerebene."""
+    __slots__ = ("dml", "in_from", "cte_list")
+
+    def __init__(self):
+        self.dml = None          # SELECT / DELETE / INSERT / UPDATE / MERGE
+        self.in_from = False     # innerhalb einer FROM-Liste (Komma = weitere Tabelle)
+        self.cte_list = False    # innerhalb einer WITH-Liste (Komma = weiterer CTE)
+
+
+class FastDependencyExtractor:
+    """
+    Schneller Extraktor auf Basis eines kompilierten Token-Scanners. Findet
+    Tabellenreferenzen nach FROM/JOIN/USING (Quellen) sowie INTO/UPDATE/MERGE
+    (Ziele) auf jeder Verschachtelungsebene. Bei Konstrukten, die er nicht
+    sicher einordnen kann, fällt er auf den vollständigen sqlparse-Pfad zurück.
+    """
+    def __init__(self):
+        self.fallbacks = 0
+        self._sql_cleaner = SQLCleaner()
+        self._sql_parser = SQLParser()
+        self._full_extractor = DependencyExtractor()
+
+    def extract(self, sql_text: str) -> Optional[list]:
+        """Quellen eines rohen SQL-Textes; None, wenn auch der Fallback nichts parsen kann."""
+        references = self.extract_references(sql_text)
+        return references.sources if references is not None else None
+
+    def extract_references(self, sql_text: str) -> Optional[References]:
+        references = self.scan(sql_text)
+        if references is not None:
+            return references
+
+        self.fallbacks += 1
+        parsed_statements = self._sql_parser.parse(self._sql_cleaner.clean(sql_text))
+        if not parsed_statements:
+            return None
+        return self._full_extractor.extract_references(parsed_statements)
+
+    def scan(self, sql_text: str) -> Optional[References]:
+        """
+        Reiner Scanner-Durchlauf. Gibt None zurück, wenn ein Konstrukt nicht
+        eindeutig klassifiziert werden kann (Fallback nötig).
+        """
+        tokens = [
+            (m.lastgroup, m.group())
+            for m in _TOKEN_PATTERN.finditer(sql_text)
+            if m.lastgroup != "skip"
+        ]
+        if not tokens:
+            return None
+
+        sources, targets = {}, {}
+        ctes = set()
+        scopes = [_Scope()]
+        expect = None            # "source", "target" oder "cte"
+
+        for idx, (kind, value) in enumerate(tokens):
+            scope = scopes[-1]
+
+            if kind == "open":
+                if expect in ("target", "cte"):
+                    return None
+                # Nach FROM/JOIN/USING: abgeleitete Tabelle oder Spaltenliste
+                expect = None
+                scopes.append(_Scope())
+                continue
+            if kind == "close":
+                if len(scopes) == 1:
+                    return None
+                scopes.pop()
+                continue
+            if kind == "semicolon":
+                if len(scopes) != 1:
+                    return None
+                scopes[0] = _Scope()
+                ctes = set()
+                expect = None
+                continue
+            if kind == "comma":
+                if expect:
+                    return None
+                if scope.in_from:
+                    expect = "source"
+                elif scope.cte_list:
+                    expect = "cte"
+                continue
+            if kind in ("other", "literal"):
+                # Offene Literale/Kommentare oder Platzhalter an Tabellenposition
+                if expect or value in ("'", '"') or value.startswith("/*"):
+                    return None
+                continue
+
+            # kind == "name"
+            word = value.upper()
+            if expect == "cte":
+                if word in ("RECURSIVE",):
+                    continue
+                ctes.add(self._normalize(value).upper())
+                expect = None
+                continue
+            if expect:
+                if word in _UNCLASSIFIABLE:
+                    return None
+                next_kind = tokens[idx + 1][0] if idx + 1 < len(tokens) else None
+                if expect == "source" and next_kind == "open":
+                    # Tabellenfunktion o.Ä.
+                    return None
+                name = self._normalize(value)
+                if expect == "target":
+                    targets[name] = None
+                elif "." in name or name.upper() not in ctes:
+                    sources[name] = None
+                expect = None
+                continue
+
+            if scope.dml == "MERGE" and word in ("UPDATE", "INSERT", "DELETE"):
+                # WHEN [NOT] MATCHED THEN UPDATE/INSERT/DELETE: ohne eigene Tabelle
+                scope.in_from = False
+            elif word in ("SELECT", "DELETE", "INSERT", "MERGE"):
+                scope.dml = word
+                scope.in_from = False
+                scope.cte_list = False
+            elif word == "UPDATE":
+                scope.dml = word
+                scope.in_from = False
+                expect = "target"
+            elif word == "WITH":
+                scope.cte_list = True
+                expect = "cte"
+            elif word == "FROM":
+                if scope.dml == "DELETE":
+                    expect = "target"
+                elif scope.dml:
+                    expect = "source"
+                    scope.in_from = True
+                # sonst z.B. EXTRACT(YEAR FROM d): keine Tabellenreferenz
+            elif word == "JOIN":
+                expect = "source"
+                scope.in_from = True
+            elif word == "USING":
+                expect = "source"
+            elif word == "INTO":
+                expect = "target"
+            elif word in _CLAUSE_END:
+                scope.in_from = False
+
+        if expect or len(scopes) != 1:
+            return None
+        return References(list(sources), list(targets))
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        """Entfernt Quotes aus (qualifizierten) Namen: "S"."T" -> S.T"""
+        if '"' not in name:
+            return name
+        parts = re.findall(r'"((?:[^"]|"")*)"|([^."]+)', name)
+        return ".".join(quoted.replace('""', '"') if quoted else plain for quoted, plain in parts)
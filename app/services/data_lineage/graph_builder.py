@@ -1,22 +1,54 @@
+from typing import Optional
+
 import networkx as nx
 from app.models.node import Node
 
 class GraphBuilder:
     """
     Baut einen NetworkX-DiGraph für Data-Lineage.
+
+    Knoten werden über eine Symboltabelle identifiziert: Jeder kanonische
+    Objektname erhält einmalig eine fortlaufende Ganzzahl-ID; der Name selbst
+    liegt als Attribut am Node-Objekt. So kollidieren z.B. "A.B_C" und "A_B.C"
+    nicht, und der Graph lässt sich direkt mit Array-Algorithmen verwenden.
     """
     def __init__(self):
         self.graph = nx.DiGraph()
+        self._symbols = {}   # kanonischer Name -> ID
+        self.names = []      # ID -> kanonischer Name
+
+    def node_id(self, name: str) -> int:
+        """ID eines Namens; unbekannte Namen erhalten die nächste freie ID."""
+        symbol = self._symbols.get(name)
+        if symbol is None:
+            symbol = self._symbols[name] = len(self.names)
+            self.names.append(name)
+        return symbol
+
+    def lookup(self, name: str) -> Optional[int]:
+        """ID eines bereits bekannten Namens, sonst None."""
+        return self._symbols.get(name)
+
+    def add_node(self, name: str, node_type=None) -> int:
+        """
+        Fügt einen Knoten hinzu. Ohne Typ wird ein neuer Knoten als TABLE
+        angelegt; ein explizit übergebener Typ aktualisiert bestehende Knoten.
+        """
+        symbol = self.node_id(name)
+        if symbol not in self.graph:
+            node = Node(id=symbol, name=name, node_type=node_type or "TABLE", context=name).bind(self.graph)
+            self.graph.add_node(symbol, data=node)
+        elif node_type:
+            self.graph.nodes[symbol]['data'].node_type = node_type
+        return symbol
 
-    def add_node(self, name: str, node_type="TABLE"):
-        clean_id = name.replace(".", "_")
-        if clean_id not in self.graph:
-            self.graph.add_node(clean_id, data=Node(id=clean_id, name=name, node_type=node_type))
+    def add_edge(self, src: str, dst: str, src_type=None):
+        self.graph.add_edge(self.add_node(src, src_type), self.add_node(dst))
 
-    def add_edge(self, src: str, dst: str):
-        self.add_node(src)
-        self.add_node(dst)
-        self.graph.add_edge(src.replace(".", "_"), dst.replace(".", "_"))
+    def remove_edge(self, src: str, dst: str):
+        src_id, dst_id = self.lookup(src), self.lookup(dst)
+        if src_id is not None and dst_id is not None and self.graph.has_edge(src_id, dst_id):
+            self.graph.remove_edge(src_id, dst_id)
 
     def get_graph(self):
         return self.graph
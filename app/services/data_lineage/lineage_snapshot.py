@@ -0,0 +1,89 @@
+import logging
+import os
+import time
+from typing import Optional
+
+import networkx as nx
+import numpy as np
+
+from .compact_graph import CompactGraph, gather_neighbors
+from app.utils.cache_dir import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+def default_snapshot_path(data_source: str) -> str:
+    """Standardablage des vorberechneten Snapshots einer Datenquelle."""
+    return os.path.join(default_cache_dir(), f"lineage_snapshot_{data_source}")
+
+
+class LineageSnapshot:
+    """
+    Vorberechneter Lineage-Graph eines ganzen Warehouses. Einzelne Artefakte
+    werden wie im MockGraphBuilder über Vorfahren/Nachfahren herausgeschnitten,
+    ohne die Datenbank erneut zu crawlen. Gespeichert wird im kompakten
+    Binärformat (CompactGraph), das beim Laden nur eingeblendet wird.
+    """
+
+    def __init__(self, graph: CompactGraph, created_at: Optional[float] = None, data_source: str = ""):
+        self.graph = graph
+        self.created_at = created_at if created_at is not None else graph.meta.get("created_at", time.time())
+        self.data_source = data_source or graph.meta.get("data_source", "")
+
+    @classmethod
+    def from_lineage_graph(cls, graph: nx.DiGraph, data_source: str = "") -> "LineageSnapshot":
+        """
+        Übernimmt einen vom DataLineageService gebauten Graphen (Knotendaten als
+        Node). Im Snapshot werden Knoten über ihren kanonischen Namen gefunden.
+        """
+        return cls(CompactGraph.from_networkx(graph), data_source=data_source)
+
+    def __contains__(self, artifact_name: str) -> bool:
+        return self.graph.index_of(artifact_name) is not None
+
+    def __len__(self) -> int:
+        return self.graph.node_count
+
+    def to_networkx(self) -> nx.DiGraph:
+        return self.graph.to_networkx()
+
+    @property
+    def age(self) -> float:
+        """Alter des Snapshots in Sekunden."""
+        return time.time() - self.created_at
+
+    def slice(self, artifact_name: str, max_depth: Optional[int] = None) -> nx.DiGraph:
+        """
+        Subgraph aus allen Vorfahren und Nachfahren des Artefakts, mit
+        max_depth nur bis zu so vielen Ebenen in jede Richtung.
+        """
+        start = self.graph.index_of(artifact_name)
+        if start is None:
+            return nx.DiGraph()
+
+        relevant = (self._reachable(start, self.graph.pred_indptr, self.graph.pred_indices, max_depth)
+                    | self._reachable(start, self.graph.succ_indptr, self.graph.succ_indices, max_depth))
+        return self.graph.to_networkx(np.flatnonzero(relevant))
+
+    def _reachable(self, start: int, indptr: np.ndarray, indices: np.ndarray,
+                   max_depth: Optional[int] = None) -> np.ndarray:
+        """Ebenenweise BFS über die CSR-Arrays; liefert eine boolesche Maske."""
+        seen = np.zeros(self.graph.node_count, dtype=bool)
+        seen[start] = True
+        frontier = np.array([start], dtype=np.int32)
+        depth = 0
+        while frontier.size and (max_depth is None or depth < max_depth):
+            depth += 1
+            neighbors = gather_neighbors(indptr, indices, frontier)
+            frontier = np.unique(neighbors[~seen[neighbors]])
+            seen[frontier] = True
+        return seen
+
+    def save(self, path: str):
+        self.graph.meta.update(created_at=self.created_at, data_source=self.data_source)
+        self.graph.save(path)
+        logger.info(f"Lineage-Snapshot mit {len(self)} Knoten nach {path} geschrieben.")
+
+    @classmethod
+    def load(cls, path: str) -> "LineageSnapshot":
+        return cls(CompactGraph.load(path))
@@ -1,10 +1,106 @@
+import logging
+from typing import Iterable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResolvedObject(NamedTuple):
+    name: str                   # Vollqualifizierter Name, z.B. DWH_CORE.D_CUSTOMER
+    object_type: Optional[str]  # TABLE, VIEW, SCRIPT, ... oder None, wenn unbekannt
+
+
 class ObjectResolver:
     """
-    Löst Objekt-Namen (Tabellen, Views) auf – hier noch Dummy-Logik.
+    Löst Objekt-Namen (Tabellen, Views) auf. Mit geladenem Snapshot von
+    EXA_ALL_OBJECTS werden unqualifizierte Namen über das aktuelle Schema und
+    einen Schema-Suchpfad in O(1) per Dict-Index aufgelöst – ohne Einzelabfragen.
     """
-    def __init__(self, connection=None):
+    SNAPSHOT_QUERY = (
+        "SELECT ROOT_NAME, OBJECT_NAME, OBJECT_TYPE FROM EXA_ALL_OBJECTS "
+        "WHERE ROOT_TYPE = 'SCHEMA'"
+    )
+    COMMIT_TIMES_QUERY = (
+        "SELECT ROOT_NAME, OBJECT_NAME, LAST_COMMIT FROM EXA_ALL_OBJECTS "
+        "WHERE ROOT_TYPE = 'SCHEMA'"
+    )
+
+    def __init__(self, connection=None, search_path: Iterable[str] = (), fetch_batch_size: int = 1000):
         self.connection = connection
+        self.search_path = [s.upper() for s in search_path]
+        self.fetch_batch_size = fetch_batch_size
+
+        self._types = {}     # "SCHEMA.NAME" -> Objekttyp
+        self._schemas = {}   # "NAME" -> [Schemas, die ein Objekt dieses Namens enthalten]
+
+    def load_snapshot(self) -> int:
+        """
+        Lädt alle Objekte in einem Query in den Index und ersetzt einen früher
+        geladenen Stand (entfernte Objekte fallen heraus). Gibt deren Anzahl zurück.
+        """
+        if not self.connection:
+            return 0
+
+        types, schemas = {}, {}
+        cur = self.connection.cursor()
+        cur.execute(self.SNAPSHOT_QUERY)
+        while True:
+            rows = cur.fetchmany(self.fetch_batch_size)
+            if not rows:
+                break
+            for schema, name, object_type in rows:
+                schema, name = schema.upper(), name.upper()
+                types[f"{schema}.{name}"] = object_type
+                schemas.setdefault(name, []).append(schema)
+        self._types, self._schemas = types, schemas
+
+        logger.info(f"Objekt-Snapshot: {len(self._types)} Objekte indiziert.")
+        return len(self._types)
+
+    def object_names(self, schemas: Optional[Iterable[str]] = None) -> list:
+        """Alle indizierten Objekte ("SCHEMA.NAME"), optional auf Schemas eingeschränkt."""
+        if not schemas:
+            return list(self._types)
+        wanted = {s.strip().upper() for s in schemas}
+        return [name for name in self._types if name.split(".", 1)[0] in wanted]
+
+    def load_commit_times(self) -> dict:
+        """Liefert "SCHEMA.NAME" -> LAST_COMMIT für alle Objekte (ein Query)."""
+        if not self.connection:
+            return {}
+
+        commit_times = {}
+        cur = self.connection.cursor()
+        cur.execute(self.COMMIT_TIMES_QUERY)
+        while True:
+            rows = cur.fetchmany(self.fetch_batch_size)
+            if not rows:
+                break
+            for schema, name, last_commit in rows:
+                commit_times[f"{schema}.{name}".upper()] = last_commit
+        return commit_times
+
+    def resolve(self, object_name: str, current_schema: Optional[str] = None) -> str:
+        return self.resolve_object(object_name, current_schema).name
+
+    def resolve_object(self, object_name: str, current_schema: Optional[str] = None) -> ResolvedObject:
+        name = object_name.strip().upper()
+        if not name or not self._types:
+            return ResolvedObject(name, None)
+
+        if "." in name:
+            return ResolvedObject(name, self._types.get(name))
+
+        # Unqualifiziert: aktuelles Schema, dann Suchpfad, dann eindeutiger Treffer
+        for schema in (current_schema, *self.search_path):
+            if schema:
+                qualified = f"{schema.upper()}.{name}"
+                if qualified in self._types:
+                    return ResolvedObject(qualified, self._types[qualified])
+        schemas = self._schemas.get(name, ())
+        if len(schemas) == 1:
+            qualified = f"{schemas[0]}.{name}"
+            return ResolvedObject(qualified, self._types[qualified])
+        return ResolvedObject(name, None)
 
-    def resolve(self, object_name: str) -> str:
-        # TODO: Später DB-Lookup für Schema/Typ
-        return object_name.strip().upper()
+    def get_object_type(self, object_name: str) -> Optional[str]:
+        return self._types.get(object_name.strip().upper())
@@ -0,0 +1,124 @@
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+
+from .sql_cleaner import SQLCleaner
+from .sql_parser import SQLParser
+from .dependency_extractor import DependencyExtractor
+from .fast_dependency_extractor import FastDependencyExtractor
+from .sqlglot_extractor import SqlglotDependencyExtractor
+
+logger = logging.getLogger(__name__)
+
+
+_TEXT_EXTRACTORS = {
+    "fast": FastDependencyExtractor,
+    "sqlglot": SqlglotDependencyExtractor,
+}
+_worker_extractors = {}
+
+# Prozessweit geteilte Pools je Worker-Anzahl; leben über einzelne Builds hinweg
+_shared_executors = {}
+_shared_executors_lock = threading.Lock()
+
+
+def create_text_extractor(extractor: str):
+    """
+    Erzeugt einen Extraktor, der direkt auf rohem SQL-Text arbeitet.
+    None für "sqlparse" (Bereinigen/Parsen/Extrahieren in Einzelschritten).
+    """
+    extractor_cls = _TEXT_EXTRACTORS.get(extractor)
+    return extractor_cls() if extractor_cls else None
+
+
+def extract_dependencies(sql_text: str, extractor: str = "fast") -> Optional[list]:
+    """
+    Bereinigt, parst und extrahiert einen SQL-Text in einem Schritt.
+    Liefert eine einfache Namensliste (keine Parse-Bäume), damit das Ergebnis
+    billig zwischen Prozessen übertragen werden kann. None = nicht parsebar.
+    """
+    if extractor in _TEXT_EXTRACTORS:
+        # Ein Extraktor pro Prozess, damit z.B. der AST-Cache von sqlglot erhalten bleibt
+        if extractor not in _worker_extractors:
+            _worker_extractors[extractor] = create_text_extractor(extractor)
+        return _worker_extractors[extractor].extract(sql_text)
+    cleaned_sql = SQLCleaner().clean(sql_text)
+    parsed_statements = SQLParser().parse(cleaned_sql)
+    if not parsed_statements:
+        return None
+    return DependencyExtractor().extract(parsed_statements)
+
+
+class ParsePool:
+    """
+    Verteilt Bereinigen/Parsen/Extrahieren eines Batches von SQL-Texten auf
+    einen ProcessPoolExecutor. sqlparse ist reines Python; im eigenen Prozess
+    blockiert es weder den GIL des UI-Prozesses noch ist es auf einen Kern beschränkt.
+    """
+
+    def __init__(self, workers: int, chunksize: int = 8, extractor: str = "fast", shared: bool = False):
+        self.workers = workers
+        self.extractor = extractor
+        self.chunksize = chunksize
+        # shared: prozessweiter Pool, der erst beim Programmende beendet wird
+        self.shared = shared
+        self._executor = None
+
+    def extract_many(self, sql_texts: Dict[str, str]) -> Dict[str, Optional[list]]:
+        """Gibt für jeden Namen die extrahierten Abhängigkeiten zurück."""
+        if not sql_texts:
+            return {}
+        if self.shared:
+            executor = _shared_executor(self.workers)
+        else:
+            if self._executor is None:
+                self._executor = _spawn_executor(self.workers)
+            executor = self._executor
+
+        names = list(sql_texts)
+        worker = partial(extract_dependencies, extractor=self.extractor)
+        results = executor.map(worker, [sql_texts[n] for n in names], chunksize=self.chunksize)
+        return dict(zip(names, results))
+
+    def shutdown(self):
+        """Beendet einen eigenen Pool; ein geteilter bleibt für spätere Builds bestehen."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def _spawn_executor(workers: int) -> ProcessPoolExecutor:
+    # "spawn": fork aus dem Crawl-Thread der UI kann Sperren anderer Threads mitkopieren
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _shared_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Prozessweit geteilter Pool: Der Start der Worker (mit "spawn" inkl. erneutem
+    Import der Anwendung) fällt nur einmal an statt bei jedem Build.
+    """
+    with _shared_executors_lock:
+        executor = _shared_executors.get(workers)
+        if executor is None:
+            executor = _shared_executors[workers] = _spawn_executor(workers)
+        return executor
+
+
+@atexit.register
+def shutdown_shared_pools():
+    """Beendet die geteilten Pools beim Programmende."""
+    with _shared_executors_lock:
+        executors = list(_shared_executors.values())
+        _shared_executors.clear()
+    for executor in executors:
+        executor.shutdown(cancel_futures=True)
@@ -1,16 +1,57 @@
 import re
 
+# Ein einziger Scanner über den gesamten Text. String-Literale und
+# Quoted Identifiers werden als Ganzes erkannt, damit darin enthaltene
+# "--" oder "/*" nicht als Kommentar missverstanden werden. Nur eine
+# Gruppe und kein Lookahead: beides verdoppelt sonst die Laufzeit von split().
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (
+        '[^']*(?:''[^']*)*(?:'|\Z)                  # 'String' ('' = Escape)
+      | "[^"]*(?:""[^"]*)*(?:"|\Z)                  # "Quoted Identifier"
+      | --[^\n]*                                    # Zeilenkommentar
+      | /\*.*?(?:\*/|\Z)                            # Blockkommentar
+    )
+    """,
+    re.S | re.X,
+)
+
+
 class SQLCleaner:
     """
     Bereinigt SQL-Text, entfernt Kommentare und normalisiert Whitespaces.
+    Arbeitet in einem Durchlauf mit einem Ausgabepuffer; Literale und
+    Quoted Identifiers bleiben unverändert, Kommentare wirken als Trenner.
     """
     def clean(self, sql_text: str) -> str:
         if not sql_text:
             return ""
-        # Zeilenkommentare entfernen
-        sql_text = re.sub(r'--.*', '', sql_text)
-        # Blockkommentare entfernen
-        sql_text = re.sub(r'/\*.*?\*/', '', sql_text, flags=re.S)
-        # Mehrfache Whitespaces reduzieren
-        sql_text = re.sub(r'\s+', ' ', sql_text).strip()
-        return sql_text
+
+        # split() wechselt ab: [Code, Literal|Kommentar, Code, ...]
+        parts = _TOKEN_PATTERN.split(sql_text)
+        out = []
+        append = out.append
+        pending_space = False
+
+        for i, part in enumerate(parts):
+            if i % 2:
+                if part[0] not in "'\"":
+                    # Kommentar: wirkt wie ein Leerzeichen
+                    pending_space = True
+                    continue
+                if out and pending_space:
+                    append(" ")
+                append(part)
+                pending_space = False
+            elif part:
+                # Whitespace außerhalb von Literalen auf ein Leerzeichen reduzieren
+                words = part.split()
+                if words:
+                    if out and (pending_space or part[0].isspace()):
+                        append(" ")
+                    append(" ".join(words))
+                    pending_space = part[-1].isspace()
+                else:
+                    pending_space = True
+
+        return "".join(out)
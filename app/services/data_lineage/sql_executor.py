@@ -1,19 +1,163 @@
+import logging
+from typing import Iterable, Optional
+
 from app.data import test_data
 
+logger = logging.getLogger(__name__)
+
+
 class SQLExecutor:
     """
     Holt SQL-Text für ein Artefakt – entweder aus Mock-Daten oder einer echten DB.
+
+    Im Prefetch-Modus werden alle View- und Skripttexte der relevanten Schemas
+    einmalig per Bulk-Query geladen; der Crawl läuft danach aus dem Speicher.
     """
+    PREFETCH_QUERY = (
+        "SELECT VIEW_SCHEMA, VIEW_NAME, VIEW_TEXT FROM EXA_ALL_VIEWS{view_filter} "
+        "UNION ALL "
+        "SELECT SCRIPT_SCHEMA, SCRIPT_NAME, SCRIPT_TEXT FROM EXA_ALL_SCRIPTS{script_filter}"
+    )
+
     def __init__(self, config, connection=None):
         self.config = config
         self.connection = connection
 
+        self._prefetched = None            # name -> sql_text, None = kein Prefetch
+        self._prefetched_schemas = set()
+        self._prefetched_all = False
+        self._stale = set()                # seit dem Prefetch geänderte Objekte
+
+        # Statistik über Datenbank-Zugriffe
+        self.round_trips = 0
+        self.prefetch_round_trips = 0
+        self.served_from_prefetch = 0
+
+    @property
+    def round_trips_saved(self) -> int:
+        """Eingesparte Einzelabfragen abzüglich der Bulk-Abfragen."""
+        return self.served_from_prefetch - self.prefetch_round_trips
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "round_trips": self.round_trips,
+            "prefetch_round_trips": self.prefetch_round_trips,
+            "served_from_prefetch": self.served_from_prefetch,
+            "round_trips_saved": self.round_trips_saved,
+        }
+
+    def prefetch(self, schemas: Optional[Iterable[str]] = None) -> int:
+        """
+        Lädt alle View- und Skripttexte der angegebenen Schemas (None = alle)
+        in einem einzigen Query und streamt das Ergebnis per fetchmany.
+        Gibt die Anzahl geladener Objekte zurück.
+        """
+        if self.config.mock_mode or not self.connection:
+            return 0
+
+        schema_list = sorted({s.strip().upper() for s in schemas}) if schemas else None
+        if schema_list:
+            in_list = ", ".join(self._sql_literal(s) for s in schema_list)
+            view_filter = f" WHERE VIEW_SCHEMA IN ({in_list})"
+            script_filter = f" WHERE SCRIPT_SCHEMA IN ({in_list})"
+        else:
+            view_filter = script_filter = ""
+
+        cur = self.connection.cursor()
+        cur.execute(self.PREFETCH_QUERY.format(view_filter=view_filter, script_filter=script_filter))
+        self.round_trips += 1
+        self.prefetch_round_trips += 1
+
+        prefetched = self._prefetched if self._prefetched is not None else {}
+        while True:
+            rows = cur.fetchmany(self.config.fetch_batch_size)
+            if not rows:
+                break
+            for schema, name, sql_text in rows:
+                prefetched[f"{schema}.{name}".upper()] = sql_text or ""
+
+        self._prefetched = prefetched
+        if schema_list:
+            self._prefetched_schemas.update(schema_list)
+        else:
+            self._prefetched_all = True
+
+        logger.info(f"Prefetch: {len(prefetched)} SQL-Texte in einem Bulk-Query geladen.")
+        return len(prefetched)
+
+    def invalidate(self, artifact_names: Iterable[str]):
+        """Markiert Objekte als geändert; sie werden danach wieder einzeln geholt."""
+        if self._prefetched is None:
+            return
+        for name in artifact_names:
+            self._stale.add(name.upper())
+            self._prefetched.pop(name.upper(), None)
+
+    def is_prefetched(self, artifact_name: str) -> bool:
+        """True, wenn das Artefakt durch den Prefetch abgedeckt ist (auch ohne SQL-Text)."""
+        if self._prefetched is None or artifact_name.upper() in self._stale:
+            return False
+        if self._prefetched_all:
+            return True
+        schema, sep, _ = artifact_name.partition(".")
+        return bool(sep) and schema.upper() in self._prefetched_schemas
+
     def get_sql_for_artifact(self, artifact_name: str) -> str:
         if self.config.mock_mode:
             return test_data.sql_definitions.get(artifact_name, "")
+        if self.is_prefetched(artifact_name):
+            # Tabellen haben keinen SQL-Text und fehlen daher im Prefetch
+            self.served_from_prefetch += 1
+            return self._prefetched.get(artifact_name.upper(), "")
         if not self.connection:
             return ""
         cur = self.connection.cursor()
         cur.execute(f"SELECT sql_text FROM metadata WHERE name='{artifact_name}'")
+        self.round_trips += 1
         row = cur.fetchone()
         return row[0] if row else ""
+
+    def get_sql_for_artifacts(self, artifact_names: Iterable[str], chunk_size: int = 500) -> dict:
+        """
+        Holt die SQL-Texte mehrerer Artefakte mit einem IN-Query pro Chunk.
+        Gibt ein Dict name -> sql_text zurück (fehlende Namen sind nicht enthalten).
+        Schlüssel sind die angefragten Namen, auch wenn der Katalog sie anders schreibt.
+        """
+        names = list(dict.fromkeys(artifact_names))
+        if self.config.mock_mode:
+            return {n: test_data.sql_definitions[n] for n in names if n in test_data.sql_definitions}
+
+        result = {}
+        missing = []
+        for name in names:
+            if self.is_prefetched(name):
+                self.served_from_prefetch += 1
+                sql_text = self._prefetched.get(name.upper())
+                if sql_text:
+                    result[name] = sql_text
+            else:
+                missing.append(name)
+
+        if not missing or not self.connection:
+            return result
+
+        cur = self.connection.cursor()
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start:start + chunk_size]
+            # Quoted/Mixed-Case-Namen: Zeilen über den großgeschriebenen Namen zuordnen
+            requested = {n.upper(): n for n in chunk}
+            in_list = ", ".join(self._sql_literal(n) for n in chunk)
+            cur.execute(f"SELECT name, sql_text FROM metadata WHERE name IN ({in_list})")
+            self.round_trips += 1
+            while True:
+                rows = cur.fetchmany(self.config.fetch_batch_size)
+                if not rows:
+                    break
+                for name, sql_text in rows:
+                    result[requested.get(name.upper(), name)] = sql_text or ""
+        return result
+
+    @staticmethod
+    def _sql_literal(value: str) -> str:
+        return "'" + str(value).replace("'", "''") + "'"
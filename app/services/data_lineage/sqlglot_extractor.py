@@ -0,0 +1,115 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import List, Optional
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+from .dependency_extractor import References
+
+logger = logging.getLogger(__name__)
+
+# Schreibende Statements: deren Zielobjekt ist keine Quelle
+_WRITE_STATEMENTS = (exp.Insert, exp.Merge, exp.Update, exp.Delete)
+
+
+class SqlglotParser:
+    """
+    Parst SQL mit sqlglot im Exasol-Dialekt. Die ASTs werden in einem
+    begrenzten LRU (Schlüssel: Hash des SQL-Textes) gehalten, damit spätere
+    Analysen (z.B. Spalten-Lineage) nicht erneut parsen müssen.
+    Die zurückgegebenen ASTs sind geteilt und dürfen nicht verändert werden.
+    """
+    def __init__(self, dialect: str = "exasol", max_cached: int = 512):
+        self.dialect = dialect
+        self.max_cached = max_cached
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(sql_text: str) -> str:
+        return hashlib.sha256(sql_text.encode("utf-8")).hexdigest()
+
+    def parse(self, sql_text: str) -> List[exp.Expression]:
+        """Parst alle Statements eines Textes; wirft SqlglotError (ParseError, TokenError) bei ungültigem SQL."""
+        key = self.key(sql_text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        statements = [s for s in sqlglot.parse(sql_text, read=self.dialect) if s is not None]
+        self._cache[key] = statements
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return statements
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class SqlglotDependencyExtractor:
+    """
+    Extrahiert Quellen und Ziele aller Statements eines SQL-Textes aus dem
+    sqlglot-AST. CTE-Referenzen werden nur innerhalb des WITH-Blocks, der sie
+    definiert, als solche erkannt; INSERT/MERGE/UPDATE/DELETE-Ziele landen in
+    `targets`, das von CREATE definierte Objekt selbst wird ignoriert.
+    """
+    def __init__(self, parser: Optional[SqlglotParser] = None):
+        self.parser = parser or SqlglotParser()
+        self.errors = 0
+
+    def extract(self, sql_text: str) -> Optional[list]:
+        references = self.extract_references(sql_text)
+        return references.sources if references is not None else None
+
+    def extract_references(self, sql_text: str) -> Optional[References]:
+        try:
+            statements = self.parser.parse(sql_text)
+        except SqlglotError as e:
+            self.errors += 1
+            logger.debug(f"sqlglot konnte SQL nicht parsen: {e}")
+            return None
+        if not statements:
+            return None
+
+        sources, targets = {}, {}
+        for statement in statements:
+            skip = set()
+            for node in statement.find_all(*_WRITE_STATEMENTS, exp.Create):
+                table = node.this.this if isinstance(node.this, exp.Schema) else node.this
+                if not isinstance(table, exp.Table):
+                    continue
+                skip.add(id(table))
+                if not isinstance(node, exp.Create):
+                    targets[self._table_name(table)] = None
+
+            for table in statement.find_all(exp.Table):
+                if id(table) in skip or not table.name:
+                    continue
+                if not table.db and table.name.upper() in self._visible_ctes(table):
+                    continue
+                sources[self._table_name(table)] = None
+
+        return References(list(sources), list(targets))
+
+    @staticmethod
+    def _visible_ctes(table: exp.Table) -> set:
+        """Namen aller CTEs, die an dieser Stelle im AST sichtbar sind."""
+        names = set()
+        node = table.parent
+        while node is not None:
+            with_clause = node.args.get("with_") or node.args.get("with")
+            if isinstance(with_clause, exp.With):
+                names.update(cte.alias_or_name.upper() for cte in with_clause.expressions)
+            node = node.parent
+        return names
+
+    @staticmethod
+    def _table_name(table: exp.Table) -> str:
+        return ".".join(part for part in (table.catalog, table.db, table.name) if part)
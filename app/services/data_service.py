@@ -1,15 +1,27 @@
+import logging
+import os
+from collections import OrderedDict
 import networkx as nx
-from typing import List
+from typing import List, Optional
 
 from app.models.node import Node
 from app.data.mock_database import MockDatabase
 from .mock_graph_builder import MockGraphBuilder  # Importieren
+from .cte_contraction import cte_view
 
 from app.services.data_lineage import (
     DataLineageService,
     DataLineageConfig,
+    LineageSnapshot,
+    default_snapshot_path,
 )
 
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAX_AGE = 24 * 3600   # Sekunden; ältere Snapshots werden ignoriert
+SNAPSHOT_SLICE_CACHE_SIZE = 32  # zwischengespeicherte Ausschnitte (LRU)
+LINEAGE_SERVICE_CACHE_SIZE = 4  # Services für inkrementelle Aktualisierung (LRU, je mit Graph und SQL-Texten)
+
 
 class DataService:
     """
@@ -17,7 +29,7 @@ class DataService:
     Dient als Fassade, die Anfragen an die zuständigen Builder weiterleitet.
     """
 
-    def __init__(self, mock_mode: bool = True, connection=None):
+    def __init__(self, mock_mode: bool = True, connection=None, snapshot_path: Optional[str] = None):
         self.mock_mode = mock_mode
         self.connection = connection
         self.db = MockDatabase() if mock_mode else None
@@ -25,6 +37,13 @@ class DataService:
         # Den richtigen Builder instanziieren
         self.mock_builder = MockGraphBuilder() if mock_mode else None
 
+        # Lineage-Services je Root-Artefakt für inkrementelle Aktualisierungen
+        self._lineage_services = OrderedDict()
+
+        # Vorberechnete Gesamt-Lineage (siehe precompute_lineage.py)
+        self.snapshot = LineageSnapshot.load(snapshot_path) if snapshot_path else None
+        self._snapshot_graphs = OrderedDict()
+
     def get_available_data_sources(self) -> List[str]:
         # Diese Methoden bleiben gleich
         if self.mock_mode:
@@ -46,13 +65,15 @@ class DataService:
 
     def get_graph_for_artifact(self, selections: dict) -> nx.DiGraph:
         """
-        Delegiert die Graphenerstellung an den zuständigen Builder.
+        Delegiert die Graphenerstellung an den zuständigen Builder. Ohne
+        "include_ctes" wird die CTE-freie Sicht des Rohgraphen geliefert.
         """
         if self.mock_mode:
-            return self.mock_builder.build_graph(selections)
+            graph = self.mock_builder.build_graph(selections)
         else:
             # Der Real-Mode wird jetzt auch sauberer delegiert
-            return self._build_real_graph(selections)
+            graph = self._build_real_graph(selections)
+        return cte_view(graph, bool(selections.get("include_ctes", False)))
 
     def _build_real_graph(self, selections: dict) -> nx.DiGraph:
         """
@@ -62,22 +83,103 @@ class DataService:
         if not artifact:
             return nx.DiGraph()
 
+        graph = self._snapshot_graph(artifact, selections)
+        if graph is not None:
+            return graph
+
         config = DataLineageConfig(
             mock_mode=False,
             include_ctes=bool(selections.get("include_ctes", False)),
             max_depth=int(selections.get("max_depth", 5)),
+            crawl_mode=selections.get("crawl_mode", "stack"),
+            extractor=selections.get("extractor", "fast"),
+            prefetch_catalog=bool(selections.get("prefetch_catalog", False)),
+            prefetch_schemas=selections.get("prefetch_schemas"),
+            use_catalog_dependencies=bool(selections.get("use_catalog_dependencies", False)),
+            dependency_cache_enabled=bool(selections.get("dependency_cache_enabled", False)),
+            parse_workers=int(selections.get("parse_workers", 0)),
+            resolve_objects=bool(selections.get("resolve_objects", False)),
+            schema_search_path=list(selections.get("schema_search_path", [])),
+            incremental=bool(selections.get("incremental", False)),
+            index_sql_texts=bool(selections.get("index_sql_texts", False)),
         )
-        service = DataLineageService(config=config, connection=self.connection)
-        graph = service.build_graph(root_artifact=artifact)
+        service = self._lineage_services.get(artifact)
+        if config.incremental and service is not None and service.config == config:
+            self._lineage_services.move_to_end(artifact)
+            service.set_connection(self.connection)
+            graph = service.refresh(root_artifact=artifact)
+        else:
+            service = DataLineageService(config=config, connection=self.connection)
+            graph = service.build_graph(root_artifact=artifact)
+            if config.incremental:
+                self._lineage_services[artifact] = service
+                self._lineage_services.move_to_end(artifact)
+                if len(self._lineage_services) > LINEAGE_SERVICE_CACHE_SIZE:
+                    self._lineage_services.popitem(last=False)
 
-        # Falls deine UI erwartet, dass predecessors/successors in Node.data befüllt sind:
+        # Vorgänger/Nachfolger der Node-Objekte kommen aus der Adjazenz dieses Graphen
         self._populate_node_relations(graph)
         return graph
 
+    def load_snapshot(self, path: str) -> LineageSnapshot:
+        """Lädt einen vorberechneten Lineage-Snapshot und verwirft alte Ausschnitte."""
+        self.snapshot = LineageSnapshot.load(path)
+        self._snapshot_graphs.clear()
+        return self.snapshot
+
+    def _snapshot_graph(self, artifact: str, selections: dict) -> Optional[nx.DiGraph]:
+        """
+        Ausschnitt des Artefakts aus dem Snapshot oder None für einen Live-Crawl.
+        Der Snapshot wird nur auf Wunsch ("use_snapshot") genutzt und nicht, wenn
+        er älter als "snapshot_max_age" Sekunden ist. Inkrementelle Crawls und
+        gesammelte SQL-Texte gibt es nur live. max_depth wirkt wie im
+        Ebenen-Crawl; Extraktor- und Prefetch-Optionen betreffen nur den
+        Live-Crawl, der Snapshot wurde mit denen von precompute_lineage.py erstellt.
+        """
+        if selections.get("incremental") or selections.get("index_sql_texts"):
+            return None
+        snapshot = self._get_snapshot(selections)
+        if snapshot is None or artifact not in snapshot:
+            return None
+        max_age = selections.get("snapshot_max_age", SNAPSHOT_MAX_AGE)
+        if max_age is not None and snapshot.age > max_age:
+            logger.info(f"Lineage-Snapshot ist {snapshot.age / 3600:.1f} h alt; Live-Crawl für {artifact}.")
+            return None
+
+        # Wie process_levels: Abhängigkeiten der letzten Ebene werden noch verlinkt
+        depth = None
+        if selections.get("crawl_mode", "stack") == "level":
+            depth = int(selections.get("max_depth", 5)) + 1
+        key = (artifact, depth)
+        graph = self._snapshot_graphs.get(key)
+        if graph is None:
+            graph = snapshot.slice(artifact, depth)
+            self._snapshot_graphs[key] = graph
+            if len(self._snapshot_graphs) > SNAPSHOT_SLICE_CACHE_SIZE:
+                self._snapshot_graphs.popitem(last=False)
+        else:
+            self._snapshot_graphs.move_to_end(key)
+        # Wie der MockGraphBuilder: jeder Tab erhält eine eigene, schreibgeschützte Sicht
+        return graph.copy(as_view=True)
+
+    def _get_snapshot(self, selections: dict) -> Optional[LineageSnapshot]:
+        """Explizit geladener Snapshot oder der Standard-Snapshot der Datenquelle."""
+        if not selections.get("use_snapshot", False):
+            return None
+        data_source = selections.get("data_source")
+        if data_source and (self.snapshot is None or self.snapshot.data_source not in ("", data_source)):
+            self.snapshot = None
+            path = default_snapshot_path(data_source)
+            if os.path.exists(path):
+                try:
+                    self.load_snapshot(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Lineage-Snapshot {path} nicht lesbar: {e}")
+        return self.snapshot
+
     def _populate_node_relations(self, graph: nx.DiGraph) -> None:
-        """Füllt die Vorgänger/Nachfolger-Listen in den Node-Objekten."""
+        """Bindet die Node-Objekte an den Graphen (Vorgänger/Nachfolger als Sicht)."""
         for node_id, attrs in graph.nodes(data=True):
             node_obj: Node = attrs.get('data')
             if node_obj:
-                node_obj.predecessors = list(graph.predecessors(node_id))
-                node_obj.successors = list(graph.successors(node_id))
\ No newline at end of file
+                node_obj.bind(graph)
\ No newline at end of file
@@ -1,5 +1,15 @@
+import time
+from collections import deque
+
 import networkx as nx
-from typing import Optional
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from app.services.impact_analysis import multi_source_impact
+from app.services.reachability_index import ReachabilityIndex
+from app.services.search_index import SearchIndex, scan_names
+from app.services.sparse_adjacency import sparse_adjacency
 
 
 class GraphAnalysisService:
@@ -8,48 +18,179 @@ class GraphAnalysisService:
     nach Vorgängern oder Nachfolgern.
     """
 
-    def __init__(self, graph: nx.DiGraph):
+    def __init__(self, graph: nx.DiGraph, build_indexes: bool = True):
         """
-        Initialisiert den Service mit einem Graphen.
+        Initialisiert den Service mit einem Graphen. Mit build_indexes=False
+        (GUI-Thread) werden fehlende Indizes nicht aufgebaut, sondern die
+        Anfragen direkt auf dem Graphen beantwortet; siehe prepare_indexes().
         """
         if not isinstance(graph, nx.DiGraph):
             raise TypeError("nx.DiGraph erwartet.")
         self.graph = graph
+        self.build_indexes = build_indexes
+
+    def prepare_indexes(self):
+        """Baut die Indizes des Graphen vorab auf, z.B. in einem Hintergrund-Thread."""
+        ReachabilityIndex.for_graph(self.graph)
+        SearchIndex.for_graph(self.graph)
+
+    def find_node_by_name(self, query: str) -> Optional[Hashable]:
+        """
+        Findet den am besten passenden Knoten, dessen Name die Suchanfrage
+        enthält (case-insensitive), siehe search_nodes().
+        """
+        matches = self.search_nodes(query, limit=1)
+        return matches[0] if matches else None
+
+    @property
+    def search_index(self) -> Optional[SearchIndex]:
+        """
+        Am Graphen zwischengespeicherter Suchindex (einmal je Graph aufgebaut);
+        None, solange er fehlt und nicht gebaut werden soll.
+        """
+        if self.build_indexes:
+            return SearchIndex.for_graph(self.graph)
+        return SearchIndex.cached(self.graph)
 
-    def find_node_by_name(self, query: str) -> Optional[str]:
+    def search_nodes(self, query: str, limit: int = 50) -> List[Hashable]:
         """
-        Findet den ersten Knoten, dessen Name die Suchanfrage enthält (case-insensitive).
+        Knoten, deren Name die Suchanfrage enthält, nach Relevanz: exakter
+        Treffer, Präfix, Wortanfang, sonstiger Teilstring; kürzere Namen zuerst.
+        Ohne fertigen Index in Graph-Reihenfolge (linearer Durchlauf).
         """
-        if not query:
-            return None
+        index = self.search_index
+        return index.search(query, limit) if index is not None else scan_names(self.graph, query, limit)
 
-        for node_id, node_data in self.graph.nodes(data=True):
-            node_obj = node_data.get('data')
-            if node_obj and query.lower() in getattr(node_obj, 'name', '').lower():
-                return node_id
-        return None
+    def find_references(self, identifier: str) -> List[Hashable]:
+        """
+        Knoten, deren SQL-Text den Bezeichner (z.B. eine Spalte) verwendet.
+        Leer, wenn beim Crawl keine SQL-Texte gesammelt wurden (index_sql_texts).
+        Baut den Index bei Bedarf immer auf (nicht für den GUI-Thread gedacht).
+        """
+        return SearchIndex.for_graph(self.graph).references(identifier)
+
+    @property
+    def reachability(self) -> Optional[ReachabilityIndex]:
+        """
+        Am Graphen zwischengespeicherter Reichbarkeitsindex (einmal je Graph
+        aufgebaut); None, solange er fehlt und nicht gebaut werden soll.
+        """
+        if self.build_indexes:
+            return ReachabilityIndex.for_graph(self.graph)
+        return ReachabilityIndex.cached(self.graph)
 
     def get_all_predecessors(self, start_node: str) -> set:
-        return {start_node, *nx.ancestors(self.graph, start_node)} if start_node in self.graph else set()
+        if start_node not in self.graph:
+            return set()
+        index = self.reachability
+        return {start_node, *(index.ancestors(start_node) if index else nx.ancestors(self.graph, start_node))}
 
     def get_all_successors(self, start_node: str) -> set:
-        return {start_node, *nx.descendants(self.graph, start_node)} if start_node in self.graph else set()
+        if start_node not in self.graph:
+            return set()
+        index = self.reachability
+        return {start_node, *(index.descendants(start_node) if index else nx.descendants(self.graph, start_node))}
 
-    def summarize_graph(self):
+    def is_upstream(self, upstream: str, downstream: str) -> bool:
+        """True, wenn `upstream` (transitiv) in `downstream` einfließt."""
+        index = self.reachability
+        if index is not None:
+            return index.is_upstream(upstream, downstream)
+        return (upstream != downstream and upstream in self.graph and downstream in self.graph
+                and nx.has_path(self.graph, upstream, downstream))
+
+    def batch_impact(self, sources: Iterable[str], targets: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Auswirkungsanalyse für viele geänderte Objekte in einem Durchlauf.
+        Liefert je Quelle die betroffenen Ziele (Standard: Endpunkte ohne
+        Nachfolger) mit minimaler Hop-Distanz. Unbekannte Quellen fehlen im Ergebnis.
+        """
+        nodes, index, adjacency, _ = sparse_adjacency(self.graph)
+
+        target_mask = np.zeros(len(nodes), dtype=bool)
+        if targets is None:
+            target_mask[np.flatnonzero(np.diff(adjacency.indptr) == 0)] = True
+        else:
+            target_mask[[index[t] for t in targets if t in index]] = True
+
+        known = [s for s in dict.fromkeys(sources) if s in index]
+        impacts = multi_source_impact(adjacency, np.array([index[s] for s in known], dtype=np.int64), target_mask)
         return {
-            "nodes": self.graph.number_of_nodes(),
-            "edges": self.graph.number_of_edges(),
-            "cycles": list(nx.simple_cycles(self.graph)),
-            "endpoints": [n for n in self.graph.nodes if self.graph.out_degree(n) == 0]
+            source: {nodes[target]: hops for target, hops in sorted(impact.items(), key=lambda item: item[1])}
+            for source, impact in zip(known, impacts)
         }
 
-    def prune_cte_nodes(self):
-        cte_nodes = [n for n, d in self.graph.nodes(data=True) if d.get("SQL_Befehl") == "CTE"]
-        for cte in cte_nodes:
-            preds = list(self.graph.predecessors(cte))
-            succs = list(self.graph.successors(cte))
-            for p in preds:
-                for s in succs:
-                    if p != s and not self.graph.has_edge(p, s):
-                        self.graph.add_edge(p, s)
-            self.graph.remove_node(cte)
+    def summarize_graph(self, enumerate_cycles: bool = False, max_cycles: int = 100,
+                        time_budget: float = 1.0, largest: int = 5):
+        """
+        Zusammenfassung auf Basis starker Zusammenhangskomponenten (SCC):
+        Anzahl der Komponenten, die größten zyklischen Komponenten und je
+        zyklischer Komponente ein Beispielzyklus ("cycles"). Die vollständige
+        Aufzählung aller Zyklen ist exponentiell und daher nur optional und
+        durch Anzahl und Zeitbudget (Sekunden) begrenzt.
+        """
+        nodes, _, adjacency, _ = sparse_adjacency(self.graph)
+        component_count, labels = connected_components(adjacency, directed=True, connection="strong")
+
+        sizes = np.bincount(labels, minlength=component_count)
+        self_loops = np.zeros(component_count, dtype=bool)
+        coo = adjacency.tocoo()
+        self_loops[labels[coo.row[coo.row == coo.col]]] = True
+        cyclic = np.flatnonzero((sizes > 1) | self_loops)
+        cyclic = cyclic[np.argsort(-sizes[cyclic], kind="stable")]
+
+        members = {int(c): [] for c in cyclic}
+        for i in np.flatnonzero(np.isin(labels, cyclic)):
+            members[int(labels[i])].append(i)
+
+        summary = {
+            "nodes": len(nodes),
+            "edges": int(adjacency.nnz),
+            "components": int(component_count),
+            "cyclic_components": len(cyclic),
+            "largest_components": [[nodes[i] for i in members[int(c)]] for c in cyclic[:largest]],
+            "cycles": [
+                [nodes[i] for i in self._witness_cycle(adjacency, labels, members[int(c)][0])] for c in cyclic
+            ],
+            # Ein Durchlauf über die Ausgangsgrade (CSR-Zeilenlängen)
+            "endpoints": [nodes[i] for i in np.flatnonzero(np.diff(adjacency.indptr) == 0)],
+        }
+        if enumerate_cycles:
+            summary["all_cycles"], summary["cycles_truncated"] = self._enumerate_cycles(max_cycles, time_budget)
+        return summary
+
+    @staticmethod
+    def _witness_cycle(adjacency, labels: np.ndarray, start: int) -> List[int]:
+        """Kürzester Zyklus durch `start` per BFS innerhalb seiner Komponente."""
+        indptr, indices = adjacency.indptr, adjacency.indices
+        component = labels[start]
+        parents = {}
+        queue = deque()
+        for child in indices[indptr[start]:indptr[start + 1]]:
+            if child == start:
+                return [start]
+            if labels[child] == component and child not in parents:
+                parents[child] = start
+                queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for child in indices[indptr[node]:indptr[node + 1]]:
+                if child == start:
+                    path = [node]
+                    while path[-1] != start:
+                        path.append(parents[path[-1]])
+                    return [int(n) for n in reversed(path)]
+                if labels[child] == component and child not in parents:
+                    parents[child] = node
+                    queue.append(child)
+        return [start]
+
+    def _enumerate_cycles(self, max_cycles: int, time_budget: float):
+        """Einfache Zyklen bis max_cycles bzw. bis das Zeitbudget erschöpft ist."""
+        deadline = time.monotonic() + time_budget
+        cycles = []
+        for cycle in nx.simple_cycles(self.graph):
+            if len(cycles) >= max_cycles or time.monotonic() > deadline:
+                return cycles, True
+            cycles.append(cycle)
+        return cycles, False
@@ -0,0 +1,20 @@
+import networkx as nx
+
+# Änderungszähler in graph.graph; wird bei Änderungen an Ort und Stelle erhöht
+GRAPH_VERSION_ATTR = "version"
+
+
+def graph_signature(graph: nx.DiGraph) -> tuple:
+    """
+    Kennung des aktuellen Graph-Stands für die in graph.graph abgelegten
+    Ableitungen (Adjazenz, Indizes, CTE-freie Sicht). Knoten- und Kantenzahl
+    fangen einfache Änderungen ab; Umbauten mit gleicher Größe (z.B. eine
+    inkrementelle Aktualisierung) müssen mark_changed aufrufen.
+    """
+    # graph.graph wird von Sichten (copy(as_view=True)) geteilt, von Kopien nicht
+    return id(graph.graph), graph.graph.get(GRAPH_VERSION_ATTR, 0), graph.number_of_nodes(), graph.number_of_edges()
+
+
+def mark_changed(graph: nx.DiGraph):
+    """Erklärt alle in graph.graph abgelegten Ableitungen für veraltet."""
+    graph.graph[GRAPH_VERSION_ATTR] = graph.graph.get(GRAPH_VERSION_ATTR, 0) + 1
@@ -0,0 +1,103 @@
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 300.0   # Sekunden, bis ein dot-Lauf abgebrochen wird
+_POLL_INTERVAL = 0.2      # Sekunden zwischen zwei Abfragen von `cancelled`
+_POINTS_PER_INCH = 72     # -Tplain liefert Zoll, graphviz_layout lieferte Punkte
+
+
+class GraphvizError(RuntimeError):
+    """dot ist nicht auffindbar, lief zu lange, wurde abgebrochen oder lieferte keine Ausgabe."""
+
+
+def find_dot(bin_path: Optional[str] = None) -> Optional[str]:
+    """
+    Absoluter Pfad zur dot-Executable: aus dem angegebenen 'bin'-Verzeichnis
+    (z.B. der gebündelten Graphviz-Version), sonst aus dem PATH des Systems.
+    """
+    executable = "dot.exe" if platform.system().lower() == "windows" else "dot"
+    if bin_path:
+        candidate = os.path.join(bin_path, executable)
+        if os.path.isfile(candidate):
+            return candidate
+        logger.warning(f"Keine dot-Executable in {bin_path}.")
+    return shutil.which(executable)
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+def to_dot(graph: nx.DiGraph, rankdir: str = "LR") -> Tuple[str, list]:
+    """
+    Minimales DOT des Graphen: Knoten heißen n0, n1, ... und tragen nur ihren
+    Namen als Beschriftung (bestimmt die Knotenbreite), Kanten ohne Attribute.
+    Liefert den DOT-Text und die Knoten-IDs in Nummernreihenfolge.
+    """
+    nodes = list(graph.nodes)
+    index = {node_id: i for i, node_id in enumerate(nodes)}
+    lines = [f"digraph{{graph[rankdir={rankdir}];"]
+    for i, (node_id, attrs) in enumerate(graph.nodes(data=True)):
+        name = getattr(attrs.get("data"), "name", None) or str(node_id)
+        lines.append(f"n{i}[label={_quote(name)}];")
+    lines.extend(f"n{index[u]}->n{index[v]};" for u, v in graph.edges())
+    lines.append("}")
+    return "\n".join(lines), nodes
+
+
+def parse_plain(output: str, nodes: list) -> Dict[Hashable, Tuple[float, float]]:
+    """Knotenpositionen (in Punkten) aus der Ausgabe von `dot -Tplain`."""
+    pos = {}
+    for line in output.splitlines():
+        if line.startswith("node "):
+            _, name, x, y, _ = line.split(" ", 4)
+            pos[nodes[int(name[1:])]] = (float(x) * _POINTS_PER_INCH, float(y) * _POINTS_PER_INCH)
+    return pos
+
+
+def graphviz_layout(graph: nx.DiGraph, dot_path: str, rankdir: str = "LR", timeout: float = DEFAULT_TIMEOUT,
+                    cancelled: Optional[Callable[[], bool]] = None) -> Dict[Hashable, Tuple[float, float]]:
+    """
+    Layout über einen direkten dot-Aufruf: minimales DOT per stdin an
+    `dot -Tplain`, Koordinaten direkt aus stdout. Ersetzt den Umweg über
+    pydot (Objektgraph, Datei, Python-Parser) und verändert keine
+    Umgebungsvariablen. Bei Zeitüberschreitung oder `cancelled()` wird dot beendet.
+    """
+    dot_text, nodes = to_dot(graph, rankdir)
+    process = subprocess.Popen(
+        [dot_path, "-Tplain"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),  # Kein Konsolenfenster unter Windows
+    )
+    deadline = time.monotonic() + timeout
+    payload = dot_text.encode("utf-8")
+    while True:
+        try:
+            # Erneute Aufrufe nach TimeoutExpired setzen die Kommunikation fort
+            stdout, stderr = process.communicate(payload, timeout=_POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            payload = None  # Die Eingabe wird nur beim ersten Aufruf übergeben
+            if cancelled is not None and cancelled():
+                process.kill()
+                process.communicate()
+                raise GraphvizError("dot-Lauf abgebrochen.")
+            if time.monotonic() > deadline:
+                process.kill()
+                process.communicate()
+                raise GraphvizError(f"dot lief länger als {timeout:.0f}s.")
+
+    if process.returncode != 0:
+        raise GraphvizError(f"dot beendet mit Code {process.returncode}: {stderr.decode('utf-8', 'replace').strip()}")
+    pos = parse_plain(stdout.decode("utf-8", "replace"), nodes)
+    if len(pos) != len(nodes):
+        raise GraphvizError(f"dot lieferte {len(pos)} von {len(nodes)} Knotenpositionen.")
+    return pos
@@ -0,0 +1,56 @@
+from typing import Dict, List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Quellen pro Durchlauf; begrenzt die Besucht-Matrix auf batch_size x Knoten
+DEFAULT_BATCH_SIZE = 256
+
+
+def multi_source_impact(
+    adjacency: csr_matrix,
+    sources: np.ndarray,
+    target_mask: np.ndarray,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[Dict[int, int]]:
+    """
+    Breitensuche von vielen Quellen gleichzeitig über einer dünnbesetzten
+    Adjazenzmatrix (Zeile = Quelle einer Kante). Die Front aller Quellen ist
+    eine Sparse-Matrix; ein Schritt ist ein Matrixprodukt mit der Adjazenz.
+
+    Liefert je Quelle {Zielindex: minimale Hop-Distanz} für alle erreichten
+    Knoten mit target_mask=True. Die Quelle selbst zählt nicht als betroffen.
+    """
+    node_count = adjacency.shape[0]
+    adjacency = adjacency.astype(np.int32)
+    results = []
+
+    for offset in range(0, len(sources), batch_size):
+        batch = np.asarray(sources[offset:offset + batch_size], dtype=np.int64)
+        rows = np.arange(len(batch))
+        batch_results = [{} for _ in batch]
+
+        visited = np.zeros((len(batch), node_count), dtype=bool)
+        visited[rows, batch] = True
+        frontier = csr_matrix(
+            (np.ones(len(batch), dtype=np.int32), (rows, batch)), shape=(len(batch), node_count)
+        )
+
+        hops = 0
+        while frontier.nnz:
+            hops += 1
+            reached = (frontier @ adjacency).tocoo()
+            fresh = ~visited[reached.row, reached.col]
+            new_rows, new_cols = reached.row[fresh], reached.col[fresh]
+            visited[new_rows, new_cols] = True
+
+            hit = target_mask[new_cols]
+            for row, col in zip(new_rows[hit].tolist(), new_cols[hit].tolist()):
+                batch_results[row][col] = hops
+
+            frontier = csr_matrix(
+                (np.ones(len(new_rows), dtype=np.int32), (new_rows, new_cols)), shape=(len(batch), node_count)
+            )
+        results.extend(batch_results)
+    return results
+
@@ -0,0 +1,210 @@
+from typing import Dict, Hashable, Tuple
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from app.services.sparse_adjacency import sparse_adjacency
+
+# Abmessungen in Punkten, passend zur Größenordnung der dot-Ausgabe
+CHAR_WIDTH = 7.0        # geschätzte Breite eines Zeichens der Beschriftung
+NODE_PADDING = 24.0     # Zusatzbreite eines Knotens
+NODE_SEPARATION = 54.0  # Abstand zweier Knoten innerhalb einer Ebene
+RANK_SEPARATION = 72.0  # Abstand zwischen den breitesten Knoten benachbarter Ebenen
+
+ORDERING_SWEEPS = 4     # Abwärts-/Aufwärts-Durchläufe der Kreuzungsminimierung
+PLACEMENT_ROUNDS = 8    # Runden der Koordinatenzuweisung
+
+
+def layered_layout(graph: nx.DiGraph) -> Dict[Hashable, Tuple[float, float]]:
+    """
+    Hierarchisches Layout von links nach rechts ohne externes Programm
+    (Sugiyama-Verfahren, mit NumPy vektorisiert):
+
+    1. Ebenen: längster Pfad von den Quellen im kondensierten DAG; Knoten
+       einer starken Zusammenhangskomponente teilen sich eine Ebene.
+    2. Kanten über mehrere Ebenen erhalten Hilfsknoten je übersprungener Ebene.
+    3. Reihenfolge innerhalb der Ebenen: Baryzentren der Nachbarn in der
+       vorigen bzw. nächsten Ebene, abwechselnd abwärts und aufwärts.
+    4. Koordinaten: jeder Knoten strebt zum Mittel seiner Nachbarn; Reihenfolge
+       und Mindestabstand der Ebene werden danach wiederhergestellt.
+
+    Liefert Positionen in Punkten mit y nach oben, wie graphviz_layout.
+    """
+    adjacency = sparse_adjacency(graph)
+    nodes = adjacency.nodes
+    count = len(nodes)
+    if not count:
+        return {}
+
+    coo = adjacency.matrix.tocoo()
+    src, dst = coo.row.astype(np.int64), coo.col.astype(np.int64)
+    rank = _longest_path_ranks(adjacency.matrix, src, dst)
+
+    widths = np.zeros(count)
+    for i, (node_id, attrs) in enumerate(graph.nodes(data=True)):
+        name = getattr(attrs.get("data"), "name", None) or str(node_id)
+        widths[i] = len(name) * CHAR_WIDTH + NODE_PADDING
+
+    forward = rank[dst] > rank[src]
+    rank, src, dst = _insert_dummies(rank, src[forward], dst[forward])
+    widths = np.concatenate((widths, np.zeros(len(rank) - count)))
+
+    layers = _Layers(rank)
+    position = _order_layers(layers, src, dst)
+    y = _assign_y(layers, position, src, dst)
+
+    # Ebenen nebeneinander, jeweils so breit wie ihr breitester Knoten
+    layer_width = np.zeros(layers.count)
+    np.maximum.at(layer_width, rank, widths)
+    layer_x = np.concatenate(([0.0], np.cumsum(layer_width[:-1] + RANK_SEPARATION))) + layer_width / 2
+    x = layer_x[rank[:count]]
+    y = y[:count].max() - y[:count]  # Erster Knoten einer Ebene oben
+    return dict(zip(nodes, zip(x.tolist(), y.tolist())))
+
+
+def _longest_path_ranks(matrix: csr_matrix, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Ebene je Knoten: Länge des längsten Pfads von einer Quelle im kondensierten DAG."""
+    component_count, component = connected_components(matrix, directed=True, connection="strong")
+    component = component.astype(np.int64)  # Paarschlüssel unten sprengen sonst int32
+    keep = component[src] != component[dst]
+    pairs = np.unique(component[src[keep]] * component_count + component[dst[keep]])
+    cond_src, cond_dst = pairs // component_count, pairs % component_count
+    order = np.argsort(cond_src, kind="stable")
+    cond_src, cond_dst = cond_src[order], cond_dst[order]
+    succ_ptr = np.zeros(component_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cond_src, minlength=component_count), out=succ_ptr[1:])
+
+    # Kahn in Wellen: alle Komponenten ohne offene Vorgänger zugleich
+    indegree = np.bincount(cond_dst, minlength=component_count)
+    component_rank = np.zeros(component_count, dtype=np.int64)
+    frontier = np.flatnonzero(indegree == 0)
+    while frontier.size:
+        starts, ends = succ_ptr[frontier], succ_ptr[frontier + 1]
+        lengths = ends - starts
+        edges = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(int(lengths.sum()))
+        sources, targets = cond_src[edges], cond_dst[edges]
+        np.maximum.at(component_rank, targets, component_rank[sources] + 1)
+        np.subtract.at(indegree, targets, 1)
+        targets = np.unique(targets)
+        frontier = targets[indegree[targets] == 0]
+    return component_rank[component]
+
+
+def _insert_dummies(rank: np.ndarray, src: np.ndarray, dst: np.ndarray):
+    """Ersetzt Kanten über k > 1 Ebenen durch Ketten mit k - 1 Hilfsknoten."""
+    span = rank[dst] - rank[src]
+    long = span > 1
+    if not long.any():
+        return rank, src, dst
+    long_src, long_dst, long_span = src[long], dst[long], span[long]
+    dummies_per_edge = long_span - 1
+    dummy_count = int(dummies_per_edge.sum())
+    first_dummy = len(rank) + np.cumsum(dummies_per_edge) - dummies_per_edge
+    step = np.arange(dummy_count) - np.repeat(first_dummy - len(rank), dummies_per_edge) + 1
+    dummy_rank = np.repeat(rank[long_src], dummies_per_edge) + step
+
+    # Je Kette: Quelle, Hilfsknoten, Ziel hintereinander; Kanten zwischen Nachbarn
+    chain_length = long_span + 1
+    chain_start = np.cumsum(chain_length) - chain_length
+    chains = np.empty(int(chain_length.sum()), dtype=np.int64)
+    chains[chain_start] = long_src
+    chains[chain_start + chain_length - 1] = long_dst
+    inner = np.ones(len(chains), dtype=bool)
+    inner[chain_start] = inner[chain_start + chain_length - 1] = False
+    chains[inner] = len(rank) + np.arange(dummy_count)
+    link = np.ones(len(chains) - 1, dtype=bool)
+    link[(chain_start + chain_length - 1)[:-1]] = False
+
+    rank = np.concatenate((rank, dummy_rank))
+    src = np.concatenate((src[~long], chains[:-1][link]))
+    dst = np.concatenate((dst[~long], chains[1:][link]))
+    return rank, src, dst
+
+
+class _Layers:
+    """Knoten nach Ebenen gruppiert; `slot` ist die Stelle eines Knotens in der Liste seiner Ebene."""
+
+    def __init__(self, rank: np.ndarray):
+        self.rank = rank
+        self.count = int(rank.max()) + 1
+        self.members = np.argsort(rank, kind="stable")
+        self.ptr = np.zeros(self.count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rank, minlength=self.count), out=self.ptr[1:])
+        self.slot = np.empty(len(rank), dtype=np.int64)
+        self.slot[self.members] = np.arange(len(rank)) - self.ptr[rank[self.members]]
+
+    def nodes(self, layer: int) -> np.ndarray:
+        return self.members[self.ptr[layer]:self.ptr[layer + 1]]
+
+
+def _order_layers(layers: _Layers, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """
+    Stelle jedes Knotens innerhalb seiner Ebene nach Baryzenter-Sweeps.
+    Schwach zusammenhängende Komponenten bleiben je Ebene zusammenhängend,
+    damit sie sich wie bei dot einzeln herauslösen lassen.
+    """
+    count = len(layers.rank)
+    _, component = connected_components(
+        csr_matrix((np.ones(len(src)), (src, dst)), shape=(count, count)), directed=True, connection="weak",
+    )
+    position = np.empty(count)
+    ordered = np.lexsort((layers.slot, component, layers.rank))
+    position[ordered] = np.arange(count) - layers.ptr[layers.rank[ordered]]
+    # Kanten je Ebene des Ziels (abwärts) bzw. der Quelle (aufwärts) gruppiert
+    down = _edges_by_layer(layers, layers.rank[dst], src, dst)
+    up = _edges_by_layer(layers, layers.rank[src], dst, src)
+    sweeps = [range(1, layers.count), range(layers.count - 2, -1, -1)]
+    for sweep in range(2 * ORDERING_SWEEPS):
+        grouped = down if sweep % 2 == 0 else up
+        for layer in sweeps[sweep % 2]:
+            members = layers.nodes(layer)
+            if len(members) < 2:
+                continue
+            neighbours, own = grouped[layer]
+            barycenter = position[members].copy()
+            if len(own):
+                local = layers.slot[own]
+                totals = np.bincount(local, weights=position[neighbours], minlength=len(members))
+                degree = np.bincount(local, minlength=len(members))
+                has_neighbours = degree > 0
+                barycenter[has_neighbours] = totals[has_neighbours] / degree[has_neighbours]
+            position[members[np.lexsort((barycenter, component[members]))]] = np.arange(len(members))
+    return position
+
+
+def _edges_by_layer(layers: _Layers, key_rank: np.ndarray, neighbours: np.ndarray, own: np.ndarray) -> list:
+    order = np.argsort(key_rank, kind="stable")
+    bounds = np.searchsorted(key_rank[order], np.arange(layers.count + 1))
+    neighbours, own = neighbours[order], own[order]
+    return [(neighbours[bounds[i]:bounds[i + 1]], own[bounds[i]:bounds[i + 1]]) for i in range(layers.count)]
+
+
+def _assign_y(layers: _Layers, position: np.ndarray, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """
+    y-Koordinaten: Startwert ist die Stelle in der Ebene; danach zieht jeder
+    Knoten zum Mittel seiner Nachbarn. Mindestabstände werden je Ebene über
+    laufende Maxima (von oben) und Minima (von unten) hergestellt; das Mittel
+    beider zulässigen Lösungen bleibt zulässig und verschiebt nicht einseitig.
+    """
+    count = len(position)
+    neighbours = csr_matrix(
+        (np.ones(2 * len(src)), (np.concatenate((src, dst)), np.concatenate((dst, src)))), shape=(count, count),
+    )
+    degree = np.asarray(neighbours.sum(axis=1)).ravel()
+    has_neighbours = degree > 0
+
+    ordered = np.lexsort((position, layers.rank))  # Knoten nach Ebene, dann Stelle
+    index_in_layer = position[ordered] * NODE_SEPARATION
+    y = position * NODE_SEPARATION
+    for _ in range(PLACEMENT_ROUNDS):
+        target = y.copy()
+        target[has_neighbours] = (neighbours @ y)[has_neighbours] / degree[has_neighbours]
+        desired = target[ordered] - index_in_layer
+        # Versatz je Ebene, damit laufende Maxima/Minima nicht über Ebenengrenzen wirken
+        offset = layers.rank[ordered] * (np.ptp(desired) + 1.0)
+        lowest = np.maximum.accumulate(desired + offset) - offset
+        highest = np.minimum.accumulate((desired + offset)[::-1])[::-1] - offset
+        y[ordered] = (lowest + highest) / 2 + index_in_layer
+    return y - y.min()
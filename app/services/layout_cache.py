@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+import networkx as nx
+
+from app.utils.cache_dir import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Obergrenze des Speicher-Caches, gemessen in zwischengespeicherten Knotenpositionen
+DEFAULT_MEMORY_BUDGET = 500_000
+DEFAULT_DISK_ENTRIES = 200
+
+Positions = Dict[Hashable, Tuple[float, float]]
+
+
+def default_layout_cache_dir() -> str:
+    return os.path.join(default_cache_dir(), "layouts")
+
+
+def node_keys(graph: nx.DiGraph) -> Dict[Hashable, str]:
+    """
+    Stabile Schlüssel der Knoten über Crawls hinweg: String-IDs direkt, sonst
+    der kanonische Name am Node-Objekt (Ganzzahl-IDs des GraphBuilders gelten
+    nur innerhalb eines Crawls). Bei Mehrdeutigkeit wird die ID verwendet.
+    """
+    keys = {}
+    for node_id, attrs in graph.nodes(data=True):
+        name = getattr(attrs.get("data"), "name", None)
+        keys[node_id] = node_id if isinstance(node_id, str) else (name or repr(node_id))
+    if len(set(keys.values())) != len(keys):
+        keys = {node_id: repr(node_id) for node_id in graph.nodes}
+    return keys
+
+
+def graph_fingerprint(graph: nx.DiGraph, options: dict, keys: Optional[Dict[Hashable, str]] = None) -> str:
+    """Kanonischer Hash aus Knotenmenge, Kantenmenge und Layout-Optionen."""
+    keys = keys if keys is not None else node_keys(graph)
+    return fingerprint(options, keys.values(), ((keys[u], keys[v]) for u, v in graph.edges()))
+
+
+def fingerprint(options: dict, nodes: Iterable[str], edges: Iterable[Tuple[str, str]]) -> str:
+    """Wie graph_fingerprint, direkt aus Knoten- und Kantenschlüsseln (z.B. einer Komponente)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    digest.update("\0n".join(sorted(nodes)).encode("utf-8"))
+    digest.update(b"\0\0e")
+    digest.update("\0e".join(f"{source}\0{target}" for source, target in sorted(edges)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LayoutCache:
+    """
+    Zweistufiger Cache für berechnete Layouts, adressiert über den
+    Fingerabdruck des Graphen: LRU im Speicher (begrenzt über die Anzahl
+    Knotenpositionen) und optional je Layout eine JSON-Datei auf der Platte.
+    Threadsicher, da Layouts in Hintergrund-Threads mehrerer Tabs entstehen.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, directory: Optional[str] = None,
+                 max_disk_entries: int = DEFAULT_DISK_ENTRIES):
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()  # Fingerabdruck -> {Knotenschlüssel: (x, y)}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Tuple[float, float]]]:
+        with self._lock:
+            positions = self._entries.get(fingerprint)
+            if positions is not None:
+                self._entries.move_to_end(fingerprint)
+            elif self.directory:
+                positions = self._read(fingerprint)
+                if positions is not None:
+                    self._remember(fingerprint, positions)
+            if positions is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return positions
+
+    def put(self, fingerprint: str, positions: Dict[str, Tuple[float, float]], persist: bool = True):
+        """Legt ein Layout ab; `persist=False` z.B. für Fallback-Layouts, die nicht auf die Platte sollen."""
+        with self._lock:
+            self._remember(fingerprint, positions)
+            if persist and self.directory:
+                self._write(fingerprint, positions)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, fingerprint: str, positions: dict):
+        size = len(positions)
+        if size > self.memory_budget:
+            return
+        old = self._entries.pop(fingerprint, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[fingerprint] = positions
+        self._size += size
+        while self._size > self.memory_budget:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.json")
+
+    def _read(self, fingerprint: str) -> Optional[dict]:
+        path = self._path(fingerprint)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                positions = {key: tuple(xy) for key, xy in json.load(fh).items()}
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Layout-Cache-Datei {path} nicht lesbar: {e}")
+            return None
+        os.utime(path)  # Zuletzt genutzt, für die Verdrängung
+        return positions
+
+    def _write(self, fingerprint: str, positions: dict):
+        path = self._path(fingerprint)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({key: [float(x), float(y)] for key, (x, y) in positions.items()}, fh)
+            os.replace(tmp_path, path)
+            self._evict_files()
+        except OSError as e:
+            logger.warning(f"Layout-Cache-Datei {path} nicht schreibbar: {e}")
+
+    def _evict_files(self):
+        """Verdrängt die am längsten ungenutzten Dateien über max_disk_entries hinaus."""
+        files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+        overflow = len(files) - self.max_disk_entries
+        if overflow > 0:
+            for entry in sorted(files, key=lambda e: e.stat().st_mtime)[:overflow]:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_layout_cache() -> LayoutCache:
+    """Prozessweiter Cache (Speicher + Benutzer-Cache-Ordner) für alle Tabs und Dialoge."""
+    global _shared_cache
+    # GUI-Thread und LayoutWorker rufen dies gleichzeitig auf
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = LayoutCache(directory=default_layout_cache_dir())
+            except OSError as e:
+                logger.warning(f"Layout-Cache nur im Speicher: {e}")
+                _shared_cache = LayoutCache()
+        return _shared_cache
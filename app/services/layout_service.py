@@ -1,17 +1,42 @@
 import networkx as nx
+import numpy as np
+import atexit
 import os
 import sys
 import platform
 import logging
+import multiprocessing
+import threading
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Callable, List, Optional, Tuple
+
+from app.services.component_layout import Component, pack_components, split_components, weak_component_labels
+from app.services.graphviz_layout import DEFAULT_TIMEOUT, find_dot, graphviz_layout
+from app.services.layered_layout import layered_layout
+from app.services.layout_cache import LayoutCache, fingerprint, graph_fingerprint, node_keys, shared_layout_cache
 
 logger = logging.getLogger(__name__)
 
+_POLL_INTERVAL = 0.2  # Sekunden zwischen zwei Abfragen von `cancelled` beim Warten auf den Pool
+
 
 class LayoutService:
     """
     Berechnet ein hierarchisches Layout für einen Graphen.
     Nutzt eine gebündelte, portable und vorab gepatchte Version von Graphviz.
     """
+    # Optionen des hierarchischen Layouts; Teil des Cache-Schlüssels
+    LAYOUT_OPTIONS = {"prog": "dot", "rankdir": "LR", "output": "plain"}
+
+    # Kleinere Komponenten werden gemeinsam berechnet und nicht einzeln zwischengespeichert
+    CACHED_COMPONENT_MIN_NODES = 50
+
+    def __init__(self, cache: Optional[LayoutCache] = None, timeout: float = DEFAULT_TIMEOUT, workers: int = 0):
+        self.cache = cache if cache is not None else shared_layout_cache()
+        self.timeout = timeout
+        self.workers = workers  # > 1: Komponenten parallel in einem Prozess-Pool, sonst nacheinander
+        self._dot_path = None  # Beim ersten Layout ermittelt
 
     def _get_graphviz_path(self):
         """
@@ -44,44 +69,213 @@ class LayoutService:
             logger.critical(f"Fehler beim Finden des Graphviz-Pfades: {e}", exc_info=True)
             return None
 
-    def calculate_layout(self, graph: nx.DiGraph):
+    def calculate_layout(self, graph: nx.DiGraph, cancelled: Optional[Callable[[], bool]] = None):
         """
-        Berechnet ein hierarchisches Layout von links nach rechts.
+        Berechnet ein hierarchisches Layout von links nach rechts. Ergebnisse
+        werden über den Fingerabdruck des Graphen zwischengespeichert, sodass
+        erneutes Öffnen, Exportieren oder Umschalten der CTE-Sicht dot überspringt.
+        Zerfällt der Graph in mehrere Komponenten, werden diese einzeln (ggf.
+        parallel) berechnet, einzeln zwischengespeichert und zusammengepackt.
+        `cancelled` wird zwischen den Schritten abgefragt (z.B. von einem
+        Hintergrund-Thread); ein abgebrochenes Layout liefert {}.
         """
         if not graph.nodes:
             logger.warning("Layout-Berechnung übersprungen: Graph hat keine Knoten.")
             return {}
 
-        try:
-            from networkx.drawing.nx_pydot import graphviz_layout
+        keys = node_keys(graph)
+        fingerprint = graph_fingerprint(graph, self.LAYOUT_OPTIONS, keys)
+        cached = self.cache.get(fingerprint)
+        if cached is not None:
+            logger.info("Layout aus dem Layout-Cache übernommen.")
+            return {node_id: cached[key] for node_id, key in keys.items()}
+
+        cancelled = cancelled or (lambda: False)
+        labels = weak_component_labels(graph)
+        if np.count_nonzero(np.bincount(labels) >= self.CACHED_COMPONENT_MIN_NODES) < 2:
+            # Aufteilen lohnt erst ab zwei großen Komponenten; sonst wie bisher in einem Lauf
+            pos, persist = self._layout_graph(graph, cancelled)
+            positions = {keys[n]: (float(x), float(y)) for n, (x, y) in pos.items()}
+        else:
+            positions, persist = self._layout_components(split_components(graph, keys, labels), cancelled)
+        if not positions:
+            return {}
+        # Fallback-Layouts nur im Speicher, damit dot sie später ersetzen kann
+        self.cache.put(fingerprint, positions, persist)
+        return {node_id: positions[key] for node_id, key in keys.items()}
+
+    def _layout_graph(self, graph: nx.DiGraph, cancelled: Callable[[], bool] = lambda: False):
+        """Layout eines Graphen per dot, sonst per Fallback; dazu, ob es dauerhaft gespeichert werden darf."""
+        pos = {} if cancelled() else self._hierarchical_layout(graph, cancelled)
+        if pos:
+            return pos, True
+        if cancelled():
+            logger.info("Layout-Berechnung abgebrochen.")
+            return {}, False
+        return self._fallback_layout(graph), False
 
-            graphviz_bin_path = self._get_graphviz_path()
-            if not graphviz_bin_path:
-                raise EnvironmentError("Graphviz-Pfad konnte nicht ermittelt werden.")
+    def _layout_components(self, components: List[Component], cancelled: Callable[[], bool]):
+        """
+        Nimmt große Komponenten aus dem Cache oder berechnet sie je einzeln;
+        kleine werden gemeinsam in einem Durchlauf berechnet und nicht einzeln
+        gespeichert. Fehlende Teile laufen bei `workers` > 1 parallel in Prozessen.
+        """
+        layouts = [None] * len(components)
+        fingerprints = {}
+        batches, small = [], []
+        for i, (nodes, edges) in enumerate(components):
+            if len(nodes) < self.CACHED_COMPONENT_MIN_NODES:
+                small.append(i)
+                continue
+            fingerprints[i] = fingerprint(self.LAYOUT_OPTIONS, nodes, edges)
+            layouts[i] = self.cache.get(fingerprints[i])
+            if layouts[i] is None:
+                batches.append([i])
+        if small:
+            batches.append(small)
+        logger.info(f"Layout für {len(components)} Komponenten, davon {len(batches) - bool(small)} "
+                    f"große neu und {len(small)} kleine gemeinsam.")
+
+        results = self._run_batches(
+            [(list(chain.from_iterable(components[i][0] for i in batch)),
+              list(chain.from_iterable(components[i][1] for i in batch))) for batch in batches],
+            cancelled,
+        )
+        if results is None:
+            return {}, False
+        persist_all = True
+        for batch, (positions, persist) in zip(batches, results):
+            if not positions:
+                return {}, False
+            persist_all &= persist
+            for i in batch:
+                layouts[i] = {key: positions[key] for key in components[i][0]}
+                if i in fingerprints:
+                    # Nur im Speicher; auf die Platte kommt das Layout des ganzen Graphen
+                    self.cache.put(fingerprints[i], layouts[i], persist=False)
+        return pack_components(layouts), persist_all
+
+    def _run_batches(self, batches: List[Component], cancelled: Callable[[], bool]):
+        """Layouts je Stapel (Knoten, Kanten in Schlüsseln); None bei Abbruch."""
+        if self.workers <= 1 or len(batches) < 2:
+            results = []
+            for nodes, edges in batches:
+                if cancelled():
+                    return None
+                results.append(self._layout_batch(nodes, edges, cancelled))
+            return results
 
-            # Temporär den PATH setzen, damit pydot die 'dot'-Executable findet
-            original_path = os.environ.get('PATH', '')
-            os.environ['PATH'] = f"{graphviz_bin_path}{os.pathsep}{original_path}"
+        executor, stop = _layout_executor(self.workers)
+        futures = [executor.submit(_layout_batch_in_process, nodes, edges, self._resolve_dot(), self.timeout, stop)
+                   for nodes, edges in batches]
+        try:
+            while wait(futures, timeout=_POLL_INTERVAL).not_done:
+                if cancelled():
+                    for future in futures:
+                        future.cancel()
+                    # Laufende Stapel beenden ihren dot-Prozess selbst, sobald `stop` gesetzt ist
+                    stop.set()
+                    logger.info("Layout-Berechnung abgebrochen.")
+                    return None
+            return [future.result() for future in futures]
+        finally:
+            _release_stop_event(stop)
+
+    def _layout_batch(self, nodes: List[str], edges: List[Tuple[str, str]], cancelled=lambda: False):
+        graph = nx.DiGraph()
+        graph.add_nodes_from(nodes)
+        graph.add_edges_from(edges)
+        pos, persist = self._layout_graph(graph, cancelled)
+        return {key: (float(x), float(y)) for key, (x, y) in pos.items()}, persist
 
-            logger.info("Versuche hierarchisches Layout mit gepatchtem Graphviz...")
-            graph.graph['graph'] = {'rankdir': 'LR'}
-            pos = graphviz_layout(graph, prog='dot')
+    def _resolve_dot(self) -> str:
+        """Pfad zur dot-Executable, einmalig ermittelt; "" wenn keine vorhanden ist."""
+        if self._dot_path is None:
+            self._dot_path = find_dot(self._get_graphviz_path()) or ""
+            if not self._dot_path:
+                logger.warning("Keine dot-Executable gefunden; Layouts werden intern berechnet.")
+        return self._dot_path
 
-            os.environ['PATH'] = original_path  # Zurücksetzen
+    def _hierarchical_layout(self, graph: nx.DiGraph, cancelled: Optional[Callable[[], bool]] = None):
+        if not self._resolve_dot():
+            return {}
+        try:
+            logger.info(f"Versuche hierarchisches Layout mit {self._dot_path}...")
+            pos = graphviz_layout(graph, self._dot_path, rankdir=self.LAYOUT_OPTIONS['rankdir'],
+                                  timeout=self.timeout, cancelled=cancelled)
             logger.info("Horizontales hierarchisches Layout erfolgreich berechnet.")
             return pos
         except Exception as e:
             logger.critical(f"FATAL: Hierarchisches Layout fehlgeschlagen: {e}", exc_info=True)
+            return {}
 
-        # Fallback: Robustes Spring-Layout
-        logger.warning("Nutze robustes Spring-Layout als Fallback...")
+    def _fallback_layout(self, graph: nx.DiGraph):
+        # Fallback: hierarchisches Layout im eigenen Prozess, ohne Graphviz
+        logger.warning("Nutze internes Ebenen-Layout als Fallback...")
         try:
-            k_value = 200 / (len(graph.nodes()) ** 0.5) if len(graph.nodes()) > 0 else 200
-            pos = nx.spring_layout(graph, k=k_value, iterations=100, seed=42)
-            logger.info("Robustes Spring-Layout erfolgreich berechnet.")
+            pos = layered_layout(graph)
+            logger.info("Internes Ebenen-Layout erfolgreich berechnet.")
             return pos
         except Exception as e:
             logger.critical(f"FATAL: Selbst das Fallback-Layout ist fehlgeschlagen: {e}", exc_info=True)
             return {}
 
-        #TODO Für build Datei muss man inital_setup.py umschreiben auf build
\ No newline at end of file
+        #TODO Für build Datei muss man inital_setup.py umschreiben auf build
+
+
+_executor = None
+_manager = None
+_stop_events = set()  # Abbruch-Signale der laufenden Layouts (je Aufruf von _run_batches)
+_executor_lock = threading.Lock()
+
+
+def _layout_executor(workers: int):
+    """
+    Prozessweit geteilter Pool für Komponenten-Layouts (alle Tabs) und ein
+    neues Abbruch-Signal für die übergebenen Stapel. "spawn", da der Pool aus
+    Hintergrund-Threads der Qt-Anwendung heraus genutzt wird. Das Signal kommt
+    von einem Manager, da Events nicht direkt an Pool-Aufgaben übergeben werden können.
+    """
+    global _executor, _manager
+    with _executor_lock:
+        if _executor is None:
+            context = multiprocessing.get_context("spawn")
+            _manager = context.Manager()
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        stop = _manager.Event()
+        _stop_events.add(stop)
+        return _executor, stop
+
+
+def _release_stop_event(stop):
+    with _executor_lock:
+        _stop_events.discard(stop)
+
+
+@atexit.register
+def shutdown_layout_executor():
+    """Beendet laufende dot-Prozesse sowie Pool und Manager beim Programmende."""
+    global _executor, _manager
+    with _executor_lock:
+        executor, manager, stops = _executor, _manager, list(_stop_events)
+        _executor, _manager = None, None
+        _stop_events.clear()
+    for stop in stops:
+        stop.set()
+    if executor is not None:
+        executor.shutdown(cancel_futures=True)
+    if manager is not None:
+        manager.shutdown()
+
+
+def _layout_batch_in_process(nodes: List[str], edges: List[Tuple[str, str]], dot_path: str, timeout: float,
+                             stop=None):
+    """
+    Einstieg im Pool-Prozess: Layout eines Stapels ohne Cache, mit dem im
+    Hauptprozess ermittelten dot. Ist `stop` gesetzt, wird ein laufender dot beendet.
+    """
+    service = LayoutService(cache=LayoutCache(memory_budget=0), timeout=timeout)
+    service._dot_path = dot_path
+    if stop is None:
+        return service._layout_batch(nodes, edges)
+    return service._layout_batch(nodes, edges, stop.is_set)
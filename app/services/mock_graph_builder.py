@@ -1,28 +1,45 @@
 import re
+from collections import OrderedDict
+from typing import Optional
+
 import networkx as nx
 from app.models.node import Node
 from app.data import test_data
+from app.services.reachability_index import ReachabilityIndex
+
+# Obergrenze für zwischengespeicherte Teilgraphen, gemessen in Knoten + Kanten
+DEFAULT_CACHE_BUDGET = 500_000
+
 
 class MockGraphBuilder:
     """
     Baut einen Data-Lineage-Graphen ausschließlich aus den statischen
     `test_data.dependencies`.
     """
-    def __init__(self):
-        self._graph_cache = {}
+    def __init__(self, dependencies: Optional[dict] = None, cache_budget: int = DEFAULT_CACHE_BUDGET):
+        self._dependencies = dependencies if dependencies is not None else getattr(test_data, "dependencies", {})
+        self._cache_budget = cache_budget
+        self._cache_size = 0
+        self._graph_cache = OrderedDict()  # LRU: artifact -> (Teilgraph, Größe)
         # Der Gesamtgraph aller möglichen Abhängigkeiten wird einmalig erstellt.
-        self._full_dependency_graph, self._all_nodes = self._build_full_dependency_graph()
+        self._full_dependency_graph, self._original_names = self._build_full_dependency_graph()
+        self._reachability = ReachabilityIndex(self._full_dependency_graph)
 
     def _build_full_dependency_graph(self):
         """
-        Baut einmalig einen Graphen, der ALLE definierten Abhängigkeiten enthält.
+        Baut einmalig einen Graphen, der ALLE definierten Abhängigkeiten enthält,
+        sowie den Index bereinigte ID -> Originalname.
         """
-        dependencies = getattr(test_data, "dependencies", {})
         full_graph = nx.DiGraph()
-        all_nodes = set()
+        original_names = {}
+
+        def clean(name: str) -> str:
+            clean_id = self._sanitize_id(name)
+            original_names.setdefault(clean_id, name)
+            return clean_id
 
-        for key, value in dependencies.items():
-            all_nodes.add(key)
+        for key, value in self._dependencies.items():
+            key_id = clean(key)
             inputs = []
 
             if isinstance(value, list):
@@ -30,49 +47,59 @@ class MockGraphBuilder:
             elif isinstance(value, dict):
                 inputs = value.get('inputs', [])
                 for output in value.get('outputs', []):
-                    all_nodes.add(output)
-                    full_graph.add_edge(self._sanitize_id(key), self._sanitize_id(output))
+                    full_graph.add_edge(key_id, clean(output))
 
             for source in inputs:
-                all_nodes.add(source)
-                full_graph.add_edge(self._sanitize_id(source), self._sanitize_id(key))
+                full_graph.add_edge(clean(source), key_id)
 
-        return full_graph, all_nodes
+        return full_graph, original_names
 
     def build_graph(self, selections: dict) -> nx.DiGraph:
         """
         Extrahiert den relevanten Subgraphen für das ausgewählte Artefakt.
+        Zurückgegeben wird eine schreibgeschützte Sicht auf den zwischengespeicherten
+        Graphen; wer ihn verändern will, arbeitet auf einer Kopie (nx.DiGraph(graph)).
         """
         artifact_name = selections.get('artifact')
+        if not artifact_name:
+            return nx.DiGraph()
         start_node_clean = self._sanitize_id(artifact_name)
-
-        if not artifact_name or start_node_clean not in self._full_dependency_graph:
+        if start_node_clean not in self._full_dependency_graph:
             return nx.DiGraph()
 
-        if artifact_name in self._graph_cache:
-            return self._graph_cache[artifact_name]
+        cached = self._graph_cache.get(artifact_name)
+        if cached is not None:
+            self._graph_cache.move_to_end(artifact_name)
+            return cached[0].copy(as_view=True)
 
-        ancestors = nx.ancestors(self._full_dependency_graph, start_node_clean)
-        descendants = nx.descendants(self._full_dependency_graph, start_node_clean)
-        relevant_nodes = ancestors.union(descendants).union({start_node_clean})
+        relevant_nodes = self._reachability.ancestors_and_descendants(start_node_clean)
 
         final_graph = self._full_dependency_graph.subgraph(relevant_nodes).copy()
 
         for clean_id in final_graph.nodes():
-            original_name = next((n for n in self._all_nodes if self._sanitize_id(n) == clean_id), clean_id)
+            original_name = self._original_names.get(clean_id, clean_id)
             node_type = self._infer_type_from_name(original_name)
             node_obj = Node(
                 id=clean_id,
                 name=original_name.split('.')[-1],
                 node_type=node_type,
                 context=original_name,
-                predecessors=list(final_graph.predecessors(clean_id)),
-                successors=list(final_graph.successors(clean_id))
-            )
+            ).bind(final_graph)
             final_graph.nodes[clean_id]['data'] = node_obj
 
-        self._graph_cache[artifact_name] = final_graph
-        return final_graph
+        self._remember(artifact_name, final_graph)
+        return final_graph.copy(as_view=True)
+
+    def _remember(self, artifact_name: str, graph: nx.DiGraph):
+        """Legt einen Teilgraphen im LRU-Cache ab und verdrängt die ältesten Einträge."""
+        size = graph.number_of_nodes() + graph.number_of_edges()
+        if size > self._cache_budget:
+            return
+        self._graph_cache[artifact_name] = (graph, size)
+        self._cache_size += size
+        while self._cache_size > self._cache_budget:
+            _, (_, evicted_size) = self._graph_cache.popitem(last=False)
+            self._cache_size -= evicted_size
 
     def _sanitize_id(self, name: str) -> str:
         return re.sub(r'[^a-zA-Z0-9_]', '_', name)
@@ -81,4 +108,4 @@ class MockGraphBuilder:
         up = original_name.upper()
         if "V_" in up or "VIEW" in up: return "VIEW"
         if "ELT_" in up: return "ELT"
-        return "TABLE"
\ No newline at end of file
+        return "TABLE"
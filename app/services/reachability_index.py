@@ -0,0 +1,223 @@
+from typing import Iterable, Optional, Set
+
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import connected_components
+
+from app.services.graph_version import graph_signature
+from app.services.sparse_adjacency import sparse_adjacency
+
+_GRAPH_ATTR = "reachability_index"
+
+
+class _IntervalLabels:
+    """
+    Intervall-Labels (Tree Cover) über einem DAG in CSR-Form: Jeder Knoten
+    erhält eine Postorder-Nummer; die Menge seiner Nachfahren ist eine Liste
+    disjunkter Postorder-Intervalle. Reichbarkeit ist damit eine binäre Suche
+    in wenigen Intervallen, die Nachfahren sind zusammenhängende Ausschnitte
+    der Postorder-Reihenfolge.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, topo_order: list):
+        count = len(indptr) - 1
+        post = np.full(count, -1, dtype=np.int64)
+        low = np.empty(count, dtype=np.int64)
+        by_post = np.empty(count, dtype=np.int64)
+
+        # Spannwald per iterativer DFS in topologischer Reihenfolge
+        counter = 0
+        visited = np.zeros(count, dtype=bool)
+        indptr_list, indices_list = indptr.tolist(), indices.tolist()
+        for root in topo_order:
+            if visited[root]:
+                continue
+            visited[root] = True
+            stack = [(root, indptr_list[root], counter)]
+            while stack:
+                node, pos, first = stack[-1]
+                end = indptr_list[node + 1]
+                while pos < end and visited[indices_list[pos]]:
+                    pos += 1
+                if pos < end:
+                    child = indices_list[pos]
+                    stack[-1] = (node, pos + 1, first)
+                    visited[child] = True
+                    stack.append((child, indptr_list[child], counter))
+                else:
+                    stack.pop()
+                    post[node] = counter
+                    low[node] = first
+                    by_post[counter] = node
+                    counter += 1
+
+        # Intervalle von den Senken aufwärts zusammenführen
+        intervals = [None] * count
+        for node in reversed(topo_order):
+            merged = [(int(low[node]), int(post[node]))]
+            for child in indices_list[indptr_list[node]:indptr_list[node + 1]]:
+                merged.extend(intervals[child])
+            intervals[node] = self._merge(merged)
+
+        sizes = np.fromiter((len(iv) for iv in intervals), dtype=np.int64, count=count)
+        self.interval_ptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self.interval_ptr[1:])
+        flat = np.array([bound for iv in intervals for pair in iv for bound in pair], dtype=np.int64).reshape(-1, 2)
+        self.interval_start = flat[:, 0].copy()
+        self.interval_end = flat[:, 1].copy()
+        self.post = post
+        self.by_post = by_post
+
+    @staticmethod
+    def _merge(intervals: list) -> list:
+        if len(intervals) == 1:
+            return intervals
+        intervals.sort()
+        merged = [intervals[0]]
+        for start, end in intervals[1:]:
+            last_start, last_end = merged[-1]
+            if start <= last_end + 1:
+                if end > last_end:
+                    merged[-1] = (last_start, end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    def reaches(self, src: int, dst: int) -> bool:
+        lo, hi = self.interval_ptr[src], self.interval_ptr[src + 1]
+        target = self.post[dst]
+        pos = np.searchsorted(self.interval_start[lo:hi], target, side="right") - 1
+        return pos >= 0 and target <= self.interval_end[lo + pos]
+
+    def reachable(self, src: int) -> np.ndarray:
+        lo, hi = self.interval_ptr[src], self.interval_ptr[src + 1]
+        return np.concatenate([
+            self.by_post[start:end + 1]
+            for start, end in zip(self.interval_start[lo:hi], self.interval_end[lo:hi])
+        ])
+
+    @property
+    def interval_count(self) -> int:
+        return len(self.interval_start)
+
+
+class ReachabilityIndex:
+    """
+    Einmalig aufgebauter Reichbarkeitsindex eines Lineage-Graphen: starke
+    Zusammenhangskomponenten werden kondensiert, über dem DAG liegen
+    Intervall-Labels für Nachfahren und (auf dem umgekehrten DAG) Vorfahren.
+    "Liegt X stromaufwärts von Y" ist damit ohne Traversierung beantwortbar;
+    Vorfahren/Nachfahren entsprechen nx.ancestors bzw. nx.descendants.
+    """
+
+    def __init__(self, graph: nx.DiGraph):
+        adjacency = sparse_adjacency(graph)
+        self.nodes = adjacency.nodes
+        self._index = adjacency.index
+        self._signature = graph_signature(graph)
+
+        self.component_count, labels = connected_components(adjacency.matrix, directed=True, connection="strong")
+        self.component = labels.astype(np.int64)
+
+        # Mitglieder je Komponente (CSR)
+        order = np.argsort(self.component, kind="stable")
+        self._member_ptr = np.zeros(self.component_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.component, minlength=self.component_count), out=self._member_ptr[1:])
+        self._members = order
+
+        # Kondensierter DAG
+        coo = adjacency.matrix.tocoo()
+        src, dst = self.component[coo.row], self.component[coo.col]
+        keep = src != dst
+        pairs = np.unique(src[keep] * self.component_count + dst[keep])
+        cond_src, cond_dst = pairs // self.component_count, pairs % self.component_count
+        succ_ptr, succ_idx = self._csr(cond_src, cond_dst)
+        pred_ptr, pred_idx = self._csr(cond_dst, cond_src)
+
+        topo_order = self._topological_order(succ_ptr, succ_idx, pred_ptr)
+        self._descendants = _IntervalLabels(succ_ptr, succ_idx, topo_order)
+        self._ancestors = _IntervalLabels(pred_ptr, pred_idx, topo_order[::-1])
+
+    @classmethod
+    def for_graph(cls, graph: nx.DiGraph) -> "ReachabilityIndex":
+        """
+        Liefert den am Graphen hinterlegten Index und baut ihn nur neu auf,
+        wenn es ein anderer Graph ist (z.B. eine Kopie, nicht aber eine Sicht) oder er sich
+        seitdem geändert hat (siehe graph_version.graph_signature).
+        """
+        index = cls.cached(graph)
+        if index is None:
+            index = cls(graph)
+            graph.graph[_GRAPH_ATTR] = index
+        return index
+
+    @classmethod
+    def cached(cls, graph: nx.DiGraph) -> Optional["ReachabilityIndex"]:
+        """Der am Graphen hinterlegte, noch aktuelle Index oder None (ohne ihn aufzubauen)."""
+        index = graph.graph.get(_GRAPH_ATTR)
+        if index is None or index._signature != graph_signature(graph):
+            return None
+        return index
+
+    def __contains__(self, node) -> bool:
+        return node in self._index
+
+    def is_upstream(self, upstream, downstream) -> bool:
+        """True, wenn ein Pfad von `upstream` nach `downstream` existiert."""
+        src, dst = self._index.get(upstream), self._index.get(downstream)
+        if src is None or dst is None or src == dst:
+            return False
+        src_comp, dst_comp = self.component[src], self.component[dst]
+        if src_comp == dst_comp:
+            return True
+        return bool(self._descendants.reaches(src_comp, dst_comp))
+
+    def ancestors(self, node) -> Set:
+        return self._expand(node, self._ancestors)
+
+    def descendants(self, node) -> Set:
+        return self._expand(node, self._descendants)
+
+    def ancestors_and_descendants(self, node) -> Set:
+        """Vorfahren, Nachfahren und der Knoten selbst (der "Lineage-Ausschnitt")."""
+        if node not in self._index:
+            return set()
+        return self.ancestors(node) | self.descendants(node) | {node}
+
+    def _expand(self, node, labels: _IntervalLabels) -> Set:
+        index = self._index.get(node)
+        if index is None:
+            return set()
+        components = labels.reachable(self.component[index])
+        members = self._members_of(components)
+        result = {self.nodes[i] for i in members.tolist()}
+        result.discard(node)
+        return result
+
+    def _members_of(self, components: Iterable[int]) -> np.ndarray:
+        components = np.asarray(components, dtype=np.int64)
+        starts = self._member_ptr[components]
+        lengths = self._member_ptr[components + 1] - starts
+        total = int(lengths.sum())
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        return self._members[offsets]
+
+    def _csr(self, sources: np.ndarray, targets: np.ndarray):
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(self.component_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=self.component_count), out=indptr[1:])
+        return indptr, targets[order]
+
+    def _topological_order(self, succ_ptr: np.ndarray, succ_idx: np.ndarray, pred_ptr: np.ndarray) -> list:
+        in_degree = np.diff(pred_ptr).tolist()
+        succ_ptr, succ_idx = succ_ptr.tolist(), succ_idx.tolist()
+        ready = [c for c in range(self.component_count) if in_degree[c] == 0]
+        order = []
+        while ready:
+            comp = ready.pop()
+            order.append(comp)
+            for child in succ_idx[succ_ptr[comp]:succ_ptr[comp + 1]]:
+                in_degree[child] -= 1
+                if not in_degree[child]:
+                    ready.append(child)
+        return order
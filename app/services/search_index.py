@@ -0,0 +1,223 @@
+import bisect
+import re
+from collections import defaultdict
+from typing import Hashable, List, Optional, Sequence
+
+import networkx as nx
+import numpy as np
+
+from app.services.graph_version import graph_signature
+
+# Unter diesen Schlüsseln liegen Index bzw. SQL-Texte im Attribut-Dict des Graphen
+_GRAPH_ATTR = "search_index"
+SQL_TEXTS_ATTR = "sql_texts"
+
+# Rangstufe eines Treffers nach dem Byte davor: Textanfang (Nullbyte) = Präfix,
+# Trennzeichen = Wortanfang (z.B. "DWH.V_|AGG"), sonst beliebiger Teilstring
+_PREFIX, _WORD_START, _SUBSTRING = 1, 2, 3
+_CATEGORY_BY_PREVIOUS_BYTE = np.full(256, _SUBSTRING, dtype=np.int8)
+_CATEGORY_BY_PREVIOUS_BYTE[0] = _PREFIX
+_CATEGORY_BY_PREVIOUS_BYTE[[ord(c) for c in "._ $#"]] = _WORD_START
+
+# Bezeichner in SQL-Texten: Wörter und Inhalte von "quoted identifiers"
+_IDENTIFIER = re.compile(r'"([^"]+)"|([^\W\d][\w$#]*)')
+
+
+class TrigramIndex:
+    """
+    Positionaler Trigramm-Index über eine Liste von Texten (ohne Groß-/Klein-
+    schreibung). Alle Texte liegen UTF-8-kodiert und durch Nullbytes getrennt in
+    einem Byte-Array; je Trigramm sind die Fundstellen darin abgelegt. Eine
+    Suche nimmt die Fundstellen des seltensten Trigramms der Anfrage und prüft
+    die übrigen Bytes vektorisiert nach. Kürzere Anfragen lesen den
+    zusammenhängenden Bereich aller Trigramme mit diesem Präfix.
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        encoded = [text.lower().encode("utf-8") for text in texts]
+        self.starts = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) + 1 for b in encoded], out=self.starts[1:])
+        self.lengths = np.diff(self.starts) - 1
+        self._buffer = np.frombuffer(b"\0".join(encoded) + b"\0\0\0", dtype=np.uint8)
+        position_dtype = np.int32 if len(self._buffer) < 2**31 else np.int64
+        self._doc_of = np.repeat(np.arange(len(encoded), dtype=np.int32), self.lengths + 1)
+        # Rangstufe eines Treffers je Startposition, nach dem Byte davor
+        self._category_at = _CATEGORY_BY_PREVIOUS_BYTE[np.concatenate(([0], self._buffer[:-1]))]
+
+        buf = self._buffer.astype(np.int32)
+        codes = (buf[:-2] << 16) | (buf[1:-1] << 8) | buf[2:]
+        # Jede Textposition beginnt ein Trigramm (am Textende mit Nullbytes aufgefüllt)
+        positions = np.flatnonzero(buf[:-2] != 0).astype(position_dtype)
+        order = np.argsort(codes[positions], kind="stable")
+        self._positions = positions[order]
+        self._trigrams, first = np.unique(codes[positions][order], return_index=True)
+        self._indptr = np.append(first, len(order)).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def search(self, query: str, limit: int = 50) -> np.ndarray:
+        """
+        Nummern der Texte, die `query` enthalten, nach Relevanz: exakter Treffer,
+        Präfix, Wortanfang, sonstiger Teilstring; innerhalb einer Stufe kürzere,
+        dann frühere Texte zuerst.
+        """
+        pattern = np.frombuffer(query.lower().replace("\0", "").encode("utf-8"), dtype=np.uint8)
+        positions = self._matches(pattern)
+        category = self._category_at[positions].astype(np.int64)
+        prefix = category == _PREFIX
+        if np.count_nonzero(prefix) >= limit:
+            # Jeder Text hat höchstens einen Präfix-Treffer; die übrigen Stufen fallen weg
+            positions, category = positions[prefix], category[prefix]
+        docs = self._doc_of[positions]
+        lengths = self.lengths[docs]
+        category[(category == _PREFIX) & (lengths == pattern.size)] = 0
+        keys = (category << 52) | (np.minimum(lengths, 2**20 - 1) << 32) | docs
+        # Meist genügt ein kleines Fenster der besten Schlüssel; sonst voll sortieren
+        window = 4 * limit
+        if len(keys) > window:
+            ranked = self._distinct_docs(np.sort(np.partition(keys, window - 1)[:window]), limit)
+            if len(ranked) == limit:
+                return ranked
+        return self._distinct_docs(np.sort(keys), limit)
+
+    @staticmethod
+    def _distinct_docs(sorted_keys: np.ndarray, limit: int) -> np.ndarray:
+        """Textnummern in Schlüsselreihenfolge; ein mehrfach treffender Text zählt einmal."""
+        ranked = {}
+        for start in range(0, len(sorted_keys), 4 * limit):
+            ranked.update(dict.fromkeys((sorted_keys[start:start + 4 * limit] & (2**32 - 1)).tolist()))
+            if len(ranked) >= limit:
+                break
+        return np.array(list(ranked)[:limit], dtype=np.int64)
+
+    def _matches(self, pattern: np.ndarray) -> np.ndarray:
+        """Alle Bytepositionen im Puffer, an denen `pattern` beginnt."""
+        if not pattern.size:
+            return np.empty(0, dtype=np.int64)
+        if pattern.size < 3:
+            # Alle Trigramme mit diesem Präfix liegen zusammenhängend
+            prefix = int.from_bytes(pattern.tobytes(), "big") << (8 * (3 - pattern.size))
+            lo, hi = np.searchsorted(self._trigrams, [prefix, prefix + (1 << (8 * (3 - pattern.size)))])
+            return self._positions[self._indptr[lo]:self._indptr[hi]]
+
+        if not len(self._trigrams):
+            return np.empty(0, dtype=np.int64)
+        values = pattern.astype(np.int32)
+        codes = (values[:-2] << 16) | (values[1:-1] << 8) | values[2:]
+        slots = np.minimum(np.searchsorted(self._trigrams, codes), len(self._trigrams) - 1)
+        if np.any(self._trigrams[slots] != codes):
+            return np.empty(0, dtype=np.int64)
+        counts = self._indptr[slots + 1] - self._indptr[slots]
+        anchor = int(np.argmin(counts))
+        slot = slots[anchor]
+        candidates = self._positions[self._indptr[slot]:self._indptr[slot + 1]].astype(np.int64) - anchor
+        candidates = candidates[(candidates >= 0) & (candidates + pattern.size <= len(self._buffer))]
+        for offset in range(pattern.size):
+            if not anchor <= offset < anchor + 3 and candidates.size:
+                candidates = candidates[self._buffer[candidates + offset] == pattern[offset]]
+        return candidates
+
+
+class TokenIndex:
+    """
+    Invertierter Index Bezeichner -> Texte, z.B. über die SQL-Texte der
+    Objekte. Beantwortet "welche Objekte verwenden Spalte X" ohne Teilstring-
+    Treffer (CUSTOMER_ID findet nicht CUSTOMER_ID_OLD).
+    """
+
+    def __init__(self, texts: Sequence[str]):
+        postings = defaultdict(set)
+        for doc, text in enumerate(texts):
+            for quoted, word in _IDENTIFIER.findall(text or ""):
+                postings[(quoted or word).lower()].add(doc)
+        self._postings = {token: np.array(sorted(docs), dtype=np.int32) for token, docs in postings.items()}
+        self.vocabulary = sorted(self._postings)
+
+    def find(self, identifier: str) -> np.ndarray:
+        """Texte, die den Bezeichner enthalten; qualifizierte Namen (t.col) über den letzten Teil."""
+        token = identifier.strip().strip('"').rsplit(".", 1)[-1].strip('"').lower()
+        return self._postings.get(token, np.empty(0, dtype=np.int32))
+
+    def complete(self, prefix: str, limit: int = 20) -> List[str]:
+        """Bekannte Bezeichner mit diesem Präfix, alphabetisch (für die Eingabe-Vervollständigung)."""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        matches = []
+        for token in self.vocabulary[start:start + limit]:
+            if not token.startswith(prefix):
+                break
+            matches.append(token)
+        return matches
+
+
+class SearchIndex:
+    """
+    Suchindex eines geladenen Graphen: Trigramm-Index über die Knotennamen
+    und – falls beim Crawl SQL-Texte gesammelt wurden (graph.graph["sql_texts"])
+    – ein Bezeichner-Index über deren SQL.
+    """
+
+    def __init__(self, graph: nx.DiGraph):
+        self.nodes = list(graph.nodes)
+        self._signature = self._graph_signature(graph)
+        names = []
+        for node_id, attrs in graph.nodes(data=True):
+            node_obj = attrs.get("data")
+            names.append(getattr(node_obj, "name", None) or str(node_id))
+        self.names = TrigramIndex(names)
+
+        sql_texts = graph.graph.get(SQL_TEXTS_ATTR) or {}
+        self.sql = TokenIndex([sql_texts.get(node_id, "") for node_id in self.nodes]) if sql_texts else None
+
+    @classmethod
+    def for_graph(cls, graph: nx.DiGraph) -> "SearchIndex":
+        """
+        Liefert den am Graphen hinterlegten Index und baut ihn nur neu auf, wenn
+        sich der Graph (siehe graph_version.graph_signature) oder die gesammelten
+        SQL-Texte geändert haben.
+        """
+        index = cls.cached(graph)
+        if index is None:
+            index = cls(graph)
+            graph.graph[_GRAPH_ATTR] = index
+        return index
+
+    @classmethod
+    def cached(cls, graph: nx.DiGraph) -> Optional["SearchIndex"]:
+        """Der am Graphen hinterlegte, noch aktuelle Index oder None (ohne ihn aufzubauen)."""
+        index = graph.graph.get(_GRAPH_ATTR)
+        if index is None or index._signature != cls._graph_signature(graph):
+            return None
+        return index
+
+    @staticmethod
+    def _graph_signature(graph: nx.DiGraph) -> tuple:
+        return graph_signature(graph) + (id(graph.graph.get(SQL_TEXTS_ATTR)),)
+
+    def search(self, query: str, limit: int = 50) -> List[Hashable]:
+        """Knoten, deren Name `query` enthält, nach Relevanz sortiert."""
+        if not query:
+            return []
+        return [self.nodes[i] for i in self.names.search(query, limit)]
+
+    def references(self, identifier: str) -> List[Hashable]:
+        """Knoten, deren SQL-Text den Bezeichner (z.B. einen Spaltennamen) verwendet."""
+        if self.sql is None or not identifier:
+            return []
+        return [self.nodes[i] for i in self.sql.find(identifier)]
+
+
+def scan_names(graph: nx.DiGraph, query: str, limit: int = 50) -> List[Hashable]:
+    """Knoten, deren Name `query` enthält, in Graph-Reihenfolge (linearer Durchlauf ohne Index)."""
+    if not query:
+        return []
+    query = query.lower()
+    matches = []
+    for node_id, attrs in graph.nodes(data=True):
+        name = getattr(attrs.get("data"), "name", None) or str(node_id)
+        if query in name.lower():
+            matches.append(node_id)
+            if len(matches) == limit:
+                break
+    return matches
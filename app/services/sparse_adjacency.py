@@ -0,0 +1,53 @@
+from itertools import chain
+from typing import Dict, List, NamedTuple
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from app.services.graph_version import graph_signature
+
+_GRAPH_ATTR = "sparse_adjacency"
+
+
+class SparseAdjacency(NamedTuple):
+    nodes: List            # Index -> Knoten-ID
+    index: Dict            # Knoten-ID -> Index
+    matrix: csr_matrix     # Zeile = Quelle, Spalte = Ziel einer Kante
+    signature: tuple
+
+
+def sparse_adjacency(graph: nx.DiGraph) -> SparseAdjacency:
+    """
+    Dünnbesetzte Adjazenzmatrix eines Graphen samt Knotenindex. Wird in
+    graph.graph zwischengespeichert und bei Änderung neu aufgebaut (siehe
+    graph_version.graph_signature).
+    """
+    cached = graph.graph.get(_GRAPH_ATTR)
+    signature = graph_signature(graph)
+    if cached is not None and cached.signature == signature:
+        return cached
+
+    nodes = list(graph.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    # CSR direkt aus den Nachfolger-Dicts (gleiche Reihenfolge wie graph.nodes)
+    successors = graph.succ.values()
+    indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, successors), dtype=np.int64, count=len(nodes)), out=indptr[1:])
+    indices = np.fromiter(
+        map(index.__getitem__, chain.from_iterable(successors)), dtype=np.int64, count=int(indptr[-1])
+    )
+    matrix = adjacency_from_csr(indptr, indices)
+    matrix.sort_indices()
+    adjacency = SparseAdjacency(nodes, index, matrix, signature)
+    graph.graph[_GRAPH_ATTR] = adjacency
+    return adjacency
+
+
+def adjacency_from_csr(indptr: np.ndarray, indices: np.ndarray) -> csr_matrix:
+    """Sparse-Adjazenz direkt aus vorhandenen CSR-Arrays (z.B. CompactGraph)."""
+    node_count = len(indptr) - 1
+    return csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.asarray(indices), np.asarray(indptr)),
+        shape=(node_count, node_count),
+    )
@@ -0,0 +1,13 @@
+import os
+import sys
+
+
+def default_cache_dir() -> str:
+    """Plattformüblicher Cache-Ordner des Benutzers."""
+    if sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    elif os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(base, "DataLineage")
@@ -22,6 +22,10 @@ class ArtifactSelectionDialog(QDialog):
         self.artifact_combo.setInsertPolicy(QComboBox.NoInsert)
         self.cte_checkbox = QCheckBox("CTEs mitgenerieren")
         self.cte_checkbox.setChecked(True)
+        self.snapshot_checkbox = QCheckBox("Vorberechneten Lineage-Snapshot nutzen")
+        self.snapshot_checkbox.setChecked(True)
+        # Snapshots gibt es nur für echte Datenquellen (precompute_lineage.py)
+        self.snapshot_checkbox.setEnabled(not data_service.mock_mode)
         self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         self.new_tab_button = self.button_box.addButton("In neuem Tab", QDialogButtonBox.ActionRole)
         self.new_tab = False
@@ -33,6 +37,7 @@ class ArtifactSelectionDialog(QDialog):
         form_layout.addRow(QLabel("3. Artefakt-Typ:"), self.artifact_type_combo)
         form_layout.addRow(QLabel("4. Artefakt:"), self.artifact_combo)
         form_layout.addRow(QLabel("Optionen:"), self.cte_checkbox)
+        form_layout.addRow(QLabel(""), self.snapshot_checkbox)
         main_layout = QVBoxLayout(self)
         main_layout.addLayout(form_layout)
         main_layout.addWidget(self.button_box)
@@ -119,5 +124,6 @@ class ArtifactSelectionDialog(QDialog):
             "artifact_type": self.artifact_type_combo.currentText(),
             "artifact": fully_qualified_artifact,  # Übergibt den korrekten Namen
             "include_ctes": self.cte_checkbox.isChecked(),
+            "use_snapshot": self.snapshot_checkbox.isEnabled() and self.snapshot_checkbox.isChecked(),
             "new_tab": self.new_tab,
         }
\ No newline at end of file
@@ -73,6 +73,7 @@ class ControlsPanel(QWidget):
         self.select_artifact_button.clicked.connect(self.open_artifact_dialog)
         self.search_button.clicked.connect(self.search_node)
         self.search_input.returnPressed.connect(self.search_node)
+        self.search_input.textEdited.connect(self.search_node_as_you_type)
         self.export_button.clicked.connect(self.export_current_graph)
 
         self.main_window.tab_widget.currentChanged.connect(self.connect_highlighting_clear_signal)
@@ -92,6 +93,12 @@ class ControlsPanel(QWidget):
         if hasattr(current_tab, 'controller'):
             current_tab.controller.search_and_highlight_node(search_term)
 
+    def search_node_as_you_type(self, search_term: str):
+        """Hebt Treffer schon während der Eingabe hervor, ohne die Ansicht zu verschieben."""
+        current_tab = self.main_window.tab_widget.currentWidget()
+        if hasattr(current_tab, 'controller'):
+            current_tab.controller.search_and_highlight_node(search_term, zoom=False)
+
     def export_current_graph(self):
         """Öffnet den Export-Vorschau-Dialog für den aktuellen Graphen."""
         current_tab = self.main_window.tab_widget.currentWidget()
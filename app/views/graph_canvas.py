@@ -48,7 +48,7 @@ class GraphCanvas(QGraphicsView):
     Die Zeichenfläche mit Standard-Panning und der Zoom-Logik.
     """
     node_double_clicked = pyqtSignal(object)
-    node_clicked = pyqtSignal(str)
+    node_clicked = pyqtSignal(object)
     highlighting_cleared = pyqtSignal()
 
     BASE_FONT_SIZE = 12
@@ -233,11 +233,15 @@ class GraphCanvas(QGraphicsView):
         node_obj: Node = node_attrs['data']
         info = {"Name": node_obj.name, "ID": node_obj.context, "Typ": node_obj.node_type,
                 "Besitzer": node_obj.owner, "Beschreibung": node_obj.description,
-                "Vorgänger": node_obj.predecessors if node_obj.predecessors else "Keine",
-                "Nachfolger": node_obj.successors if node_obj.successors else "Keine", }
+                "Vorgänger": self._node_names(node_obj.predecessors) or "Keine",
+                "Nachfolger": self._node_names(node_obj.successors) or "Keine", }
         dialog = InfoDialog(info, self)
         dialog.exec_()
 
+    def _node_names(self, node_ids) -> list:
+        """Objektnamen zu Knoten-IDs (der GraphBuilder vergibt ganzzahlige Symbol-IDs)."""
+        return [self.model.graph.nodes[n]['data'].name for n in node_ids]
+
     def toggle_node_faded_state(self, node_id: str):
         """Ändert den 'faded'-Zustand eines Knotens und seiner Kanten."""
         node_item = self.node_items.get(node_id)
@@ -1,10 +1,54 @@
+import logging
+import os
+
+from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 
 from app.models.graph_model import GraphModel
 from app.controllers.graph_controller import GraphController
 from app.views.graph_canvas import GraphCanvas
+from app.services.graph_analysis_service import GraphAnalysisService
 from app.services.layout_service import LayoutService
 
+logger = logging.getLogger(__name__)
+
+
+class LayoutWorker(QThread):
+    """
+    Berechnet das Layout eines Graphen außerhalb des GUI-Threads und baut
+    danach dessen Analyse-Indizes auf. Ergebnisse tragen die Generation des
+    Auftrags, damit überholte Layouts verworfen werden.
+    """
+    finished_signal = pyqtSignal(int, object)  # Generation, Positionen
+
+    # Hält laufende Worker am Leben, auch wenn ihr Tab vorher geschlossen wird
+    _running = set()
+
+    def __init__(self, layout_service: LayoutService, graph, generation: int):
+        super().__init__()
+        self.layout_service = layout_service
+        self.graph = graph
+        self.generation = generation
+        LayoutWorker._running.add(self)
+        self.finished.connect(lambda: LayoutWorker._running.discard(self))
+
+    def run(self):
+        try:
+            pos = self.layout_service.calculate_layout(self.graph, cancelled=self.isInterruptionRequested)
+        except Exception as e:
+            # Z.B. BrokenProcessPool; leeres Ergebnis lässt den Canvas den Fehler anzeigen
+            logger.error(f"Layout-Berechnung fehlgeschlagen: {e}", exc_info=True)
+            pos = {}
+        if self.isInterruptionRequested():
+            return
+        self.finished_signal.emit(self.generation, pos)
+
+        # Indizes (Vorgänger-Hervorhebung, Suche) hier statt bei der ersten Anfrage im GUI-Thread
+        try:
+            GraphAnalysisService(self.graph).prepare_indexes()
+        except Exception as e:
+            logger.error(f"Aufbau der Graph-Indizes fehlgeschlagen: {e}", exc_info=True)
+
 
 class GraphTab(QWidget):
     """
@@ -17,11 +61,13 @@ class GraphTab(QWidget):
 
         # Jeder Tab besitzt eigene Komponenten
         self.model = GraphModel()
-        self.layout_service = LayoutService()
+        self.layout_service = LayoutService(workers=os.cpu_count() or 1)
         self.canvas = GraphCanvas(self.model)
         # Der Controller benötigt eine Referenz auf den Canvas, um die Hervorhebung zu steuern
         self.controller = GraphController(self.model, self.canvas)
         self.pos = None  # Initialisierung für die Layout-Positionen
+        self._layout_worker = None
+        self._layout_generation = 0
 
         # Layout für den Tab
         layout = QVBoxLayout(self)
@@ -31,16 +77,39 @@ class GraphTab(QWidget):
         # Verbindungen innerhalb des Tabs
         self.model.model_updated.connect(self.draw_graph)
         self.model.error_occurred.connect(self.canvas.show_error_message)
+        self.controller.loading_started.connect(self.cancel_layout)
         self.canvas.node_clicked.connect(self.controller.highlight_predecessors)
 
     def draw_graph(self):
-        """Zeichnet den Graphen für diesen spezifischen Tab."""
+        """
+        Zeichnet den Graphen für diesen spezifischen Tab. Das Layout entsteht in
+        einem LayoutWorker; bis dahin zeigt der Canvas einen Fortschrittshinweis.
+        """
+        self.cancel_layout()
         if not self.model.graph.nodes:
             self.canvas.clear_scene()
             return
 
-        # Die Positionen werden berechnet und für den Export zwischengespeichert
-        self.pos = self.layout_service.calculate_layout(self.model.graph)
+        graph = self.model.graph
+        self.canvas.show_loading_message(f"Berechne Layout für {graph.number_of_nodes()} Knoten...")
+        self._layout_worker = LayoutWorker(self.layout_service, graph, self._layout_generation)
+        self._layout_worker.finished_signal.connect(self.on_layout_finished)
+        self._layout_worker.start()
+
+    def cancel_layout(self):
+        """Verwirft ein laufendes Layout, z.B. wenn ein neuerer Ladevorgang es überholt."""
+        self._layout_generation += 1
+        self.pos = None
+        if self._layout_worker is not None:
+            self._layout_worker.requestInterruption()
+            self._layout_worker = None
+
+    def on_layout_finished(self, generation: int, pos: dict):
+        if generation != self._layout_generation:
+            return  # Überholt
+        self._layout_worker = None
+        # Die Positionen werden für den Export zwischengespeichert
+        self.pos = pos
         self.canvas.draw_graph(self.model.graph, self.pos)
 
     def get_graph_data_for_export(self):
@@ -0,0 +1,74 @@
+"""
+Benchmark: Öffnen eines Warehouse-Graphen aus dem kompakten Binärformat
+(Memory-Mapping) im Vergleich zu Pickle eines networkx-Graphen mit Node-Objekten.
+
+Aufruf: python -m benchmarks.bench_compact_graph [anzahl_knoten] [kanten_pro_knoten]
+"""
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+import networkx as nx
+
+from app.models.node import Node
+from app.services.data_lineage.compact_graph import CompactGraph
+
+
+def synthetic_lineage(node_count: int, fan_in: int, seed: int = 42) -> nx.DiGraph:
+    """Geschichteter DAG: jedes Objekt liest aus `fan_in` älteren Objekten."""
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    for i in range(node_count):
+        name = f"SCHEMA_{i % 40}.OBJ_{i}"
+        node_id = name.replace(".", "_")
+        graph.add_node(node_id, data=Node(id=node_id, name=name, node_type="VIEW" if i % 3 else "TABLE"))
+    ids = list(graph.nodes)
+    for i in range(1, node_count):
+        for _ in range(fan_in):
+            graph.add_edge(ids[rng.randrange(i)], ids[i])
+    return graph
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    fan_in = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    graph = synthetic_lineage(node_count, fan_in)
+    print(f"Graph: {graph.number_of_nodes()} Knoten, {graph.number_of_edges()} Kanten")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, "graph.pickle")
+        start = time.perf_counter()
+        with open(pickle_path, "wb") as fh:
+            pickle.dump(graph, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        print(f"pickle schreiben:   {time.perf_counter() - start:7.3f}s  "
+              f"{os.path.getsize(pickle_path) / 1e6:7.1f} MB")
+        start = time.perf_counter()
+        with open(pickle_path, "rb") as fh:
+            pickle.load(fh)
+        print(f"pickle laden:       {time.perf_counter() - start:7.3f}s")
+
+        compact_path = os.path.join(tmp, "graph")
+        start = time.perf_counter()
+        CompactGraph.from_networkx(graph).save(compact_path)
+        size = sum(os.path.getsize(os.path.join(compact_path, f)) for f in os.listdir(compact_path))
+        print(f"compact schreiben:  {time.perf_counter() - start:7.3f}s  {size / 1e6:7.1f} MB")
+
+        start = time.perf_counter()
+        compact = CompactGraph.load(compact_path)
+        print(f"compact laden/mmap: {time.perf_counter() - start:7.3f}s")
+
+        start = time.perf_counter()
+        for i in range(0, node_count, max(1, node_count // 1000)):
+            compact.index_of(f"SCHEMA_{i % 40}_OBJ_{i}")
+        print(f"1000 ID-Lookups:    {time.perf_counter() - start:7.3f}s")
+
+        start = time.perf_counter()
+        compact.to_networkx()
+        print(f"nach nx.DiGraph:    {time.perf_counter() - start:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: Layout eines Graphen aus mehreren Komponenten – erstes Layout
+seriell vs. im Prozess-Pool sowie erneutes Layout, nachdem sich eine
+Komponente geändert hat (die übrigen kommen aus dem Cache). Ohne Graphviz
+wird das interne Ebenen-Layout genutzt.
+
+Aufruf: python -m benchmarks.bench_component_layout [komponenten] [knoten_je_komponente] [workers]
+"""
+import logging
+import os
+import sys
+import time
+
+import networkx as nx
+
+from app.models.node import Node
+from app.services.layout_cache import LayoutCache
+from app.services.layout_service import LayoutService
+from benchmarks.bench_reachability import deep_lineage
+
+
+def multi_component_lineage(components: int, size: int) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    for c in range(components):
+        part = deep_lineage(size, seed=c)
+        graph.add_nodes_from(c * size + n for n in part.nodes)
+        graph.add_edges_from((c * size + u, c * size + v) for u, v in part.edges)
+    for n in graph.nodes:
+        graph.nodes[n]["data"] = Node(id=n, name=f"DWH.OBJ_{n}", node_type="VIEW")
+    return graph
+
+
+def timed(service: LayoutService, graph: nx.DiGraph) -> float:
+    start = time.perf_counter()
+    service.calculate_layout(graph)
+    return time.perf_counter() - start
+
+
+def main():
+    logging.disable(logging.WARNING)  # Fallback-Hinweise je Stapel ausblenden
+    components = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 2_500
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    graph = multi_component_lineage(components, size)
+    print(f"Graph: {components} Komponenten, {graph.number_of_nodes()} Knoten, {graph.number_of_edges()} Kanten")
+
+    # Wie bisher: ein Layout über den ganzen Graphen
+    start = time.perf_counter()
+    LayoutService(cache=LayoutCache())._layout_graph(graph)
+    print(f"Ganzer Graph in einem Lauf:      {time.perf_counter() - start:.2f}s")
+
+    serial = LayoutService(cache=LayoutCache())
+    print(f"Je Komponente, seriell:          {timed(serial, graph):.2f}s")
+
+    parallel = LayoutService(cache=LayoutCache(), workers=workers)
+    timed(parallel, multi_component_lineage(2, 60))  # Pool-Prozesse starten
+    print(f"Je Komponente, {workers} Prozesse:      {timed(parallel, graph):.2f}s")
+
+    graph.add_edge(0, size - 1)  # Eine Komponente ändert sich
+    print(f"Nach Änderung einer Komponente:  {timed(serial, graph):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
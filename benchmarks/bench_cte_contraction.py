@@ -0,0 +1,63 @@
+"""
+Benchmark: CTE-freie Sicht eines synthetischen Lineage-Graphen – ein
+Kontraktionsdurchlauf über die dünn besetzte Adjazenz vs. dem früheren
+Entfernen Knoten für Knoten (auf einer Kopie), sowie erneutes Umschalten.
+
+Aufruf: python -m benchmarks.bench_cte_contraction [anzahl_knoten] [cte_anteil]
+"""
+import random
+import sys
+import time
+
+import networkx as nx
+
+from app.models.node import Node
+from app.services.cte_contraction import cte_view
+from benchmarks.bench_reachability import synthetic_lineage
+
+
+def lineage_with_ctes(node_count: int, cte_share: float) -> nx.DiGraph:
+    graph = synthetic_lineage(node_count)
+    rng = random.Random(7)
+    for n in graph.nodes:
+        node_type = "CTE" if rng.random() < cte_share else "VIEW"
+        graph.nodes[n]["data"] = Node(id=n, name=f"OBJ_{n}", node_type=node_type).bind(graph)
+    return graph
+
+
+def prune_iteratively(graph: nx.DiGraph) -> nx.DiGraph:
+    """Frühere Variante aus DataLineageService._prune_cte_nodes."""
+    graph = graph.copy()
+    for cte in [n for n, d in graph.nodes(data=True) if d["data"].node_type == "CTE"]:
+        preds, succs = list(graph.predecessors(cte)), list(graph.successors(cte))
+        for p in preds:
+            for s in succs:
+                if p != s and not graph.has_edge(p, s):
+                    graph.add_edge(p, s)
+        graph.remove_node(cte)
+    return graph
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    cte_share = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    graph = lineage_with_ctes(node_count, cte_share)
+    print(f"Graph: {graph.number_of_nodes()} Knoten, {graph.number_of_edges()} Kanten, {cte_share:.0%} CTEs")
+
+    start = time.perf_counter()
+    legacy = prune_iteratively(graph)
+    print(f"Knoten für Knoten (Kopie + Umbau): {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    contracted = cte_view(graph, include_ctes=False)
+    print(f"Kontraktion in einem Durchlauf:    {time.perf_counter() - start:.2f}s")
+    assert set(contracted.edges) == set(legacy.edges)
+
+    start = time.perf_counter()
+    for include_ctes in (True, False) * 50:
+        cte_view(contracted, include_ctes)
+    print(f"Umschalten (zwischengespeichert):  {(time.perf_counter() - start) * 1e6 / 100:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: Python-seitiger Aufwand eines dot-Layouts – früherer Weg über
+pydot (networkx.nx_pydot.graphviz_layout: Objektgraph, DOT-Text, Parsen der
+-Tdot-Ausgabe) vs. minimalem DOT und Parsen von -Tplain. Die Laufzeit von dot
+selbst ist nicht enthalten: beide Wege bekommen eine vorab erzeugte Ausgabe.
+
+Aufruf: python -m benchmarks.bench_graphviz_layout [anzahl_knoten]
+"""
+import random
+import sys
+import time
+
+from app.models.node import Node
+from app.services.graphviz_layout import parse_plain, to_dot
+from benchmarks.bench_reachability import synthetic_lineage
+
+
+def main():
+    try:
+        import pydot
+        from networkx.drawing.nx_pydot import graphviz_layout as pydot_graphviz_layout, to_pydot
+    except ImportError:
+        print("pydot ist nicht installiert; Vergleich nicht möglich.")
+        return
+
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    graph = synthetic_lineage(node_count)
+    for n in graph.nodes:
+        graph.nodes[n]["data"] = Node(id=n, name=f"DWH.OBJ_{n}", node_type="VIEW")
+    print(f"Graph: {graph.number_of_nodes()} Knoten, {graph.number_of_edges()} Kanten")
+
+    rng = random.Random(7)
+    coords = {n: (rng.uniform(0, 100), rng.uniform(0, 100)) for n in graph.nodes}
+
+    # Ausgabe von dot -Tdot: der Eingabegraph mit pos-Attributen (in Punkten)
+    annotated = to_pydot(graph)
+    for node in annotated.get_nodes():
+        x, y = coords[int(node.get_name())]
+        node.set_pos(f'"{x * 72},{y * 72}"')
+    dot_output = annotated.to_string().encode("utf-8")
+    original_create = pydot.Dot.create
+    pydot.Dot.create = lambda self, prog=None, format=None, **kwargs: dot_output
+    try:
+        start = time.perf_counter()
+        legacy = pydot_graphviz_layout(graph, prog="dot")
+        print(f"pydot (ohne dot):        {time.perf_counter() - start:.2f}s")
+    finally:
+        pydot.Dot.create = original_create
+
+    # Ausgabe von dot -Tplain: eine Zeile je Knoten (in Zoll)
+    start = time.perf_counter()
+    dot_text, nodes = to_dot(graph)
+    dot_text.encode("utf-8")
+    plain_output = "graph 1 100 100\n" + "".join(
+        f'node n{i} {coords[n][0]} {coords[n][1]} 1 0.5 "x" solid ellipse black lightgrey\n'
+        for i, n in enumerate(nodes)
+    ) + "stop\n"
+    write_time = time.perf_counter() - start
+    start = time.perf_counter()
+    pos = parse_plain(plain_output, nodes)
+    print(f"Minimales DOT + -Tplain: {write_time + time.perf_counter() - start:.2f}s")
+    assert all(abs(pos[n][0] - legacy[n][0]) < 1e-6 for n in graph.nodes)
+
+
+if __name__ == "__main__":
+    main()
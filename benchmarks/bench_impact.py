@@ -0,0 +1,39 @@
+"""
+Benchmark: Batch-Auswirkungsanalyse (Sparse-Multi-Source-BFS) vs. je eine
+nx.descendants-Traversierung pro geändertem Objekt.
+
+Aufruf: python -m benchmarks.bench_impact [knoten] [quellen]
+"""
+import sys
+import time
+
+import networkx as nx
+
+from app.services.graph_analysis_service import GraphAnalysisService
+from benchmarks.bench_reachability import deep_lineage, synthetic_lineage
+
+
+def run(label: str, graph: nx.DiGraph, source_count: int):
+    sources = list(graph.nodes)[:source_count]  # erste Schicht = Staging
+    endpoints = {n for n in graph if graph.out_degree(n) == 0}
+    print(f"\n{label}: {graph.number_of_nodes()} Knoten, {graph.number_of_edges()} Kanten, {len(sources)} Quellen")
+
+    start = time.perf_counter()
+    expected = {s: nx.descendants(graph, s) & endpoints for s in sources}
+    print(f"  nx.descendants je Quelle: {time.perf_counter() - start:7.3f}s")
+
+    start = time.perf_counter()
+    impact = GraphAnalysisService(graph).batch_impact(sources)
+    print(f"  batch_impact:             {time.perf_counter() - start:7.3f}s")
+    assert {s: set(targets) for s, targets in impact.items()} == expected
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    source_count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    run("geschichtet", synthetic_lineage(node_count), source_count)
+    run("tief", deep_lineage(node_count // 10), source_count)
+
+
+if __name__ == "__main__":
+    main()
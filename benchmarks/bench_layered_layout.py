@@ -0,0 +1,32 @@
+"""
+Benchmark: internes Ebenen-Layout auf synthetischen Lineage-Graphen
+("geschichtet" und "tief", siehe bench_reachability) vs. dem früheren
+Fallback nx.spring_layout (nur bis 1.000 Knoten, da quadratisch je Iteration).
+
+Aufruf: python -m benchmarks.bench_layered_layout [knoten ...]
+"""
+import sys
+import time
+
+import networkx as nx
+
+from app.services.layered_layout import layered_layout
+from benchmarks.bench_reachability import deep_lineage, synthetic_lineage
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 5_000, 20_000]
+    for node_count in sizes:
+        for label, graph in (("geschichtet", synthetic_lineage(node_count)), ("tief", deep_lineage(node_count))):
+            start = time.perf_counter()
+            layered_layout(graph)
+            line = f"{label:12} {graph.number_of_nodes():>7} Knoten: Ebenen-Layout {time.perf_counter() - start:.3f}s"
+            if node_count <= 1_000:
+                start = time.perf_counter()
+                nx.spring_layout(graph, iterations=100, seed=42)
+                line += f", Spring-Layout {time.perf_counter() - start:.2f}s"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: Layout-Cache – Fehlgriff (Fingerabdruck, Komponenten, Ablage) sowie
+Treffer aus Speicher bzw. Platte. Statt dot liefert eine vorab berechnete
+Zufallsanordnung die Positionen, damit der Lauf ohne Graphviz auskommt; zum Vergleich
+wird das interne Ebenen-Layout (Fallback) gemessen.
+
+Aufruf: python -m benchmarks.bench_layout_cache [anzahl_knoten]
+"""
+import random
+import sys
+import tempfile
+import time
+
+from app.models.node import Node
+from app.services.layered_layout import layered_layout
+from app.services.layout_cache import LayoutCache
+from app.services.layout_service import LayoutService
+from benchmarks.bench_reachability import synthetic_lineage
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    graph = synthetic_lineage(node_count)
+    for n in graph.nodes:
+        graph.nodes[n]["data"] = Node(id=n, name=f"DWH.OBJ_{n}", node_type="VIEW")
+    print(f"Graph: {graph.number_of_nodes()} Knoten, {graph.number_of_edges()} Kanten")
+
+    start = time.perf_counter()
+    layered_layout(graph)
+    print(f"Ebenen-Layout (Fallback): {time.perf_counter() - start:.3f}s")
+
+    rng = random.Random(7)
+    placement = [(rng.uniform(0, 1e4), rng.uniform(0, 1e4)) for _ in range(node_count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = LayoutService(cache=LayoutCache(directory=directory))
+        service._hierarchical_layout = lambda g, cancelled: dict(zip(g, placement))
+        start = time.perf_counter()
+        service.calculate_layout(graph)
+        print(f"Fehlgriff (ohne Layout):  {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        service.calculate_layout(graph)
+        print(f"Treffer im Speicher:      {time.perf_counter() - start:.3f}s")
+
+        # Neuer Prozess: nur die Plattenstufe ist gefüllt
+        service = LayoutService(cache=LayoutCache(directory=directory))
+        service._hierarchical_layout = None  # darf nicht aufgerufen werden
+        start = time.perf_counter()
+        hit = service.calculate_layout(graph)
+        print(f"Treffer auf der Platte:   {time.perf_counter() - start:.3f}s ({len(hit)} Positionen)")
+
+
+if __name__ == "__main__":
+    main()
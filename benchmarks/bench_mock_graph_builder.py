@@ -0,0 +1,63 @@
+"""
+Benchmark: MockGraphBuilder auf einem synthetischen `dependencies`-Dict mit
+50k Knoten – Namenssuche über den Index vs. der frühere lineare Suchlauf je
+Knoten, sowie Cache-Treffer (schreibgeschützte Sichten).
+
+Aufruf: python -m benchmarks.bench_mock_graph_builder [anzahl_knoten] [artefakte]
+"""
+import random
+import sys
+import time
+
+from app.services.mock_graph_builder import MockGraphBuilder
+from benchmarks.bench_reachability import synthetic_lineage
+
+SCHEMAS = ["STAGING", "DWH_CORE", "DWH_MART", "REPORTING"]
+
+
+def synthetic_dependencies(node_count: int) -> dict:
+    """Lineage-Graph als dependencies-Dict: Objekt -> Liste seiner Quellen."""
+    graph = synthetic_lineage(node_count)
+    name = {n: f"{SCHEMAS[n * len(SCHEMAS) // node_count]}.V_OBJ_{n}" for n in graph.nodes}
+    return {name[n]: [name[p] for p in graph.predecessors(n)] for n in graph.nodes if graph.in_degree(n)}
+
+
+def legacy_name_lookup(builder: MockGraphBuilder, all_nodes: set, graph) -> None:
+    """Frühere Variante: für jeden Knoten ein Regex-Lauf über alle Namen."""
+    for clean_id in graph.nodes():
+        next((n for n in all_nodes if builder._sanitize_id(n) == clean_id), clean_id)
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    artifact_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    dependencies = synthetic_dependencies(node_count)
+    all_nodes = set(dependencies) | {s for sources in dependencies.values() for s in sources}
+    artifacts = random.Random(7).sample(sorted(dependencies), artifact_count)
+
+    start = time.perf_counter()
+    builder = MockGraphBuilder(dependencies)
+    print(f"Aufbau Gesamtgraph + Index ({len(all_nodes)} Knoten): {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    graphs = [builder.build_graph({"artifact": a}) for a in artifacts]
+    elapsed = time.perf_counter() - start
+    nodes = sum(g.number_of_nodes() for g in graphs)
+    print(f"{artifact_count} Ausschnitte ({nodes} Knoten): {elapsed * 1e3 / artifact_count:.2f} ms je Artefakt")
+
+    start = time.perf_counter()
+    for a in artifacts:
+        builder.build_graph({"artifact": a})
+    print(f"Cache-Treffer: {(time.perf_counter() - start) * 1e6 / artifact_count:.1f} µs je Artefakt")
+
+    sample = graphs[:3]
+    start = time.perf_counter()
+    for g in sample:
+        legacy_name_lookup(builder, all_nodes, g)
+    legacy = (time.perf_counter() - start) / sum(g.number_of_nodes() for g in sample)
+    print(f"Frühere Namenssuche: {legacy * 1e3:.1f} ms je Knoten "
+          f"(≈ {legacy * nodes / artifact_count:.1f}s je Artefakt)")
+
+
+if __name__ == "__main__":
+    main()
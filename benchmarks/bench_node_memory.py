@@ -0,0 +1,88 @@
+"""
+Benchmark: Speicherbedarf je Knoten – frühere Node-Dataclass mit kopierten
+Vorgänger-/Nachfolgerlisten vs. geslotteter Node mit Adjazenz-Sichten.
+Gemessen mit tracemalloc über den kompletten Graphen (networkx + Node-Objekte).
+
+Aufruf: python -m benchmarks.bench_node_memory [anzahl_knoten]
+"""
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import networkx as nx
+
+from app.models.node import Node
+from benchmarks.bench_reachability import synthetic_lineage
+
+
+@dataclass
+class LegacyNode:
+    """Frühere Node-Dataclass (mit __dict__ und kopierten Listen)."""
+    id: str
+    name: str
+    node_type: str
+    context: Optional[str] = "Nicht spezifiziert"
+    description: Optional[str] = "Keine Beschreibung verfügbar."
+    owner: Optional[str] = "Unbekannt"
+    predecessors: List[str] = field(default_factory=list)
+    successors: List[str] = field(default_factory=list)
+
+
+def node_names(node_count: int) -> list:
+    # Namen werden wie aus einem DB-Cursor neu erzeugt (nicht vorab interniert)
+    return ["".join(["SCHEMA_", str(i % 40), ".OBJ_", str(i)]) for i in range(node_count)]
+
+
+def build(topology: nx.DiGraph, names: list, legacy: Optional[bool]) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    ids = [name.replace(".", "_") for name in names]
+    graph.add_nodes_from(ids)
+    graph.add_edges_from((ids[u], ids[v]) for u, v in topology.edges())
+    if legacy is None:
+        return graph
+    for i, node_id in enumerate(ids):
+        node_type = "".join(["VI", "EW"])
+        if legacy:
+            graph.nodes[node_id]['data'] = LegacyNode(
+                id=node_id, name=names[i], node_type=node_type, context=names[i],
+                predecessors=list(graph.predecessors(node_id)),
+                successors=list(graph.successors(node_id)),
+            )
+        else:
+            graph.nodes[node_id]['data'] = Node(
+                id=node_id, name=names[i], node_type=node_type, context=names[i]
+            ).bind(graph)
+    return graph
+
+
+def measure(topology: nx.DiGraph, legacy: Optional[bool]) -> float:
+    names = node_names(topology.number_of_nodes())
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    graph = build(topology, names, legacy)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del graph
+    return used / topology.number_of_nodes()
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    topology = synthetic_lineage(node_count)
+    print(f"{topology.number_of_nodes()} Knoten, {topology.number_of_edges()} Kanten")
+    base = measure(topology, legacy=None)
+    legacy = measure(topology, legacy=True)
+    slotted = measure(topology, legacy=False)
+    print(f"nur networkx:       {base:7.0f} Bytes je Knoten")
+    print(f"Dataclass + Listen: {legacy:7.0f} Bytes je Knoten gesamt, {legacy - base:5.0f} für Node-Daten")
+    print(f"Slots + Sichten:    {slotted:7.0f} Bytes je Knoten gesamt, {slotted - base:5.0f} für Node-Daten")
+    print(f"Node-Objekt allein: {sys.getsizeof(LegacyNode('a', 'b', 'c')) + sys.getsizeof(LegacyNode('a', 'b', 'c').__dict__)}"
+          f" -> {sys.getsizeof(Node('a', 'b', 'c'))} Bytes")
+
+
+if __name__ == "__main__":
+    main()
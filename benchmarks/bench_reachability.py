@@ -0,0 +1,95 @@
+"""
+Benchmark: ReachabilityIndex vs. nx.ancestors/nx.descendants auf
+synthetischen Lineage-Graphen mit 10k und 100k Knoten.
+
+"geschichtet": Staging -> Core -> Marts -> Reports, nach Fachbereichen
+gruppiert; ein kleiner Anteil der Kanten kreuzt Fachbereiche.
+"tief": jedes Objekt liest aus Objekten kurz davor, dadurch sehr lange Ketten
+und Vorfahrenmengen mit zehntausenden Knoten (ungünstig für Intervalle).
+
+Aufruf: python -m benchmarks.bench_reachability [knoten ...]
+"""
+import random
+import sys
+import time
+
+import networkx as nx
+
+from app.services.reachability_index import ReachabilityIndex
+
+LAYERS = 8
+AREA_SIZE = 250
+CROSS_AREA_RATE = 0.05
+
+
+def synthetic_lineage(node_count: int, fan_in: int = 3, seed: int = 42) -> nx.DiGraph:
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    areas = max(1, node_count // AREA_SIZE)
+    per_layer = node_count // LAYERS
+    layers = [list(range(layer * per_layer, (layer + 1) * per_layer)) for layer in range(LAYERS)]
+    graph.add_nodes_from(range(LAYERS * per_layer))
+    for layer in range(1, LAYERS):
+        previous = layers[layer - 1]
+        by_area = {}
+        for node in previous:
+            by_area.setdefault(node % areas, []).append(node)
+        for node in layers[layer]:
+            for _ in range(rng.randint(1, fan_in)):
+                pool = previous if rng.random() < CROSS_AREA_RATE else by_area[node % areas]
+                graph.add_edge(rng.choice(pool), node)
+    return graph
+
+
+def deep_lineage(node_count: int, fan_in: int = 3, window: int = 500, seed: int = 42) -> nx.DiGraph:
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(node_count))
+    for node in range(1, node_count):
+        for _ in range(fan_in):
+            graph.add_edge(rng.randrange(max(0, node - window), node), node)
+    return graph
+
+
+def run(label: str, graph: nx.DiGraph, queries: int = 200):
+    rng = random.Random(1)
+    sample = rng.sample(list(graph.nodes), queries)
+    pairs = [(rng.choice(sample), rng.choice(sample)) for _ in range(queries)]
+    print(f"\n{label}: {graph.number_of_nodes()} Knoten, {graph.number_of_edges()} Kanten")
+
+    start = time.perf_counter()
+    index = ReachabilityIndex(graph)
+    print(f"  Index-Aufbau:          {time.perf_counter() - start:8.3f}s  "
+          f"({index._descendants.interval_count + index._ancestors.interval_count} Intervalle)")
+
+    start = time.perf_counter()
+    nx_sets = [(nx.ancestors(graph, n), nx.descendants(graph, n)) for n in sample]
+    nx_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index_sets = [(index.ancestors(n), index.descendants(n)) for n in sample]
+    index_time = time.perf_counter() - start
+    assert nx_sets == index_sets
+    print(f"  Vorfahren+Nachfahren:  nx {nx_time / queries * 1e3:7.3f} ms  "
+          f"Index {index_time / queries * 1e3:7.3f} ms  (je Knoten)")
+
+    start = time.perf_counter()
+    nx_answers = [u in nx.ancestors(graph, v) for u, v in pairs]
+    nx_time = time.perf_counter() - start
+    start = time.perf_counter()
+    index_answers = [index.is_upstream(u, v) for u, v in pairs]
+    index_time = time.perf_counter() - start
+    assert nx_answers == index_answers
+    print(f"  X stromaufwärts von Y: nx {nx_time / queries * 1e3:7.3f} ms  "
+          f"Index {index_time / queries * 1e6:7.1f} µs  (je Abfrage)")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run("geschichtet", synthetic_lineage(size))
+    for size in sizes:
+        run("tief", deep_lineage(size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: Knotensuche auf einem synthetischen Graphen mit 100k Knoten –
+Trigramm-Index (beste Treffer nach Relevanz) vs. dem früheren linearen
+Suchlauf (nur erster Treffer) und einem linearen Suchlauf über alle Treffer,
+für Anfragen wie bei der Eingabe Zeichen für Zeichen.
+
+Aufruf: python -m benchmarks.bench_search_index [anzahl_knoten]
+"""
+import random
+import string
+import sys
+import time
+
+import networkx as nx
+
+from app.models.node import Node
+from app.services.search_index import SearchIndex
+
+SCHEMAS = ["STAGING", "DWH_CORE", "DWH_MART", "REPORTING"]
+PREFIXES = ["V_", "T_", "ELT_"]
+
+
+def synthetic_graph(node_count: int) -> nx.DiGraph:
+    rng = random.Random(7)
+    graph = nx.DiGraph()
+    for n in range(node_count):
+        word = "".join(rng.choices(string.ascii_uppercase + "_", k=rng.randint(6, 20)))
+        name = f"{rng.choice(SCHEMAS)}.{rng.choice(PREFIXES)}{word}_{n}"
+        graph.add_node(n, data=Node(id=n, name=name, node_type="VIEW"))
+    return graph
+
+
+def linear_first_match(graph: nx.DiGraph, query: str):
+    """Frühere Variante aus GraphController/GraphAnalysisService."""
+    return next((n for n, attrs in graph.nodes(data=True) if query.lower() in attrs["data"].name.lower()), None)
+
+
+def linear_all_matches(graph: nx.DiGraph, query: str):
+    """Alle Treffer per linearem Suchlauf, zum fairen Vergleich mit dem Index."""
+    return [n for n, attrs in graph.nodes(data=True) if query.lower() in attrs["data"].name.lower()]
+
+
+def _time(func, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    graph = synthetic_graph(node_count)
+    target = graph.nodes[node_count // 2]["data"].name
+
+    start = time.perf_counter()
+    index = SearchIndex.for_graph(graph)
+    print(f"Aufbau Index ({node_count} Knoten): {time.perf_counter() - start:.2f}s")
+
+    print(f"{'Anfrage':<40} {'Index (Top 50)':>15} {'linear, 1. Treffer':>19} {'linear, alle':>13}")
+    queries = [target[:i] for i in (1, 2, 3, 6, 10)] + [target, "_", "zzzq"]
+    for query in queries:
+        indexed = _time(lambda: index.search(query))
+        first = _time(lambda: linear_first_match(graph, query), repeat=3)
+        linear = _time(lambda: linear_all_matches(graph, query), repeat=3)
+        print(f"{query:<40} {indexed * 1e3:>12.2f} ms {first * 1e3:>16.2f} ms {linear * 1e3:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
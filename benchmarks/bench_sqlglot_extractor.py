@@ -0,0 +1,36 @@
+"""
+Benchmark: Parse- und Extraktionszeit von sqlglot (Exasol-Dialekt) im
+Vergleich zum sqlparse-Pfad, jeweils kalt und mit warmem AST-Cache.
+
+Aufruf: python -m benchmarks.bench_sqlglot_extractor [anzahl_statements]
+"""
+import sys
+import time
+
+from app.services.data_lineage.sqlglot_extractor import SqlglotDependencyExtractor, SqlglotParser
+from benchmarks.bench_fast_extractor import full_extract
+from benchmarks.bench_parse_pool import synthetic_views
+
+
+def timed(label: str, func, statements: list):
+    start = time.perf_counter()
+    for sql in statements:
+        func(sql)
+    seconds = time.perf_counter() - start
+    print(f"{label:>22}: {seconds * 1000 / len(statements):7.2f} ms/Statement")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    statements = list(synthetic_views(count).values())
+    extractor = SqlglotDependencyExtractor(parser=SqlglotParser(max_cached=count))
+
+    timed("sqlparse (gesamt)", full_extract, statements)
+    timed("sqlglot (gesamt, kalt)", extractor.extract, statements)
+    timed("sqlglot parse (kalt)", SqlglotParser(max_cached=0).parse, statements)
+    timed("sqlglot parse (Cache)", extractor.parser.parse, statements)
+    print(f"Parse-Fehler: {extractor.errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from app.views.main_window import MainWindow
 
@@ -70,4 +71,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # Nötig für Prozess-Pools (SQL-Analyse, Layout) in der gebauten App
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
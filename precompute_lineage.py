@@ -0,0 +1,83 @@
+"""
+Headless-Batchlauf: Berechnet die Lineage eines ganzen Warehouses einmalig
+vor und schreibt sie als versionierten Snapshot. Die Anwendung beantwortet
+danach jedes Artefakt aus diesem Snapshot, ohne live zu crawlen.
+
+Aufruf:
+    python precompute_lineage.py PROD_DATABASE [--schemas DWH REPORTING] [--workers 4]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+from app.config import load_database_connections
+from app.services.data_lineage import (
+    DataLineageConfig,
+    DataLineageService,
+    LineageSnapshot,
+    default_snapshot_path,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Vorberechnung der Warehouse-Lineage")
+    parser.add_argument("data_sources", nargs="+", help="Datenquellen aus der .env, z.B. PROD_DATABASE")
+    parser.add_argument("--schemas", nargs="*", help="Nur diese Schemas analysieren (Standard: alle)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Parser-Prozesse")
+    parser.add_argument("--extractor", default="fast", choices=["fast", "sqlglot", "sqlparse"])
+    parser.add_argument("--output", help="Zielpfad (nur bei genau einer Datenquelle)")
+    return parser.parse_args(argv)
+
+
+def precompute(data_source: str, connection, args) -> LineageSnapshot:
+    config = DataLineageConfig(
+        mock_mode=False,
+        extractor=args.extractor,
+        prefetch_catalog=True,
+        parse_workers=args.workers if args.workers > 1 else 0,
+        resolve_objects=True,
+    )
+    service = DataLineageService(config=config, connection=connection)
+    graph = service.build_warehouse_graph(args.schemas)
+    return LineageSnapshot.from_lineage_graph(graph, data_source=data_source)
+
+
+def main(argv=None) -> int:
+    import pyexasol
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = parse_args(argv)
+    if args.output and len(args.data_sources) > 1:
+        logging.error("--output ist nur mit genau einer Datenquelle möglich.")
+        return 2
+
+    connections = load_database_connections()
+    exit_code = 0
+    for data_source in args.data_sources:
+        conn_data = connections.get(data_source)
+        if not conn_data:
+            logging.error(f"Datenquelle {data_source} ist nicht konfiguriert.")
+            exit_code = 1
+            continue
+
+        start = time.perf_counter()
+        connection = pyexasol.connect(
+            dsn=f"{conn_data['host']}:{conn_data['port']}",
+            user=conn_data['user'],
+            password=conn_data['password']
+        )
+        try:
+            snapshot = precompute(data_source, connection, args)
+        finally:
+            connection.close()
+
+        path = args.output or default_snapshot_path(data_source)
+        snapshot.save(path)
+        logging.info(f"{data_source}: {len(snapshot)} Knoten in {time.perf_counter() - start:.1f}s berechnet.")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import pickle
+import sys
+
+import networkx as nx
+import pytest
+
+from app.models.node import Node
+
+
+def _bound_graph():
+    graph = nx.DiGraph([("DWH_T_SALES", "DWH_V_AGG"), ("DWH_T_CUSTOMER", "DWH_V_AGG")])
+    for node_id in list(graph.nodes):
+        graph.nodes[node_id]["data"] = Node(id=node_id, name=node_id, node_type="TABLE").bind(graph)
+    return graph
+
+
+def test_neighbors_are_views_on_the_graph():
+    graph = _bound_graph()
+    node = graph.nodes["DWH_V_AGG"]["data"]
+
+    assert set(node.predecessors) == {"DWH_T_SALES", "DWH_T_CUSTOMER"}
+    assert not node.successors
+
+    graph.add_edge("DWH_V_AGG", "REPORTING_V_REPORT")
+    assert "REPORTING_V_REPORT" in node.successors
+
+    graph.remove_node("DWH_V_AGG")
+    assert list(node.predecessors) == []
+
+
+def test_unbound_node_keeps_explicit_neighbors():
+    node = Node(id="A", name="A", node_type="VIEW", predecessors=["B"])
+
+    assert list(node.predecessors) == ["B"]
+    assert list(node.successors) == []
+
+
+def test_slots_interning_and_pickle():
+    name = "".join(["DWH.", "V_SALES"])
+    node = Node(id="DWH_V_SALES", name=name, node_type="VIEW")
+
+    with pytest.raises(AttributeError):
+        node.extra = 1
+    assert node.name is sys.intern("DWH.V_SALES")
+    assert node.context == "Nicht spezifiziert"
+    assert pickle.loads(pickle.dumps(node)) == node
@@ -0,0 +1,77 @@
+import re
+import networkx as nx
+import pytest
+
+
+class FakeCursor:
+    """Minimaler DB-API-Cursor, der die Katalog-Abfragen des SQLExecutors beantwortet."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._rows = []
+
+    def execute(self, query):
+        self.connection.executed.append(query)
+        objects = self.connection.objects
+
+        single = re.search(r"WHERE name='([^']*)'", query)
+        in_list = re.search(r"WHERE name IN \((.*)\)", query)
+        if "LAST_COMMIT" in query:
+            self._rows = [(*name.split(".", 1), ts) for name, ts in self.connection.commit_times.items()]
+        elif "EXA_ALL_OBJECTS" in query:
+            self._rows = list(self.connection.catalog_objects)
+        elif "_DEPENDENCIES" in query:
+            self._rows = list(self.connection.dependencies)
+        elif "EXA_ALL_VIEWS" in query:
+            schemas = set(re.findall(r"'([^']*)'", query))
+            self._rows = [
+                (*name.split(".", 1), sql) for name, sql in objects.items()
+                if not schemas or name.split(".", 1)[0] in schemas
+            ]
+        elif in_list:
+            names = re.findall(r"'([^']*)'", in_list.group(1))
+            self._rows = [(n, objects[n]) for n in names if n in objects]
+        elif single:
+            name = single.group(1)
+            self._rows = [(objects[name],)] if name in objects else []
+        else:
+            self._rows = []
+
+    def fetchone(self):
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchmany(self, size):
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+
+class FakeConnection:
+    def __init__(self, objects, dependencies=(), catalog_objects=(), commit_times=None):
+        self.objects = objects
+        self.dependencies = dependencies  # Zeilen im Format von EXA_ALL_DEPENDENCIES
+        self.catalog_objects = catalog_objects  # (Schema, Name, Typ) aus EXA_ALL_OBJECTS
+        self.commit_times = commit_times or {}  # "SCHEMA.NAME" -> LAST_COMMIT
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+@pytest.fixture
+def warehouse_objects():
+    """Kleines Lineage-Szenario: Report -> Aggregat-Views -> Tabellen."""
+    return {
+        "REPORTING.V_REPORT": "SELECT * FROM DWH.V_AGG_A a JOIN DWH.V_AGG_B b ON a.id = b.id",
+        "DWH.V_AGG_A": "SELECT id FROM DWH.T_SALES -- Umsatz",
+        "DWH.V_AGG_B": "SELECT id FROM DWH.T_SALES s LEFT JOIN DWH.T_CUSTOMER c ON s.id = c.id",
+    }
+
+
+@pytest.fixture
+def fake_connection(warehouse_objects):
+    return FakeConnection(warehouse_objects)
+
+
+def named(graph):
+    """Graph mit kanonischen Objektnamen als Knoten (statt der Symbol-IDs des GraphBuilders)."""
+    return nx.relabel_nodes(graph, {node_id: data["data"].name for node_id, data in graph.nodes(data=True)})
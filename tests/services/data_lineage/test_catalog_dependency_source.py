@@ -0,0 +1,44 @@
+import pytest
+from app.services.data_lineage import DataLineageService, DataLineageConfig
+from app.services.data_lineage.catalog_dependency_source import CatalogDependencySource
+from .conftest import FakeConnection, named
+
+CATALOG_ROWS = [
+    ("REPORTING", "V_REPORT", "VIEW", "DWH", "V_AGG_A"),
+    ("REPORTING", "V_REPORT", "VIEW", "DWH", "V_AGG_B"),
+    ("DWH", "V_AGG_A", "VIEW", "DWH", "T_SALES"),
+]
+
+
+@pytest.fixture
+def catalog_connection(warehouse_objects):
+    return FakeConnection(warehouse_objects, dependencies=CATALOG_ROWS)
+
+
+def test_load_groups_edges_per_object(catalog_connection):
+    source = CatalogDependencySource(catalog_connection, fetch_batch_size=2)
+    assert source.load() == 3
+    assert source.covers("reporting.v_report")
+    assert not source.covers("DWH.V_AGG_B")
+    assert source.get_dependencies("REPORTING.V_REPORT") == ["DWH.V_AGG_A", "DWH.V_AGG_B"]
+    assert source.get_object_type("DWH.V_AGG_A") == "VIEW"
+
+
+@pytest.mark.parametrize("crawl_mode", ["stack", "level"])
+def test_catalog_covered_objects_skip_fetch_and_parse(catalog_connection, crawl_mode):
+    config = DataLineageConfig(mock_mode=False, use_catalog_dependencies=True, crawl_mode=crawl_mode)
+    service = DataLineageService(config, connection=catalog_connection)
+
+    parsed = []
+    original_parse = service._parse_dependencies
+    service._parse_dependencies = lambda sql: parsed.append(sql) or original_parse(sql)
+
+    graph = named(service.build_graph("REPORTING.V_REPORT"))
+
+    # Nur V_AGG_B fehlt im Katalog und muss geparst werden
+    assert len(parsed) == 1
+    assert "T_CUSTOMER" in parsed[0]
+    assert not any("V_REPORT" in q or "V_AGG_A'" in q for q in catalog_connection.executed[1:])
+    assert graph.has_edge("DWH.V_AGG_B", "REPORTING.V_REPORT")
+    assert graph.has_edge("DWH.T_CUSTOMER", "DWH.V_AGG_B")
+    assert service.catalog_dependencies.hits == 2
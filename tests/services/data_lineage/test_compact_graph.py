@@ -0,0 +1,68 @@
+import networkx as nx
+import numpy as np
+
+from app.models.node import Node
+from app.services.data_lineage.compact_graph import CompactGraph
+
+
+def _lineage_graph():
+    graph = nx.DiGraph()
+    for name, node_type in [("DWH.T_SALES", "TABLE"), ("DWH.V_AGG", "VIEW"),
+                            ("REPORTING.V_REPORT", "VIEW"), ("STAGING.RAW_ÄNDERUNG", "TABLE")]:
+        node_id = name.replace(".", "_")
+        graph.add_node(node_id, data=Node(id=node_id, name=name, node_type=node_type))
+    graph.add_edges_from([
+        ("DWH_T_SALES", "DWH_V_AGG"),
+        ("DWH_V_AGG", "REPORTING_V_REPORT"),
+        ("STAGING_RAW_ÄNDERUNG", "DWH_T_SALES"),
+        ("DWH_T_SALES", "REPORTING_V_REPORT"),
+    ])
+    return graph
+
+
+def test_roundtrip_through_memory_mapped_files(tmp_path):
+    graph = _lineage_graph()
+    CompactGraph.from_networkx(graph, meta={"data_source": "PROD"}).save(str(tmp_path / "g"))
+
+    compact = CompactGraph.load(str(tmp_path / "g"))
+    restored = compact.to_networkx()
+
+    assert isinstance(compact.succ_indices, np.memmap)
+    assert compact.meta["data_source"] == "PROD"
+    assert set(restored.edges) == set(graph.edges)
+    assert restored.nodes["STAGING_RAW_ÄNDERUNG"]["data"].name == "STAGING.RAW_ÄNDERUNG"
+    assert restored.nodes["DWH_V_AGG"]["data"].node_type == "VIEW"
+    assert sorted(restored.nodes["REPORTING_V_REPORT"]["data"].predecessors) == ["DWH_T_SALES", "DWH_V_AGG"]
+
+
+def test_save_replaces_existing_snapshot_despite_leftover_old_directory(tmp_path):
+    path = str(tmp_path / "g")
+    CompactGraph.from_networkx(nx.DiGraph([("A", "B")])).save(path)
+    (tmp_path / "g.old").mkdir()
+    (tmp_path / "g.old" / "meta.json").write_text("{}")  # Rest eines abgebrochenen Laufs
+
+    CompactGraph.from_networkx(_lineage_graph()).save(path)
+
+    assert CompactGraph.load(path).node_count == 4
+    assert not (tmp_path / "g.old").exists()
+
+
+def test_csr_neighbors_and_lookup():
+    compact = CompactGraph.from_networkx(_lineage_graph())
+    sales = compact.index_of("DWH_T_SALES")
+
+    assert compact.index_of("GIBT_ES_NICHT") is None
+    assert {compact.node_id(i) for i in compact.successors(sales)} == {"DWH_V_AGG", "REPORTING_V_REPORT"}
+    assert [compact.node_id(i) for i in compact.predecessors(sales)] == ["STAGING_RAW_ÄNDERUNG"]
+    # Typen werden interniert: zwei Views teilen sich einen Tabelleneintrag
+    assert compact.node_types[compact.index_of("DWH_V_AGG")] == compact.node_types[compact.index_of("REPORTING_V_REPORT")]
+
+
+def test_induced_subgraph_conversion():
+    compact = CompactGraph.from_networkx(_lineage_graph())
+    nodes = [compact.index_of("DWH_V_AGG"), compact.index_of("REPORTING_V_REPORT")]
+
+    sub = compact.to_networkx(nodes)
+
+    assert set(sub.nodes) == {"DWH_V_AGG", "REPORTING_V_REPORT"}
+    assert list(sub.edges) == [("DWH_V_AGG", "REPORTING_V_REPORT")]
@@ -0,0 +1,96 @@
+import itertools
+import sqlite3
+
+import pytest
+from app.services.data_lineage import DataLineageService, DataLineageConfig
+from app.services.data_lineage.dependency_cache import DependencyCache
+from .conftest import FakeConnection, named
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "deps.sqlite")
+
+
+def test_roundtrip_and_counters(cache_path):
+    cache = DependencyCache(cache_path)
+    assert cache.get("SELECT 1 FROM a") is None
+    cache.put("SELECT 1 FROM a", ["A"])
+    assert cache.get("SELECT 1 FROM a") == ["A"]
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_entries_persist_and_depend_on_extractor_version(cache_path):
+    cache = DependencyCache(cache_path, extractor_version="1")
+    cache.put("SELECT * FROM a", ["A"])
+    cache.close()
+
+    assert DependencyCache(cache_path, extractor_version="1").get("SELECT * FROM a") == ["A"]
+    assert DependencyCache(cache_path, extractor_version="2").get("SELECT * FROM a") is None
+
+
+def test_flush_evicts_least_recently_used(cache_path):
+    # Streng steigende Zeitstempel, unabhängig von der Auflösung der Uhr
+    cache = DependencyCache(cache_path, max_entries=2, clock=itertools.count().__next__)
+    cache.put("q1", ["A"])
+    cache.put("q2", ["B"])
+    cache.put("q3", ["C"])
+    cache.get("q1")
+    cache.flush()
+
+    assert len(cache) == 2
+    assert cache.get("q1") == ["A"]
+    assert cache.get("q2") is None
+
+
+def test_two_instances_share_one_file(cache_path):
+    """Wie zwei Tabs oder App und precompute_lineage.py gleichzeitig."""
+    first, second = DependencyCache(cache_path), DependencyCache(cache_path)
+    first.put("q1", ["A"])
+    second.put("q2", ["B"])  # Darf nicht auf eine Sperre von `first` warten
+    second.flush()
+    first.flush()
+
+    assert second.get("q1") == ["A"]
+    assert first.get("q2") == ["B"]
+
+
+def test_locked_file_counts_as_skipped_write(cache_path):
+    cache = DependencyCache(cache_path, busy_timeout=0.05)
+    blocker = sqlite3.connect(cache_path)
+    blocker.execute("BEGIN IMMEDIATE")  # Fremder Schreiber hält die Sperre
+
+    cache.put("q1", ["A"])
+    cache.flush()
+    blocker.rollback()
+
+    assert cache.get("q1") is None
+
+
+def test_second_build_skips_parsing(fake_connection, cache_path):
+    config = DataLineageConfig(mock_mode=False, dependency_cache_enabled=True, dependency_cache_path=cache_path)
+    first = DataLineageService(config, connection=fake_connection).build_graph("REPORTING.V_REPORT")
+
+    service = DataLineageService(config, connection=fake_connection)
+    service._parse_dependencies = lambda sql: pytest.fail("Cache-Treffer erwartet")
+    second = service.build_graph("REPORTING.V_REPORT")
+
+    assert set(named(second).edges) == set(named(first).edges)
+    assert service.dependency_cache.hits == 3
+
+
+def test_cache_is_closed_after_build_and_reopened_on_refresh(warehouse_objects, cache_path):
+    connection = FakeConnection(dict(warehouse_objects), commit_times={"DWH.V_AGG_A": "2024-01-01 00:00:00"})
+    config = DataLineageConfig(mock_mode=False, incremental=True,
+                               dependency_cache_enabled=True, dependency_cache_path=cache_path)
+    service = DataLineageService(config, connection=connection)
+    service.build_graph("REPORTING.V_REPORT")
+    assert service.dependency_cache._conn is None
+
+    connection.objects["DWH.V_AGG_A"] = "SELECT id FROM DWH.T_CUSTOMER"
+    connection.commit_times["DWH.V_AGG_A"] = "2024-02-01 00:00:00"
+    refreshed = named(service.refresh("REPORTING.V_REPORT"))
+
+    assert refreshed.has_edge("DWH.T_CUSTOMER", "DWH.V_AGG_A")
+    assert service.dependency_cache._conn is None
+    assert len(service.dependency_cache) == 4
@@ -0,0 +1,80 @@
+import pytest
+from app.services.data_lineage.sql_cleaner import SQLCleaner
+from app.services.data_lineage.sql_parser import SQLParser
+from app.services.data_lineage.dependency_extractor import DependencyExtractor
+from app.services.data_lineage.fast_dependency_extractor import FastDependencyExtractor
+
+# Differenzieller Korpus: der Scanner muss dasselbe liefern wie der volle Parser.
+CORPUS = [
+    "SELECT a FROM s.t",
+    "SELECT a FROM s.t x JOIN s.u y ON x.id = y.id LEFT OUTER JOIN s.v ON 1 = 1",
+    "SELECT * FROM s.a, s.b bb, s.c AS cc WHERE a.x = b.x",
+    "SELECT * FROM s.t WHERE id IN (SELECT id FROM s.u WHERE flag = 'FROM s.fake')",
+    "SELECT (SELECT max(x) FROM s.m) AS mx, y FROM s.t",
+    "SELECT * FROM (SELECT a FROM s.inner1 JOIN s.inner2 USING (id)) d JOIN s.outer1 ON 1=1",
+    "WITH c AS (SELECT a FROM s.t) SELECT * FROM c JOIN s.u ON c.a = s.u.a",
+    "WITH c AS (SELECT a FROM s.t), d (x) AS (SELECT 1 FROM c) SELECT * FROM d",
+    "SELECT EXTRACT(YEAR FROM dt), TRIM(LEADING '0' FROM code) FROM s.t",
+    "SELECT a FROM s.t1 UNION ALL SELECT a FROM s.t2 MINUS SELECT a FROM s.t3",
+    "SELECT a -- FROM s.comment\nFROM /* JOIN s.block */ s.real",
+    'SELECT * FROM "My Schema"."Tab" x JOIN "S"."U" ON 1=1',
+    "SELECT CAST(a AS DATE), CASE WHEN b > 1 THEN 'x' ELSE 'y' END FROM s.t GROUP BY 1 ORDER BY 1",
+    "SELECT sum(x) OVER (PARTITION BY y ORDER BY z) FROM s.t",
+    "SELECT * FROM s.t WHERE EXISTS (SELECT 1 FROM s.u WHERE s.u.id = s.t.id)",
+    "INSERT INTO s.t (a, b) SELECT x, y FROM s.u WHERE y IN (SELECT z FROM s.q)",
+    "INSERT INTO s.t SELECT * FROM s.u; INSERT INTO s.t2 SELECT * FROM s.u2",
+    "INSERT INTO s.t VALUES (1, 'a')",
+    "INSERT INTO s.t WITH c AS (SELECT * FROM s.src) SELECT * FROM c",
+    "UPDATE s.t SET a = (SELECT max(b) FROM s.u) WHERE c = 1",
+    "DELETE FROM s.t WHERE id IN (SELECT id FROM s.purge)",
+    "MERGE INTO s.t tgt USING (SELECT * FROM s.src) src ON tgt.id = src.id "
+    "WHEN MATCHED THEN UPDATE SET a = src.a WHEN NOT MATCHED THEN INSERT VALUES (src.id, src.a)",
+    "MERGE INTO s.t USING s.src ON s.t.id = s.src.id WHEN MATCHED THEN DELETE",
+    "CREATE OR REPLACE VIEW s.v AS SELECT * FROM s.base",
+    "SELECT a FROM s.t; SELECT b FROM s.u;",
+]
+
+# Konstrukte, die der Scanner nicht einordnet und an den Parser weitergibt.
+FALLBACK_CORPUS = [
+    "SELECT * FROM TABLE(s.fn(1))",
+    "SELECT * FROM s.fn(1)",
+    "SELECT * FROM ::param_table",
+    "SELECT 'offen FROM s.t",
+    "SELECT a FROM (s.t",
+]
+
+
+def full_references(sql):
+    parsed = SQLParser().parse(SQLCleaner().clean(sql))
+    return DependencyExtractor().extract_references(parsed)
+
+
+@pytest.fixture
+def extractor():
+    return FastDependencyExtractor()
+
+
+@pytest.mark.parametrize("sql", CORPUS)
+def test_scanner_matches_full_parser(extractor, sql):
+    scanned = extractor.scan(sql)
+    assert scanned is not None, "Scanner sollte dieses Statement selbst einordnen"
+    expected = full_references(sql)
+    assert set(scanned.sources) == set(expected.sources)
+    assert set(scanned.targets) == set(expected.targets)
+
+
+@pytest.mark.parametrize("sql", FALLBACK_CORPUS)
+def test_unclassifiable_constructs_fall_back(extractor, sql):
+    assert extractor.scan(sql) is None
+    assert extractor.extract_references(sql) == full_references(sql)
+    assert extractor.fallbacks == 1
+
+
+def test_cte_names_and_targets_are_not_sources(extractor):
+    sql = "INSERT INTO s.out WITH c AS (SELECT * FROM s.a) SELECT * FROM c JOIN s.b ON 1=1"
+    assert extractor.extract(sql) == ["s.a", "s.b"]
+    assert extractor.extract_references(sql).targets == ["s.out"]
+
+
+def test_quoted_identifiers_are_unquoted(extractor):
+    assert extractor.extract('SELECT 1 FROM "Sch""ema"."T"') == ['Sch"ema.T']
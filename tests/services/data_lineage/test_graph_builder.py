@@ -0,0 +1,23 @@
+from app.services.data_lineage.graph_builder import GraphBuilder
+
+
+def test_similar_names_get_distinct_nodes():
+    builder = GraphBuilder()
+    builder.add_edge("A.B_C", "X.Y")
+    builder.add_edge("A_B.C", "X.Y")
+
+    graph = builder.get_graph()
+    assert graph.number_of_nodes() == 3
+    assert {graph.nodes[n]["data"].name for n in graph.predecessors(builder.lookup("X.Y"))} == {"A.B_C", "A_B.C"}
+
+
+def test_ids_are_dense_and_stable():
+    builder = GraphBuilder()
+    builder.add_edge("S.SRC", "S.DST", src_type="TABLE")
+    builder.add_node("S.DST", "VIEW")
+
+    assert [builder.lookup("S.SRC"), builder.lookup("S.DST")] == [0, 1]
+    assert builder.names == ["S.SRC", "S.DST"]
+    assert builder.lookup("S.UNKNOWN") is None
+    assert builder.get_graph().nodes[1]["data"].node_type == "VIEW"
+    assert list(builder.get_graph().nodes[1]["data"].predecessors) == [0]
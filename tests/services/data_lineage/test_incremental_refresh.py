@@ -0,0 +1,153 @@
+from app.services.data_lineage.data_lineage_config import DataLineageConfig
+from app.services.data_lineage.data_lineage_service import DataLineageService
+from app.services.data_service import LINEAGE_SERVICE_CACHE_SIZE, DataService
+from app.services.graph_analysis_service import GraphAnalysisService
+
+from .conftest import FakeConnection, named
+
+
+def _build(objects, commit_times):
+    connection = FakeConnection(dict(objects), commit_times=dict(commit_times))
+    config = DataLineageConfig(mock_mode=False, incremental=True)
+    service = DataLineageService(config, connection)
+    graph = service.build_graph("REPORTING.V_REPORT")
+    return connection, service, graph
+
+
+def _commit_times(objects):
+    times = {name: "2024-01-01 00:00:00" for name in objects}
+    times.update({"DWH.T_SALES": "2024-01-01 00:00:00", "DWH.T_CUSTOMER": "2024-01-01 00:00:00"})
+    return times
+
+
+def _replace_customer_by_region(connection):
+    """V_AGG_B hängt nicht mehr an T_CUSTOMER, sondern an einer neuen Tabelle (Knoten- und Kantenzahl bleiben)."""
+    connection.objects["DWH.V_AGG_B"] = "SELECT id FROM DWH.T_SALES s JOIN DWH.T_REGION r ON s.id = r.id"
+    connection.commit_times["DWH.V_AGG_B"] = "2024-02-01 00:00:00"
+    connection.commit_times["DWH.T_REGION"] = "2024-02-01 00:00:00"
+
+
+def test_refresh_without_changes_fetches_nothing(warehouse_objects):
+    connection, service, graph = _build(warehouse_objects, _commit_times(warehouse_objects))
+    connection.executed.clear()
+
+    refreshed = service.refresh("REPORTING.V_REPORT")
+
+    assert refreshed is graph
+    refreshed = named(refreshed)
+    assert [q for q in connection.executed if "metadata" in q] == []
+    assert set(refreshed.nodes) == {
+        "REPORTING.V_REPORT", "DWH.V_AGG_A", "DWH.V_AGG_B", "DWH.T_SALES", "DWH.T_CUSTOMER",
+    }
+
+
+def test_refresh_reparses_only_changed_objects(warehouse_objects):
+    connection, service, graph = _build(warehouse_objects, _commit_times(warehouse_objects))
+
+    _replace_customer_by_region(connection)
+    connection.executed.clear()
+
+    refreshed = named(service.refresh("REPORTING.V_REPORT"))
+
+    fetched = [q for q in connection.executed if "metadata" in q]
+    assert any("DWH.V_AGG_B" in q for q in fetched)
+    assert not any("V_REPORT" in q or "V_AGG_A" in q for q in fetched)
+    assert refreshed.has_edge("DWH.T_REGION", "DWH.V_AGG_B")
+    assert "DWH.T_CUSTOMER" not in refreshed
+    assert "DWH.T_CUSTOMER" not in service.visited_nodes
+    assert refreshed.has_edge("DWH.V_AGG_A", "REPORTING.V_REPORT")
+
+
+def test_refresh_without_previous_crawl_builds_graph(fake_connection):
+    service = DataLineageService(DataLineageConfig(mock_mode=False, incremental=True), fake_connection)
+
+    graph = named(service.refresh("REPORTING.V_REPORT"))
+
+    assert graph.has_edge("DWH.T_SALES", "DWH.V_AGG_A")
+
+
+def test_impact_after_refresh_sees_replaced_nodes(warehouse_objects):
+    connection, service, graph = _build(warehouse_objects, _commit_times(warehouse_objects))
+    lookup = service.graph_builder.lookup
+    GraphAnalysisService(graph).batch_impact([lookup("DWH.T_SALES")])  # Adjazenz am Graphen ablegen
+
+    _replace_customer_by_region(connection)
+    refreshed = service.refresh("REPORTING.V_REPORT")
+
+    impact = GraphAnalysisService(refreshed).batch_impact([lookup("DWH.T_REGION")])
+    assert impact == {lookup("DWH.T_REGION"): {lookup("REPORTING.V_REPORT"): 2}}
+
+
+def test_predecessors_after_refresh_see_replaced_nodes(warehouse_objects):
+    connection, service, graph = _build(warehouse_objects, _commit_times(warehouse_objects))
+    lookup = service.graph_builder.lookup
+    report = lookup("REPORTING.V_REPORT")
+    assert lookup("DWH.T_CUSTOMER") in GraphAnalysisService(graph).get_all_predecessors(report)
+
+    _replace_customer_by_region(connection)
+    refreshed = service.refresh("REPORTING.V_REPORT")
+
+    predecessors = GraphAnalysisService(refreshed).get_all_predecessors(report)
+    assert lookup("DWH.T_REGION") in predecessors
+    assert lookup("DWH.T_CUSTOMER") not in predecessors
+
+
+def test_search_after_refresh_sees_replaced_nodes(warehouse_objects):
+    connection, service, graph = _build(warehouse_objects, _commit_times(warehouse_objects))
+    lookup = service.graph_builder.lookup
+    assert GraphAnalysisService(graph).search_nodes("T_CUSTOMER") == [lookup("DWH.T_CUSTOMER")]
+
+    _replace_customer_by_region(connection)
+    analysis = GraphAnalysisService(service.refresh("REPORTING.V_REPORT"))
+
+    assert analysis.search_nodes("T_CUSTOMER") == []
+    assert analysis.search_nodes("T_REGION") == [lookup("DWH.T_REGION")]
+
+
+def test_level_refresh_respects_max_depth_like_a_build(warehouse_objects):
+    connection = FakeConnection(dict(warehouse_objects), commit_times=_commit_times(warehouse_objects))
+    config = DataLineageConfig(mock_mode=False, incremental=True, crawl_mode="level", max_depth=1)
+    service = DataLineageService(config, connection)
+    service.build_graph("REPORTING.V_REPORT")
+
+    # V_AGG_B (Ebene 1) hängt jetzt an einer View, deren Quellen jenseits von max_depth liegen
+    connection.objects["DWH.V_AGG_B"] = "SELECT id FROM DWH.V_REGION"
+    connection.objects["DWH.V_REGION"] = "SELECT id FROM DWH.T_REGION"
+    connection.commit_times["DWH.V_AGG_B"] = "2024-02-01 00:00:00"
+
+    refreshed = named(service.refresh("REPORTING.V_REPORT"))
+    rebuilt = named(DataLineageService(config, connection).build_graph("REPORTING.V_REPORT"))
+
+    assert refreshed.has_edge("DWH.V_REGION", "DWH.V_AGG_B")
+    assert "DWH.T_REGION" not in refreshed
+    assert set(refreshed.edges) == set(rebuilt.edges)
+
+
+def test_refresh_reloads_object_snapshot(warehouse_objects):
+    catalog = [("REPORTING", "V_REPORT", "VIEW"), ("DWH", "V_AGG_A", "VIEW"), ("DWH", "V_AGG_B", "VIEW"),
+               ("DWH", "T_SALES", "TABLE"), ("DWH", "T_CUSTOMER", "TABLE")]
+    connection = FakeConnection(dict(warehouse_objects), catalog_objects=list(catalog),
+                                commit_times=_commit_times(warehouse_objects))
+    config = DataLineageConfig(mock_mode=False, incremental=True, resolve_objects=True)
+    service = DataLineageService(config, connection)
+    service.build_graph("REPORTING.V_REPORT")
+
+    # Unqualifizierter Verweis auf eine neu angelegte Tabelle
+    connection.objects["DWH.V_AGG_B"] = "SELECT id FROM T_REGION"
+    connection.catalog_objects.append(("DWH", "T_REGION", "TABLE"))
+    connection.commit_times["DWH.V_AGG_B"] = "2024-02-01 00:00:00"
+
+    refreshed = named(service.refresh("REPORTING.V_REPORT"))
+
+    assert refreshed.has_edge("DWH.T_REGION", "DWH.V_AGG_B")
+
+
+def test_data_service_keeps_a_bounded_number_of_lineage_services(warehouse_objects):
+    connection = FakeConnection(dict(warehouse_objects), commit_times=_commit_times(warehouse_objects))
+    data_service = DataService(mock_mode=False, connection=connection)
+    artifacts = list(warehouse_objects) + ["DWH.T_SALES", "DWH.T_CUSTOMER"]
+
+    for artifact in artifacts:
+        data_service.get_graph_for_artifact({"artifact": artifact, "incremental": True})
+
+    assert list(data_service._lineage_services) == artifacts[-LINEAGE_SERVICE_CACHE_SIZE:]
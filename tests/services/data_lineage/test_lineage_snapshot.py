@@ -0,0 +1,119 @@
+import json
+import time
+
+import networkx as nx
+import pytest
+
+from app.services.data_lineage import DataLineageConfig, DataLineageService, LineageSnapshot
+from app.services.data_service import SNAPSHOT_MAX_AGE, DataService
+
+from .conftest import FakeConnection, named
+
+CATALOG_OBJECTS = [
+    ("REPORTING", "V_REPORT", "VIEW"),
+    ("DWH", "V_AGG_A", "VIEW"),
+    ("DWH", "V_AGG_B", "VIEW"),
+    ("DWH", "T_SALES", "TABLE"),
+    ("DWH", "T_CUSTOMER", "TABLE"),
+    ("DWH", "T_UNUSED", "TABLE"),
+]
+
+
+@pytest.fixture
+def warehouse_snapshot(warehouse_objects):
+    connection = FakeConnection(warehouse_objects, catalog_objects=CATALOG_OBJECTS)
+    service = DataLineageService(DataLineageConfig(mock_mode=False), connection)
+    graph = service.build_warehouse_graph()
+    return connection, LineageSnapshot.from_lineage_graph(graph, data_source="PROD_DATABASE")
+
+
+def test_warehouse_graph_uses_one_bulk_fetch(warehouse_snapshot):
+    connection, snapshot = warehouse_snapshot
+
+    assert len(snapshot) == 6
+    assert [q for q in connection.executed if "metadata" in q] == []
+    assert sum("EXA_ALL_VIEWS" in q for q in connection.executed) == 1
+    assert snapshot.to_networkx().nodes["DWH.T_UNUSED"]["data"].node_type == "TABLE"
+
+
+def test_slice_matches_live_crawl(warehouse_snapshot, warehouse_objects):
+    _, snapshot = warehouse_snapshot
+    live = DataLineageService(DataLineageConfig(mock_mode=False), FakeConnection(warehouse_objects))
+    live_graph = named(live.build_graph("REPORTING.V_REPORT"))
+
+    sliced = snapshot.slice("REPORTING.V_REPORT")
+
+    assert set(sliced.nodes) == set(live_graph.nodes)
+    assert set(sliced.edges) == set(live_graph.edges)
+    assert list(sliced.nodes["DWH.V_AGG_A"]["data"].predecessors) == ["DWH.T_SALES"]
+
+
+def test_save_and_load_roundtrip(warehouse_snapshot, tmp_path):
+    _, snapshot = warehouse_snapshot
+    path = tmp_path / "snapshot"
+
+    snapshot.save(str(path))
+    loaded = LineageSnapshot.load(str(path))
+
+    assert set(loaded.to_networkx().edges) == set(snapshot.to_networkx().edges)
+    assert loaded.data_source == "PROD_DATABASE"
+    assert "DWH.T_SALES" in loaded
+
+
+def test_load_rejects_unknown_format_version(warehouse_snapshot, tmp_path):
+    _, snapshot = warehouse_snapshot
+    path = tmp_path / "snapshot"
+    snapshot.save(str(path))
+    (path / "meta.json").write_text(json.dumps({"format_version": 999}))
+
+    with pytest.raises(ValueError):
+        LineageSnapshot.load(str(path))
+
+
+def test_data_service_answers_from_snapshot(warehouse_snapshot, tmp_path):
+    _, snapshot = warehouse_snapshot
+    path = tmp_path / "snapshot"
+    snapshot.save(str(path))
+
+    data_service = DataService(mock_mode=False, connection=None, snapshot_path=str(path))
+    selections = {"artifact": "DWH.V_AGG_B", "use_snapshot": True}
+    graph = data_service.get_graph_for_artifact(selections)
+
+    assert graph.has_edge("DWH.T_CUSTOMER", "DWH.V_AGG_B")
+    assert graph.has_edge("DWH.V_AGG_B", "REPORTING.V_REPORT")
+    assert "DWH.V_AGG_A" not in graph
+
+    # Der zwischengespeicherte Ausschnitt wird nur als schreibgeschützte Sicht herausgegeben
+    assert nx.is_frozen(graph)
+    with pytest.raises(nx.NetworkXError):
+        graph.add_edge("DWH.V_AGG_B", "DWH.T_CUSTOMER")
+    assert set(data_service.get_graph_for_artifact(selections).edges) == set(graph.edges)
+
+
+def test_snapshot_is_opt_in_and_ignored_when_stale(warehouse_snapshot, warehouse_objects, tmp_path):
+    _, snapshot = warehouse_snapshot
+    snapshot.created_at = time.time() - 2 * SNAPSHOT_MAX_AGE
+    path = tmp_path / "snapshot"
+    snapshot.save(str(path))
+    data_service = DataService(mock_mode=False, connection=FakeConnection(warehouse_objects), snapshot_path=str(path))
+
+    # Live-Crawls liefern Symbol-IDs als Knoten, Snapshot-Ausschnitte Objektnamen
+    assert "DWH.T_SALES" not in data_service.get_graph_for_artifact({"artifact": "DWH.V_AGG_A"})
+    assert "DWH.T_SALES" not in data_service.get_graph_for_artifact({"artifact": "DWH.V_AGG_A", "use_snapshot": True})
+    assert "DWH.T_SALES" in data_service.get_graph_for_artifact(
+        {"artifact": "DWH.V_AGG_A", "use_snapshot": True, "snapshot_max_age": None}
+    )
+
+
+def test_snapshot_slice_follows_max_depth_of_level_crawl(warehouse_snapshot, tmp_path):
+    _, snapshot = warehouse_snapshot
+    path = tmp_path / "snapshot"
+    snapshot.save(str(path))
+    data_service = DataService(mock_mode=False, connection=None, snapshot_path=str(path))
+    selections = {"artifact": "REPORTING.V_REPORT", "use_snapshot": True, "crawl_mode": "level"}
+
+    shallow = data_service.get_graph_for_artifact({**selections, "max_depth": 0})
+    deep = data_service.get_graph_for_artifact({**selections, "max_depth": 5})
+
+    assert set(shallow.nodes) == {"REPORTING.V_REPORT", "DWH.V_AGG_A", "DWH.V_AGG_B"}
+    assert {"DWH.T_SALES", "DWH.T_CUSTOMER"} <= set(deep.nodes)
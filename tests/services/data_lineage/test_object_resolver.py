@@ -0,0 +1,58 @@
+import pytest
+from app.services.data_lineage import DataLineageService, DataLineageConfig
+from app.services.data_lineage.object_resolver import ObjectResolver
+from .conftest import FakeConnection, named
+
+CATALOG_OBJECTS = [
+    ("REPORTING", "V_REPORT", "VIEW"),
+    ("DWH", "V_AGG_A", "VIEW"),
+    ("DWH", "V_AGG_B", "VIEW"),
+    ("DWH", "T_SALES", "TABLE"),
+    ("DWH", "T_CUSTOMER", "TABLE"),
+    ("STAGING", "T_CUSTOMER", "TABLE"),
+    ("STAGING", "RAW_ONLY", "TABLE"),
+]
+
+
+@pytest.fixture
+def resolver():
+    resolver = ObjectResolver(FakeConnection({}, catalog_objects=CATALOG_OBJECTS), search_path=["staging"])
+    resolver.load_snapshot()
+    return resolver
+
+
+def test_qualified_names_get_their_type(resolver):
+    assert resolver.resolve_object("dwh.v_agg_a") == ("DWH.V_AGG_A", "VIEW")
+    assert resolver.resolve_object("DWH.UNKNOWN") == ("DWH.UNKNOWN", None)
+
+
+def test_unqualified_names_use_current_schema_then_search_path(resolver):
+    assert resolver.resolve("T_CUSTOMER", current_schema="DWH") == "DWH.T_CUSTOMER"
+    assert resolver.resolve("T_CUSTOMER", current_schema="REPORTING") == "STAGING.T_CUSTOMER"
+    # Eindeutiger Name ist auch ohne Suchpfad auflösbar
+    assert resolver.resolve("T_SALES") == "DWH.T_SALES"
+    assert resolver.resolve("NIRGENDWO") == "NIRGENDWO"
+
+
+def test_without_snapshot_names_are_only_normalized():
+    assert ObjectResolver().resolve_object(" d_customer ") == ("D_CUSTOMER", None)
+
+
+def test_crawl_resolves_unqualified_references_and_types():
+    objects = {
+        "REPORTING.V_REPORT": "SELECT * FROM DWH.V_AGG_A",
+        "DWH.V_AGG_A": "SELECT * FROM T_SALES JOIN T_CUSTOMER ON 1=1",
+    }
+    connection = FakeConnection(objects, catalog_objects=CATALOG_OBJECTS)
+    config = DataLineageConfig(mock_mode=False, resolve_objects=True)
+    graph = named(DataLineageService(config, connection=connection).build_graph("REPORTING.V_REPORT"))
+
+    assert graph.has_edge("DWH.T_SALES", "DWH.V_AGG_A")
+    assert graph.has_edge("DWH.T_CUSTOMER", "DWH.V_AGG_A")
+    types = {n: d["data"].node_type for n, d in graph.nodes(data=True)}
+    assert types == {
+        "REPORTING.V_REPORT": "VIEW", "DWH.V_AGG_A": "VIEW",
+        "DWH.T_SALES": "TABLE", "DWH.T_CUSTOMER": "TABLE",
+    }
+    # Nur Snapshot + ein Query pro besuchtem Objekt, keine Namens-Lookups
+    assert len(connection.executed) == 1 + 4
@@ -0,0 +1,30 @@
+from app.services.data_lineage import DataLineageService, DataLineageConfig
+from app.services.data_lineage import parse_pool
+from app.services.data_lineage.parse_pool import ParsePool, extract_dependencies
+from .conftest import named
+
+
+def test_extract_dependencies_returns_plain_names():
+    assert extract_dependencies("SELECT * FROM a.x t JOIN a.y ON 1=1 -- FROM b.z") == ["a.x", "a.y"]
+    assert extract_dependencies("") is None
+
+
+def test_pool_matches_serial_extraction(warehouse_objects):
+    with ParsePool(workers=2) as pool:
+        result = pool.extract_many(warehouse_objects)
+    assert result == {name: extract_dependencies(sql) for name, sql in warehouse_objects.items()}
+
+
+def test_level_crawl_with_pool_builds_same_graph(fake_connection):
+    serial = DataLineageService(DataLineageConfig(mock_mode=False, crawl_mode="level"), fake_connection)
+    pooled = DataLineageService(
+        DataLineageConfig(mock_mode=False, crawl_mode="level", parse_workers=2), fake_connection
+    )
+    pooled_graph, serial_graph = pooled.build_graph("REPORTING.V_REPORT"), serial.build_graph("REPORTING.V_REPORT")
+    assert set(named(pooled_graph).edges) == set(named(serial_graph).edges)
+
+    # Der Pool überdauert den Build und wird vom nächsten wiederverwendet
+    executor = parse_pool._shared_executors[2]
+    rebuilt = DataLineageService(pooled.config, fake_connection).build_graph("REPORTING.V_REPORT")
+    assert parse_pool._shared_executors[2] is executor
+    assert set(named(rebuilt).edges) == set(named(serial_graph).edges)
@@ -31,4 +31,35 @@ def test_empty_string(cleaner):
 def test_no_comments(cleaner):
     """Stellt sicher, dass SQL ohne Kommentare unverändert bleibt."""
     sql = "SELECT id FROM users WHERE id = 1"
-    assert cleaner.clean(sql) == sql
\ No newline at end of file
+    assert cleaner.clean(sql) == sql
+
+def test_comment_markers_inside_string_literal_are_kept(cleaner):
+    """Stellt sicher, dass '--' und '/*' in String-Literalen erhalten bleiben."""
+    sql = "SELECT '--kein Kommentar', 'a /* b */ c' FROM t -- echter Kommentar"
+    expected = "SELECT '--kein Kommentar', 'a /* b */ c' FROM t"
+    assert cleaner.clean(sql) == expected
+
+def test_whitespace_inside_literals_and_identifiers_is_kept(cleaner):
+    """Whitespace in Literalen und Quoted Identifiers wird nicht normalisiert."""
+    sql = "SELECT \"Spalte  mit--Leer\"\nFROM t WHERE x = 'a    b'"
+    expected = "SELECT \"Spalte  mit--Leer\" FROM t WHERE x = 'a    b'"
+    assert cleaner.clean(sql) == expected
+
+def test_escaped_quotes_in_literal(cleaner):
+    """Verdoppelte Hochkommata beenden das Literal nicht."""
+    sql = "SELECT 'it''s -- drin' -- weg\nFROM t"
+    expected = "SELECT 'it''s -- drin' FROM t"
+    assert cleaner.clean(sql) == expected
+
+def test_block_comment_acts_as_separator(cleaner):
+    """Ein Blockkommentar zwischen zwei Tokens trennt diese wie ein Leerzeichen."""
+    assert cleaner.clean("SELECT a/* x */FROM t") == "SELECT a FROM t"
+
+def test_unterminated_block_comment(cleaner):
+    """Ein nicht geschlossener Blockkommentar reicht bis zum Textende."""
+    assert cleaner.clean("SELECT a FROM t /* offen\nFROM u") == "SELECT a FROM t"
+
+def test_multiline_script(cleaner):
+    """Zeilen- und Blockkommentare über mehrere Zeilen werden vollständig entfernt."""
+    sql = "/* Kopf\n   über Zeilen */\nINSERT INTO a -- Ziel\n  SELECT *\n  FROM b;\n"
+    assert cleaner.clean(sql) == "INSERT INTO a SELECT * FROM b;"
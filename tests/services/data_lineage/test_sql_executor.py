@@ -0,0 +1,78 @@
+import re
+
+import pytest
+from app.services.data_lineage import DataLineageService, DataLineageConfig
+from app.services.data_lineage.sql_executor import SQLExecutor
+from .conftest import FakeConnection, FakeCursor, named
+
+
+def test_prefetch_serves_crawl_from_memory(fake_connection):
+    """Mit Prefetch läuft der gesamte Crawl mit genau einem Datenbank-Query."""
+    config = DataLineageConfig(mock_mode=False, prefetch_catalog=True, fetch_batch_size=2)
+    service = DataLineageService(config, connection=fake_connection)
+    graph = named(service.build_graph("REPORTING.V_REPORT"))
+
+    assert len(fake_connection.executed) == 1
+    assert graph.has_edge("DWH.V_AGG_A", "REPORTING.V_REPORT")
+    assert graph.has_edge("DWH.T_CUSTOMER", "DWH.V_AGG_B")
+    # 5 Artefakte besucht, 1 Bulk-Query -> 4 eingesparte Round-Trips
+    assert service.sql_executor.round_trips_saved == 4
+
+
+def test_without_prefetch_one_query_per_node(fake_connection):
+    config = DataLineageConfig(mock_mode=False)
+    service = DataLineageService(config, connection=fake_connection)
+    graph = named(service.build_graph("REPORTING.V_REPORT"))
+
+    assert len(fake_connection.executed) == graph.number_of_nodes() == 5
+    assert service.sql_executor.round_trips_saved == 0
+
+
+def test_prefetch_restricted_to_schemas_falls_back_to_single_queries(fake_connection):
+    config = DataLineageConfig(mock_mode=False)
+    executor = SQLExecutor(config, fake_connection)
+    executor.prefetch(["dwh"])
+
+    assert executor.get_sql_for_artifact("DWH.V_AGG_A").startswith("SELECT id")
+    assert executor.get_sql_for_artifact("REPORTING.V_REPORT").startswith("SELECT *")
+    assert executor.stats["served_from_prefetch"] == 1
+    assert executor.stats["round_trips"] == 2
+
+
+def test_level_mode_issues_one_query_per_level(fake_connection):
+    config = DataLineageConfig(mock_mode=False, crawl_mode="level")
+    service = DataLineageService(config, connection=fake_connection)
+    graph = named(service.build_graph("REPORTING.V_REPORT"))
+
+    # Ebenen: V_REPORT | V_AGG_A, V_AGG_B | T_SALES, T_CUSTOMER
+    assert len(fake_connection.executed) == 3
+    assert graph.number_of_nodes() == 5
+    assert graph.has_edge("DWH.T_SALES", "DWH.V_AGG_A")
+
+
+def test_level_mode_chunks_frontier_and_respects_max_depth(fake_connection):
+    config = DataLineageConfig(mock_mode=False, crawl_mode="level", max_depth=1, frontier_chunk_size=1)
+    service = DataLineageService(config, connection=fake_connection)
+    graph = named(service.build_graph("REPORTING.V_REPORT"))
+
+    # Ebene 0 (1 Query) und Ebene 1 (2 Chunks); Ebene 2 wird nicht mehr expandiert
+    assert len(fake_connection.executed) == 3
+    assert "DWH.T_SALES" in graph
+    assert "DWH.T_SALES" not in service.visited_nodes
+
+
+class _CaseInsensitiveCursor(FakeCursor):
+    """Katalog, der Namen unabhängig von der Schreibweise findet und in seiner eigenen Schreibweise liefert."""
+
+    def execute(self, query):
+        super().execute(re.sub(r"'[^']*'", lambda m: m.group().upper(), query))
+
+
+def test_batch_results_keyed_by_requested_name(warehouse_objects):
+    connection = FakeConnection(warehouse_objects)
+    connection.cursor = lambda: _CaseInsensitiveCursor(connection)
+    executor = SQLExecutor(DataLineageConfig(mock_mode=False), connection)
+
+    texts = executor.get_sql_for_artifacts(["dwh.v_agg_a", "DWH.V_AGG_B"])
+
+    assert texts == {"dwh.v_agg_a": warehouse_objects["DWH.V_AGG_A"], "DWH.V_AGG_B": warehouse_objects["DWH.V_AGG_B"]}
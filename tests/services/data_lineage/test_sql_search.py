@@ -0,0 +1,17 @@
+from app.services.data_lineage import DataLineageConfig, DataLineageService
+from app.services.graph_analysis_service import GraphAnalysisService
+
+
+def test_crawl_collects_sql_texts_for_reference_search(fake_connection):
+    config = DataLineageConfig(mock_mode=False, index_sql_texts=True)
+    graph = DataLineageService(config, fake_connection).build_graph("REPORTING.V_REPORT")
+    service = GraphAnalysisService(graph)
+
+    names = {graph.nodes[n]["data"].name for n in service.find_references("t_customer")}
+    assert names == {"DWH.V_AGG_B"}
+    assert graph.nodes[service.find_node_by_name("agg_b")]["data"].name == "DWH.V_AGG_B"
+
+
+def test_sql_texts_are_not_kept_by_default(fake_connection):
+    graph = DataLineageService(DataLineageConfig(mock_mode=False), fake_connection).build_graph("REPORTING.V_REPORT")
+    assert GraphAnalysisService(graph).find_references("t_customer") == []
@@ -0,0 +1,53 @@
+import pytest
+from app.services.data_lineage import DataLineageService, DataLineageConfig
+from app.services.data_lineage.sqlglot_extractor import SqlglotDependencyExtractor, SqlglotParser
+from .test_fast_dependency_extractor import CORPUS, full_references
+from .conftest import named
+
+
+@pytest.fixture
+def extractor():
+    return SqlglotDependencyExtractor()
+
+
+@pytest.mark.parametrize("sql", CORPUS)
+def test_matches_full_parser(extractor, sql):
+    references = extractor.extract_references(sql)
+    expected = full_references(sql)
+    assert set(references.sources) == set(expected.sources)
+    assert set(references.targets) == set(expected.targets)
+
+
+def test_cte_scope_is_limited_to_its_with_clause(extractor):
+    """Außerhalb des WITH-Blocks ist 'c' wieder eine echte Tabelle."""
+    sql = "SELECT * FROM (WITH c AS (SELECT * FROM s.a) SELECT * FROM c) x JOIN c ON 1=1"
+    assert set(extractor.extract(sql)) == {"s.a", "c"}
+
+
+def test_invalid_sql_returns_none(extractor):
+    assert extractor.extract("SELECT FROM WHERE (") is None
+    assert extractor.errors == 1
+
+
+def test_unterminated_literal_returns_none(extractor):
+    """Nicht abgeschlossene Literale scheitern schon im Tokenizer (TokenError)."""
+    assert extractor.extract("SELECT 'abc FROM s.t") is None
+    assert extractor.errors == 1
+
+
+def test_parser_lru_reuses_and_bounds_asts():
+    parser = SqlglotParser(max_cached=2)
+    first = parser.parse("SELECT 1 FROM s.a")
+    assert parser.parse("SELECT 1 FROM s.a") is first
+    parser.parse("SELECT 1 FROM s.b")
+    parser.parse("SELECT 1 FROM s.c")
+
+    assert len(parser) == 2
+    assert (parser.hits, parser.misses) == (1, 3)
+    assert parser.parse("SELECT 1 FROM s.a") is not first
+
+
+def test_service_uses_sqlglot_extractor(fake_connection):
+    config = DataLineageConfig(mock_mode=False, extractor="sqlglot")
+    graph = named(DataLineageService(config, connection=fake_connection).build_graph("REPORTING.V_REPORT"))
+    assert graph.has_edge("DWH.T_CUSTOMER", "DWH.V_AGG_B")
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+
+import networkx as nx
+import pytest
+
+from app.models.node import Node
+from app.services.component_layout import pack_components, split_components, weak_component_labels
+from app.services.layout_cache import LayoutCache, node_keys
+from app.services.layout_service import LayoutService
+
+
+def _lineage(*chains):
+    """Graph aus Ketten (Präfix, Länge); jede Kette ist eine Komponente, Ganzzahl-IDs wie im GraphBuilder."""
+    graph = nx.DiGraph()
+    for prefix, length in chains:
+        names = [f"DWH.{prefix}_{i:03d}" for i in range(length)]
+        for name in names:
+            node_id = graph.number_of_nodes()
+            graph.add_node(node_id, data=Node(id=node_id, name=name, node_type="VIEW"))
+        first = graph.number_of_nodes() - length
+        graph.add_edges_from((first + i, first + i + 1) for i in range(length - 1))
+    return graph
+
+
+def test_split_components_largest_first_with_their_edges():
+    graph = _lineage(("B", 2), ("A", 3), ("C", 1))
+
+    components = split_components(graph, node_keys(graph), weak_component_labels(graph))
+
+    assert [nodes for nodes, _ in components] == [
+        ["DWH.A_000", "DWH.A_001", "DWH.A_002"], ["DWH.B_000", "DWH.B_001"], ["DWH.C_000"],
+    ]
+    assert components[1][1] == [("DWH.B_000", "DWH.B_001")]
+
+
+def test_packed_components_do_not_overlap():
+    layouts = [{f"{c}{i}": (i * 100.0, (i % 3) * 50.0) for i in range(size)} for c, size in (("a", 9), ("b", 4), ("c", 1))]
+
+    packed = pack_components(layouts)
+
+    assert len(packed) == 14
+    boxes = []
+    for layout in layouts:
+        xs, ys = zip(*(packed[key] for key in layout))
+        boxes.append((min(xs), max(xs), min(ys), max(ys)))
+    for i, a in enumerate(boxes):
+        for b in boxes[i + 1:]:
+            assert a[1] < b[0] or b[1] < a[0] or a[3] < b[2] or b[3] < a[2]
+
+
+def test_only_changed_components_are_recomputed(monkeypatch):
+    service = LayoutService(cache=LayoutCache())
+    laid_out = []
+
+    def fake_layout(graph, cancelled=None):
+        laid_out.append(sorted(graph.nodes)[0])
+        return {n: (float(i), 0.0) for i, n in enumerate(sorted(graph.nodes))}
+
+    monkeypatch.setattr(service, "_hierarchical_layout", fake_layout)
+
+    graph = _lineage(("A", 60), ("B", 60), ("S", 3), ("T", 1))
+    first = service.calculate_layout(graph)
+    assert sorted(laid_out) == ["DWH.A_000", "DWH.B_000", "DWH.S_000"]  # Kleine Komponenten gemeinsam
+    assert len(first) == graph.number_of_nodes()
+
+    laid_out.clear()
+    graph.add_edge(60, 119)  # Nur Komponente B ändert sich
+    service.calculate_layout(graph)
+    assert sorted(laid_out) == ["DWH.B_000", "DWH.S_000"]
+
+
+def test_process_pool_matches_serial_layout():
+    graph = _lineage(("A", 60), ("B", 80), ("C", 2))
+    serial = LayoutService(cache=LayoutCache())
+    serial._dot_path = ""  # Internes Ebenen-Layout, unabhängig von einer lokalen Graphviz-Installation
+    parallel = LayoutService(cache=LayoutCache(), workers=2)
+    parallel._dot_path = ""
+
+    assert parallel.calculate_layout(graph) == serial.calculate_layout(graph)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Ersatz-dot als Shell-Skript")
+def test_cancelling_the_pool_kills_running_dot(tmp_path):
+    # Ersatz für dot, der seine PID ablegt und hängen bleibt
+    slow_dot = tmp_path / "dot"
+    slow_dot.write_text(f"#!{sys.executable}\nimport os, time\n"
+                        f"open(os.path.join({str(tmp_path)!r}, f'{{os.getpid()}}.pid'), 'w').close()\n"
+                        f"time.sleep(60)\n")
+    slow_dot.chmod(0o755)
+    service = LayoutService(cache=LayoutCache(), workers=2)
+    service._dot_path = str(slow_dot)
+
+    def cancelled():
+        return len(list(tmp_path.glob("*.pid"))) == 2
+
+    start = time.monotonic()
+    assert service.calculate_layout(_lineage(("A", 60), ("B", 80)), cancelled=cancelled) == {}
+
+    pids = [int(path.stem) for path in tmp_path.glob("*.pid")]
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline and any(_alive(pid) for pid in pids):
+        time.sleep(0.1)
+    assert not any(_alive(pid) for pid in pids)
+    assert time.monotonic() - start < 30
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
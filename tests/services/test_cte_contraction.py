@@ -0,0 +1,78 @@
+import random
+
+import networkx as nx
+
+from app.models.node import Node
+from app.services.cte_contraction import cte_view, contract_ctes
+from app.services.graph_version import mark_changed
+
+
+def _graph(edges, ctes):
+    graph = nx.DiGraph(edges)
+    for n in graph.nodes:
+        graph.nodes[n]["data"] = Node(id=n, name=n, node_type="CTE" if n in ctes else "VIEW").bind(graph)
+    return graph
+
+
+def _prune_iteratively(graph):
+    """Frühere Variante: CTEs einzeln entfernen und Nachbarn verbinden."""
+    graph = nx.DiGraph(graph)
+    for cte in [n for n, d in graph.nodes(data=True) if d["data"].node_type == "CTE"]:
+        for p in list(graph.predecessors(cte)):
+            for s in list(graph.successors(cte)):
+                if p != s and not graph.has_edge(p, s):
+                    graph.add_edge(p, s)
+        graph.remove_node(cte)
+    return graph
+
+
+def test_chains_of_ctes_are_bridged_without_self_loops():
+    raw = _graph([("T", "C1"), ("C1", "C2"), ("C2", "V"), ("C1", "W"), ("V", "C3"), ("C3", "V"), ("X", "V")],
+                 ctes={"C1", "C2", "C3"})
+
+    contracted = contract_ctes(raw)
+
+    assert set(contracted.edges) == {("T", "V"), ("T", "W"), ("X", "V")}
+    assert set(raw.nodes) == {"T", "C1", "C2", "C3", "V", "W", "X"}
+    assert sorted(contracted.nodes["V"]["data"].predecessors) == ["T", "X"]
+    assert contracted.nodes["X"]["data"] is raw.nodes["X"]["data"]
+
+
+def test_matches_iterative_pruning_on_random_graph():
+    rng = random.Random(3)
+    edges = [(f"N{rng.randrange(300)}", f"N{rng.randrange(300)}") for _ in range(900)]
+    raw = _graph(edges, ctes={f"N{i}" for i in rng.sample(range(300), 60)})
+
+    assert set(contract_ctes(raw).edges) == set(_prune_iteratively(raw).edges)
+
+
+def test_view_is_cached_and_switches_back_to_raw():
+    raw = _graph([("T", "C"), ("C", "V")], ctes={"C"})
+
+    contracted = cte_view(raw, include_ctes=False)
+
+    assert cte_view(raw, include_ctes=False) is contracted
+    assert cte_view(contracted, include_ctes=False) is contracted
+    assert cte_view(contracted, include_ctes=True) is raw
+
+    raw.add_edge("X", "C")
+    raw.nodes["X"]["data"] = Node(id="X", name="X", node_type="TABLE").bind(raw)
+    assert cte_view(raw, include_ctes=False).has_edge("X", "V")
+
+
+def test_view_is_rebuilt_after_change_of_same_size():
+    raw = _graph([("T", "C"), ("C", "V")], ctes={"C"})
+    cte_view(raw, include_ctes=False)
+
+    # Wie bei einer inkrementellen Aktualisierung: T durch U ersetzt, gleiche Größe
+    raw.remove_node("T")
+    raw.add_edge("U", "C")
+    raw.nodes["U"]["data"] = Node(id="U", name="U", node_type="TABLE").bind(raw)
+    mark_changed(raw)
+
+    assert set(cte_view(raw, include_ctes=False).edges) == {("U", "V")}
+
+
+def test_graph_without_ctes_is_returned_as_is():
+    raw = _graph([("T", "V")], ctes=set())
+    assert cte_view(raw, include_ctes=False) is raw
@@ -0,0 +1,58 @@
+import networkx as nx
+
+from app.services.graph_analysis_service import GraphAnalysisService
+from app.services.reachability_index import ReachabilityIndex
+
+
+def _recursive_elts():
+    # Drei wechselseitig rekursive ELTs, ein Self-Loop und eine azyklische Kette
+    return nx.DiGraph([
+        ("ELT_A", "ELT_B"), ("ELT_B", "ELT_C"), ("ELT_C", "ELT_A"), ("ELT_B", "ELT_A"),
+        ("ELT_C", "V_REPORT"), ("T_LOG", "T_LOG"), ("T_RAW", "ELT_A"),
+    ])
+
+
+def test_summary_reports_components_and_witness_cycles():
+    graph = _recursive_elts()
+
+    summary = GraphAnalysisService(graph).summarize_graph()
+
+    assert summary["nodes"] == 6 and summary["edges"] == 7
+    assert summary["components"] == 4
+    assert summary["cyclic_components"] == 2
+    assert sorted(summary["largest_components"][0]) == ["ELT_A", "ELT_B", "ELT_C"]
+    assert summary["endpoints"] == ["V_REPORT"]
+    assert "all_cycles" not in summary
+    for cycle in summary["cycles"]:
+        assert all(graph.has_edge(u, v) for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+    assert ["T_LOG"] in summary["cycles"]
+
+
+def test_cycle_enumeration_is_capped():
+    graph = nx.complete_graph(8, create_using=nx.DiGraph)
+
+    summary = GraphAnalysisService(graph).summarize_graph(enumerate_cycles=True, max_cycles=10)
+
+    assert len(summary["all_cycles"]) == 10
+    assert summary["cycles_truncated"]
+    assert summary["cyclic_components"] == 1
+
+
+def test_full_enumeration_on_small_graph():
+    summary = GraphAnalysisService(_recursive_elts()).summarize_graph(enumerate_cycles=True)
+
+    assert not summary["cycles_truncated"]
+    assert len(summary["all_cycles"]) == 3
+
+
+def test_without_building_indexes_falls_back_to_traversal():
+    graph = _recursive_elts()
+    service = GraphAnalysisService(graph, build_indexes=False)
+
+    assert service.get_all_predecessors("V_REPORT") == {"V_REPORT", "ELT_A", "ELT_B", "ELT_C", "T_RAW"}
+    assert service.is_upstream("T_RAW", "V_REPORT") and not service.is_upstream("V_REPORT", "T_RAW")
+    assert ReachabilityIndex.cached(graph) is None  # Nichts im GUI-Thread aufgebaut
+
+    GraphAnalysisService(graph).prepare_indexes()
+    assert service.reachability is ReachabilityIndex.cached(graph) is not None
+    assert service.get_all_predecessors("V_REPORT") == {"V_REPORT", "ELT_A", "ELT_B", "ELT_C", "T_RAW"}
@@ -0,0 +1,67 @@
+import os
+import re
+import sys
+import time
+
+import networkx as nx
+import pytest
+
+from app.models.node import Node
+from app.services.graphviz_layout import GraphvizError, graphviz_layout, parse_plain, to_dot
+
+# Ersatz für dot: liest das DOT von stdin und antwortet im -Tplain-Format
+FAKE_DOT = """#!{python}
+import re, sys, time
+time.sleep({delay})
+text = sys.stdin.read()
+print("graph 1 10 2")
+for i in re.findall(r"^n(\\d+)\\[", text, re.M):
+    print(f"node n{{i}} {{i}}.5 0.25 0.75 0.5 \\"label with spaces\\" solid ellipse black lightgrey")
+print("stop")
+"""
+
+
+def _fake_dot(tmp_path, delay=0.0):
+    path = tmp_path / "dot"
+    path.write_text(FAKE_DOT.format(python=sys.executable, delay=delay))
+    path.chmod(0o755)
+    return str(path)
+
+
+def _graph():
+    graph = nx.DiGraph([(10, 11), (11, 12)])
+    names = {10: 'DWH."A"', 11: "DWH.B", 12: "DWH.C"}
+    for n in graph.nodes:
+        graph.nodes[n]["data"] = Node(id=n, name=names[n], node_type="VIEW")
+    return graph
+
+
+def test_to_dot_numbers_nodes_and_escapes_labels():
+    dot_text, nodes = to_dot(_graph())
+
+    assert nodes == [10, 11, 12]
+    assert 'n0[label="DWH.\\"A\\""];' in dot_text
+    assert re.findall(r"n\d+->n\d+", dot_text) == ["n0->n1", "n1->n2"]
+    assert "rankdir=LR" in dot_text
+
+
+def test_parse_plain_converts_inches_to_points():
+    output = 'graph 1 4 2\nnode n1 2 0.5 1 0.5 "a b" solid ellipse black lightgrey\nedge n0 n1 2 0 0 1 1 solid black\nstop\n'
+    assert parse_plain(output, ["x", "y"]) == {"y": (144.0, 36.0)}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Ersatz-dot als Shell-Skript")
+def test_layout_via_pipes(tmp_path):
+    pos = graphviz_layout(_graph(), _fake_dot(tmp_path))
+    assert pos == {10: (36.0, 18.0), 11: (108.0, 18.0), 12: (180.0, 18.0)}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Ersatz-dot als Shell-Skript")
+def test_timeout_and_cancellation_kill_dot(tmp_path):
+    slow_dot = _fake_dot(tmp_path, delay=30)
+    start = time.monotonic()
+    with pytest.raises(GraphvizError, match="länger"):
+        graphviz_layout(_graph(), slow_dot, timeout=0.3)
+    with pytest.raises(GraphvizError, match="abgebrochen"):
+        graphviz_layout(_graph(), slow_dot, cancelled=lambda: True)
+    assert time.monotonic() - start < 5
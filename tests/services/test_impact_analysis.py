@@ -0,0 +1,48 @@
+import networkx as nx
+import pytest
+
+import analyze_impact
+from app.models.node import Node
+from app.services.data_lineage import LineageSnapshot
+from app.services.graph_analysis_service import GraphAnalysisService
+
+
+def _expected_impact(graph, source, targets):
+    distances = nx.single_source_shortest_path_length(graph, source)
+    return {t: d for t, d in distances.items() if t in targets and t != source}
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_batch_impact_matches_shortest_paths(seed):
+    graph = nx.gnp_random_graph(60, 0.05, directed=True, seed=seed)
+    endpoints = {n for n in graph if graph.out_degree(n) == 0}
+
+    impact = GraphAnalysisService(graph).batch_impact(graph.nodes)
+
+    for source in graph:
+        assert impact[source] == _expected_impact(graph, source, endpoints)
+
+
+def test_batch_impact_with_explicit_targets_and_unknown_sources():
+    graph = nx.DiGraph([("STG_A", "CORE_X"), ("CORE_X", "RPT_1"), ("STG_A", "RPT_2"), ("CORE_X", "RPT_2")])
+
+    impact = GraphAnalysisService(graph).batch_impact(["STG_A", "GIBT_ES_NICHT"], targets=["CORE_X", "RPT_2"])
+
+    assert impact == {"STG_A": {"CORE_X": 1, "RPT_2": 1}}
+
+
+def test_cli_over_snapshot(tmp_path, capsys):
+    graph = nx.DiGraph()
+    for name in ["STAGING.RAW_A", "STAGING.RAW_B", "DWH.V_CORE", "REPORTING.V_CEO"]:
+        node_id = name.replace(".", "_")
+        graph.add_node(node_id, data=Node(id=node_id, name=name, node_type="VIEW"))
+    graph.add_edges_from([
+        ("STAGING_RAW_A", "DWH_V_CORE"), ("STAGING_RAW_B", "DWH_V_CORE"), ("DWH_V_CORE", "REPORTING_V_CEO"),
+    ])
+    path = tmp_path / "snapshot"
+    LineageSnapshot.from_lineage_graph(graph).save(str(path))
+
+    assert analyze_impact.main(["--snapshot", str(path), "STAGING.*"]) == 0
+
+    lines = sorted(capsys.readouterr().out.splitlines())
+    assert lines == ["STAGING.RAW_A\tREPORTING.V_CEO\t2", "STAGING.RAW_B\tREPORTING.V_CEO\t2"]
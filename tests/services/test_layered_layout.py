@@ -0,0 +1,55 @@
+import random
+
+import networkx as nx
+
+from app.services.layered_layout import NODE_SEPARATION, layered_layout
+
+
+def test_edges_run_left_to_right_and_cycles_share_a_layer():
+    graph = nx.DiGraph([("A", "B"), ("B", "C"), ("A", "C"), ("C", "D"), ("D", "C"), ("D", "E"), ("E", "E")])
+
+    pos = layered_layout(graph)
+
+    assert pos["A"][0] < pos["B"][0] < pos["C"][0] < pos["E"][0]
+    assert pos["C"][0] == pos["D"][0]
+
+
+def test_barycenter_ordering_removes_avoidable_crossing():
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["A", "B", "C", "D"])
+    graph.add_edges_from([("A", "D"), ("B", "C")])  # In Einfügereihenfolge gekreuzt
+
+    pos = layered_layout(graph)
+
+    assert (pos["A"][1] > pos["B"][1]) == (pos["D"][1] > pos["C"][1])
+
+
+def test_nodes_within_a_layer_keep_minimum_separation():
+    rng = random.Random(3)
+    graph = nx.DiGraph()
+    graph.add_edges_from((rng.randrange(i), i) for i in range(1, 300) for _ in range(rng.randint(1, 3)))
+
+    pos = layered_layout(graph)
+
+    by_x = {}
+    for x, y in pos.values():
+        by_x.setdefault(x, []).append(y)
+    for ys in by_x.values():
+        ys.sort()
+        assert all(b - a >= NODE_SEPARATION - 1e-6 for a, b in zip(ys, ys[1:]))
+    assert all(pos[u][0] < pos[v][0] for u, v in graph.edges)
+
+
+def test_empty_graph():
+    assert layered_layout(nx.DiGraph()) == {}
+
+
+def test_many_components_do_not_overflow_rank_keys():
+    # Über ~46k Komponenten passt Komponente * Anzahl nicht mehr in int32
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(50_000))
+    graph.add_edge(49_998, 49_999)
+
+    pos = layered_layout(graph)
+
+    assert pos[49_998][0] < pos[49_999][0]
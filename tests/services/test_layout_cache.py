@@ -0,0 +1,87 @@
+import os
+
+import networkx as nx
+import pytest
+
+from app.models.node import Node
+from app.services.layout_cache import LayoutCache, graph_fingerprint
+from app.services.layout_service import LayoutService
+
+OPTIONS = {"prog": "dot", "rankdir": "LR"}
+
+
+def _graph(edges, int_ids=False):
+    """Graph mit Namen als IDs oder – wie im GraphBuilder – mit Ganzzahl-IDs je Name."""
+    names = list(dict.fromkeys(n for edge in edges for n in edge))
+    ids = {name: (i if int_ids else name) for i, name in enumerate(names)}
+    graph = nx.DiGraph()
+    for name in names:
+        graph.add_node(ids[name], data=Node(id=ids[name], name=name, node_type="VIEW"))
+    graph.add_edges_from((ids[u], ids[v]) for u, v in edges)
+    return graph
+
+
+def test_fingerprint_ignores_insertion_order_and_id_scheme():
+    edges = [("DWH.A", "DWH.B"), ("DWH.B", "DWH.C"), ("DWH.X", "DWH.C")]
+    reference = graph_fingerprint(_graph(edges), OPTIONS)
+
+    assert graph_fingerprint(_graph(list(reversed(edges))), OPTIONS) == reference
+    assert graph_fingerprint(_graph(list(reversed(edges)), int_ids=True), OPTIONS) == reference
+    assert graph_fingerprint(_graph(edges + [("DWH.A", "DWH.C")]), OPTIONS) != reference
+    assert graph_fingerprint(_graph(edges), {**OPTIONS, "rankdir": "TB"}) != reference
+
+
+def test_memory_tier_evicts_least_recently_used_by_position_count():
+    cache = LayoutCache(memory_budget=4)
+    cache.put("a", {"x": (0.0, 0.0), "y": (1.0, 0.0)})
+    cache.put("b", {"x": (0.0, 1.0), "y": (1.0, 1.0)})
+    assert cache.get("a") is not None  # "a" zuletzt genutzt
+
+    cache.put("c", {"z": (2.0, 2.0)})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_disk_tier_survives_restart_and_is_bounded(tmp_path):
+    cache = LayoutCache(directory=str(tmp_path), max_disk_entries=2)
+    cache.put("a", {"DWH.A": (1.5, 2.0)})
+    cache.put("fallback", {"DWH.A": (0.0, 0.0)}, persist=False)
+
+    reopened = LayoutCache(directory=str(tmp_path), max_disk_entries=2)
+    assert reopened.get("a") == {"DWH.A": (1.5, 2.0)}
+    assert reopened.get("fallback") is None
+
+    os.utime(tmp_path / "a.json", (1, 1))
+    reopened.put("b", {"DWH.B": (0.0, 0.0)})
+    reopened.put("c", {"DWH.C": (0.0, 0.0)})
+    assert sorted(os.listdir(tmp_path)) == ["b.json", "c.json"]
+
+
+def test_layout_service_reuses_cached_layout_across_id_schemes(monkeypatch):
+    edges = [("DWH.A", "DWH.B"), ("DWH.B", "DWH.C")]
+    service = LayoutService(cache=LayoutCache())
+    calls = []
+
+    def fake_layout(graph, cancelled=None):
+        calls.append(graph)
+        return {n: (float(i), 0.0) for i, n in enumerate(sorted(graph.nodes))}
+
+    monkeypatch.setattr(service, "_hierarchical_layout", fake_layout)
+
+    first = service.calculate_layout(_graph(edges))
+    second = service.calculate_layout(_graph(edges, int_ids=True))
+
+    assert len(calls) == 1
+    assert second == {0: first["DWH.A"], 1: first["DWH.B"], 2: first["DWH.C"]}
+
+
+def test_cancelled_layout_skips_fallback_and_cache(monkeypatch):
+    service = LayoutService(cache=LayoutCache())
+    flag = []
+    monkeypatch.setattr(service, "_hierarchical_layout", lambda graph, cancelled: flag.append(True) or {})
+    monkeypatch.setattr(service, "_fallback_layout", lambda graph: pytest.fail("Fallback trotz Abbruch"))
+
+    assert service.calculate_layout(_graph([("DWH.A", "DWH.B")]), cancelled=lambda: bool(flag)) == {}
+    assert len(service.cache) == 0
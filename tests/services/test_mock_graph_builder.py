@@ -0,0 +1,56 @@
+import networkx as nx
+import pytest
+
+from app.services.mock_graph_builder import MockGraphBuilder
+
+DEPENDENCIES = {
+    "DWH.V_SALES": ["STAGING.RAW_POS", "DWH.D_PRODUCT"],
+    "REPORTING.V_DASHBOARD": ["DWH.V_SALES"],
+    "REPORTING.ELT_LOAD": {"inputs": ["DWH.V_SALES"], "outputs": ["REPORTING.T_SNAPSHOT"]},
+    "OTHER.V_ISOLATED": ["OTHER.T_SOURCE"],
+}
+
+
+def test_original_names_come_from_index():
+    graph = MockGraphBuilder(DEPENDENCIES).build_graph({"artifact": "DWH.V_SALES"})
+
+    node = graph.nodes["REPORTING_T_SNAPSHOT"]["data"]
+    assert node.context == "REPORTING.T_SNAPSHOT"
+    assert node.name == "T_SNAPSHOT"
+    assert graph.nodes["REPORTING_ELT_LOAD"]["data"].node_type == "ELT"
+    assert "OTHER_V_ISOLATED" not in graph
+
+
+def test_cached_graph_is_shared_as_read_only_view():
+    builder = MockGraphBuilder(DEPENDENCIES)
+    first = builder.build_graph({"artifact": "DWH.V_SALES"})
+    second = builder.build_graph({"artifact": "DWH.V_SALES"})
+
+    assert first is not second
+    assert first.nodes["DWH_V_SALES"]["data"] is second.nodes["DWH_V_SALES"]["data"]
+    with pytest.raises(nx.NetworkXError):
+        first.add_node("NEU")
+
+    own_copy = nx.DiGraph(first)
+    own_copy.add_node("NEU")
+    assert "NEU" not in builder.build_graph({"artifact": "DWH.V_SALES"})
+
+
+def test_lru_cache_respects_budget():
+    # V_SALES-Ausschnitt: 6 Knoten + 5 Kanten, V_ISOLATED: 2 Knoten + 1 Kante
+    builder = MockGraphBuilder(DEPENDENCIES, cache_budget=14)
+    builder.build_graph({"artifact": "DWH.V_SALES"})
+    builder.build_graph({"artifact": "OTHER.V_ISOLATED"})
+    assert list(builder._graph_cache) == ["DWH.V_SALES", "OTHER.V_ISOLATED"]
+
+    builder.build_graph({"artifact": "OTHER.T_SOURCE"})
+
+    assert list(builder._graph_cache) == ["OTHER.V_ISOLATED", "OTHER.T_SOURCE"]
+    assert builder._cache_size <= 14
+
+
+def test_missing_artifact_returns_empty_graph():
+    builder = MockGraphBuilder(DEPENDENCIES)
+
+    assert builder.build_graph({}).number_of_nodes() == 0
+    assert builder.build_graph({"artifact": "GIBT.ES_NICHT"}).number_of_nodes() == 0
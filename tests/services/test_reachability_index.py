@@ -0,0 +1,40 @@
+import networkx as nx
+import pytest
+
+from app.services.graph_analysis_service import GraphAnalysisService
+from app.services.reachability_index import ReachabilityIndex
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_networkx_on_random_graphs_with_cycles(seed):
+    graph = nx.gnp_random_graph(30, 0.08, directed=True, seed=seed)
+    index = ReachabilityIndex(graph)
+
+    for node in graph:
+        ancestors = nx.ancestors(graph, node)
+        assert index.ancestors(node) == ancestors
+        assert index.descendants(node) == nx.descendants(graph, node)
+        for other in graph:
+            assert index.is_upstream(other, node) == (other in ancestors)
+
+
+def test_unknown_and_empty_graph():
+    index = ReachabilityIndex(nx.DiGraph())
+
+    assert index.ancestors("X") == set()
+    assert index.ancestors_and_descendants("X") == set()
+    assert not index.is_upstream("X", "Y")
+
+
+def test_index_is_cached_per_graph_and_rebuilt_on_change():
+    graph = nx.DiGraph([("A", "B"), ("B", "C")])
+    service = GraphAnalysisService(graph)
+
+    first = service.reachability
+    assert GraphAnalysisService(graph).reachability is first
+    assert service.get_all_predecessors("C") == {"A", "B", "C"}
+
+    graph.add_edge("D", "A")
+    assert service.reachability is not first
+    assert service.is_upstream("D", "C")
+    assert ReachabilityIndex.for_graph(graph.copy()) is not service.reachability
@@ -0,0 +1,91 @@
+import random
+import string
+
+import networkx as nx
+import pytest
+
+from app.models.node import Node
+from app.services.graph_analysis_service import GraphAnalysisService
+from app.services.search_index import SQL_TEXTS_ATTR, SearchIndex, TokenIndex, TrigramIndex
+
+
+def _graph(names, sql_texts=None):
+    graph = nx.DiGraph()
+    for i, name in enumerate(names):
+        graph.add_node(i, data=Node(id=i, name=name, node_type="VIEW"))
+    if sql_texts is not None:
+        graph.graph[SQL_TEXTS_ATTR] = sql_texts
+    return graph
+
+
+def test_search_ranks_exact_prefix_word_and_substring():
+    names = ["DWH.T_XSALES", "SALES_RAW", "DWH.T_SALES_OLD", "SALES", "DWH.SALES"]
+    service = GraphAnalysisService(_graph(names))
+
+    ranked = [names[i] for i in service.search_nodes("sales")]
+
+    assert ranked == ["SALES", "SALES_RAW", "DWH.SALES", "DWH.T_SALES_OLD", "DWH.T_XSALES"]
+    assert service.find_node_by_name("sales") == names.index("SALES")
+    assert service.find_node_by_name("missing") is None
+
+
+@pytest.mark.parametrize("query", ["a", "_b", "ab", "t_a", "äö", "dwh.t_", "xyz_1"])
+def test_search_matches_linear_scan(query):
+    random.seed(7)
+    alphabet = string.ascii_uppercase[:6] + "_.Ä"
+    names = ["DWH.T_" + "".join(random.choices(alphabet, k=random.randint(1, 12))) for _ in range(2000)]
+    names += ["XYZ_1", "xyz_12"]
+    index = TrigramIndex(names)
+
+    expected = {i for i, name in enumerate(names) if query.lower() in name.lower()}
+    found = index.search(query, limit=len(names))
+
+    assert set(found.tolist()) == expected
+    assert len(found) == len(expected)
+    assert set(index.search(query, limit=5).tolist()) <= expected
+
+
+def test_empty_index_and_query():
+    assert len(TrigramIndex([]).search("abc")) == 0
+    assert len(TrigramIndex(["abc"]).search("")) == 0
+    assert len(TrigramIndex(["ab"]).search("abc")) == 0
+
+
+def test_index_is_cached_until_graph_changes():
+    graph = _graph(["A", "B"])
+    index = SearchIndex.for_graph(graph)
+    assert SearchIndex.for_graph(graph.copy(as_view=True)) is index
+
+    graph.add_node(2, data=Node(id=2, name="AB", node_type="TABLE"))
+    assert SearchIndex.for_graph(graph) is not index
+    assert GraphAnalysisService(graph).search_nodes("b") == [1, 2]
+
+
+def test_references_match_whole_identifiers():
+    sql_texts = {
+        0: "SELECT customer_id, amount FROM dwh.t_sales",
+        1: 'SELECT s."CUSTOMER_ID_OLD" FROM dwh.t_sales s',
+        2: "SELECT c.Customer_Id FROM dwh.t_customer c",
+    }
+    service = GraphAnalysisService(_graph(["V_A", "V_B", "V_C", "T_X"], sql_texts))
+
+    assert service.find_references("CUSTOMER_ID") == [0, 2]
+    assert service.find_references("s.customer_id_old") == [1]
+    assert service.find_references("unknown") == []
+    assert TokenIndex(sql_texts.values()).complete("cust") == ["customer_id", "customer_id_old"]
+
+
+def test_references_without_sql_texts_are_empty():
+    assert GraphAnalysisService(_graph(["A"])).find_references("id") == []
+
+
+def test_without_building_indexes_search_scans_linearly():
+    graph = _graph(["orders_archive", "ORDERS", "customers", "orders"])
+    service = GraphAnalysisService(graph, build_indexes=False)
+
+    assert service.search_nodes("orders") == [0, 1, 3]
+    assert SearchIndex.cached(graph) is None
+
+    service.prepare_indexes()
+    assert SearchIndex.cached(graph) is not None
+    assert service.search_nodes("orders") == [1, 3, 0]